@@ -3,8 +3,17 @@ import dash
 import dash_bootstrap_components as dbc
 import dash_cytoscape as cyto
 
+from beamforge.callbacks.analysis_callbacks import register_analysis_callbacks
+from beamforge.callbacks.autocomplete_callbacks import register_autocomplete_callbacks
+from beamforge.callbacks.bulk_edit_callbacks import register_bulk_edit_callbacks
+from beamforge.callbacks.collab_callbacks import register_collab_callbacks
 from beamforge.callbacks.graph_callbacks import register_graph_callbacks
 from beamforge.callbacks.node_callbacks import register_node_callbacks
+from beamforge.callbacks.optimizer_callbacks import register_optimizer_callbacks
+from beamforge.callbacks.output_callbacks import register_output_callbacks
+from beamforge.callbacks.pipeline_files_callbacks import register_pipeline_files_callbacks
+from beamforge.callbacks.preview_callbacks import register_preview_callbacks
+from beamforge.callbacks.project_callbacks import register_project_callbacks
 from beamforge.callbacks.yaml_callbacks import register_yaml_callbacks
 from beamforge.layouts.main_layout import create_layout
 
@@ -20,12 +29,24 @@ app = dash.Dash(
     external_stylesheets=external_stylesheets,
 )
 
+# Expose the Flask server for WSGI servers (see beamforge/wsgi.py)
+server = app.server
+
 # Set the layout
 app.layout = create_layout()
 
 # Register callbacks
+register_analysis_callbacks(app)
+register_autocomplete_callbacks(app)
+register_bulk_edit_callbacks(app)
+register_collab_callbacks(app)
 register_graph_callbacks(app)
 register_node_callbacks(app)
+register_optimizer_callbacks(app)
+register_output_callbacks(app)
+register_pipeline_files_callbacks(app)
+register_preview_callbacks(app)
+register_project_callbacks(app)
 register_yaml_callbacks(app)
 
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+// Client-side callbacks for pure UI state. These run in the browser and never
+// reach the Dash server; see the ClientsideFunction registrations in
+// beamforge/callbacks/*.py for their inputs and outputs.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    beamforge: {
+        DEFAULT_LAYOUT: {
+            name: "dagre",
+            rankDir: "TB",
+            rankSep: 30,
+            nodeSep: 50,
+            padding: 10,
+            animate: true,
+            fit: true,
+            spacingFactor: 1.5,
+        },
+
+        zoomGraph: function (zoomInClicks, zoomOutClicks, resetViewClicks, currentZoom) {
+            const triggered = window.dash_clientside.callback_context.triggered;
+            if (!triggered || triggered.length === 0) {
+                return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+            }
+
+            const triggeredId = triggered[0].prop_id.split(".")[0];
+
+            // Use the current zoom level as the base
+            let zoomLevel = currentZoom !== null && currentZoom !== undefined ? currentZoom : 1.0;
+            let layout = null;
+
+            if (triggeredId === "zoom-in") {
+                zoomLevel += 0.1;
+            } else if (triggeredId === "zoom-out") {
+                zoomLevel = Math.max(0.1, zoomLevel - 0.1);
+            } else if (triggeredId === "reset-view") {
+                zoomLevel = 1.0;
+                layout = Object.assign({}, window.dash_clientside.beamforge.DEFAULT_LAYOUT);
+            }
+
+            return [zoomLevel, layout];
+        },
+
+        enableDeleteButton: function (selectedNodes, selectedEdges) {
+            const hasNodes = Boolean(selectedNodes && selectedNodes.length);
+            const hasEdges = Boolean(selectedEdges && selectedEdges.length);
+            return !(hasNodes || hasEdges);
+        },
+
+        enableAddEdgeButton: function (selectedNodes) {
+            return !selectedNodes || selectedNodes.length !== 2;
+        },
+
+        enableRunSelectionButton: function (selectedNodes) {
+            return !selectedNodes || !selectedNodes.length;
+        },
+
+        disableRunPipelineButton: function (nClicks) {
+            // The button starts enabled and is disabled after a click
+            return nClicks !== null && nClicks !== undefined;
+        },
+
+        // Graph analyses run on the server in one request, once the graph has
+        // not changed for ANALYSIS_DEBOUNCE_MS, rather than on every edit.
+        ANALYSIS_DEBOUNCE_MS: 750,
+        analysisRequest: 0,
+
+        requestAnalysis: function (elements) {
+            const beamforge = window.dash_clientside.beamforge;
+            const request = ++beamforge.analysisRequest;
+            return new Promise(function (resolve) {
+                setTimeout(function () {
+                    resolve(request === beamforge.analysisRequest ? request : window.dash_clientside.no_update);
+                }, beamforge.ANALYSIS_DEBOUNCE_MS);
+            });
+        },
+
+        // Mirrors bulk_edit_targets in beamforge/callbacks/bulk_edit_callbacks.py
+        countBulkEditTargets: function (selectedNodes, typePattern, elements) {
+            let pattern;
+            try {
+                pattern = new RegExp("^(?:" + (typePattern || ".*") + ")$");
+            } catch (error) {
+                return "Invalid type pattern: " + error.message;
+            }
+            const selected = new Set((selectedNodes || []).map((node) => node.id));
+            const count = (elements || []).filter(
+                (element) =>
+                    !("source" in element.data) &&
+                    (!selected.size || selected.has(element.data.id)) &&
+                    pattern.test(element.data.type || "")
+            ).length;
+            const scope = selectedNodes && selectedNodes.length ? "selected nodes" : "nodes";
+            return count + " " + scope + " match";
+        },
+
+        // Completions of the selected transform, fetched once per type from the
+        // server's prefix index and then filtered by Ace as the user types.
+        COMPLETION_URL: "/_beamforge/autocomplete/",
+        completionType: null,
+        completionCache: new Map(),
+        configCompleter: {
+            getCompletions: function (editor, session, pos, prefix, callback) {
+                const beamforge = window.dash_clientside.beamforge;
+                if (editor.container.id !== "node-config-editor" || !beamforge.completionType) {
+                    callback(null, []);
+                    return;
+                }
+                beamforge
+                    .loadCompletions(beamforge.completionType)
+                    .then((completions) => callback(null, completions))
+                    .catch(() => callback(null, []));
+            },
+        },
+
+        loadCompletions: function (transformType) {
+            const beamforge = window.dash_clientside.beamforge;
+            if (!beamforge.completionCache.has(transformType)) {
+                const url = beamforge.COMPLETION_URL + encodeURIComponent(transformType) + "?prefix=&limit=0";
+                const request = fetch(url).then((response) => {
+                    if (!response.ok) {
+                        throw new Error(response.statusText);
+                    }
+                    return response.json();
+                });
+                // Drop failed requests so that they are retried
+                request.catch(() => beamforge.completionCache.delete(transformType));
+                beamforge.completionCache.set(transformType, request);
+            }
+            return beamforge.completionCache.get(transformType);
+        },
+
+        setCompletionType: function (transformType) {
+            const beamforge = window.dash_clientside.beamforge;
+            if (!beamforge.completerRegistered && window.ace && window.ace.acequire) {
+                window.ace.acequire("ace/ext/language_tools").addCompleter(beamforge.configCompleter);
+                beamforge.completerRegistered = true;
+            }
+            beamforge.completionType = transformType || null;
+            if (beamforge.completionType) {
+                // Warm the cache before the first keystroke
+                beamforge.loadCompletions(beamforge.completionType).catch(() => null);
+            }
+            return beamforge.completionType;
+        },
+
+        // Polls the log of the joined collaborative session for its latest
+        // sequence number, and notifies collab-inbox when operations newer than
+        // the last one applied to this editor exist. The server reads the
+        // operations themselves when collab-inbox changes.
+        COLLAB_POLL_MS: 500,
+        COLLAB_SEQ_URL: "/_beamforge/collab/",
+        collabTimer: null,
+        collabSessionKey: null,
+        collabApplied: 0,
+        collabNotified: 0,
+        collabPolling: false,
+
+        pollCollabSession: function (session) {
+            const beamforge = window.dash_clientside.beamforge;
+            if (beamforge.collabPolling) {
+                return;
+            }
+            beamforge.collabPolling = true;
+            fetch(beamforge.COLLAB_SEQ_URL + encodeURIComponent(session) + "/seq")
+                .then((response) => (response.ok ? response.json() : null))
+                .then((latest) => {
+                    // Notify once per new sequence number, while the editor is behind
+                    if (
+                        latest &&
+                        latest.session === session &&
+                        latest.seq > beamforge.collabApplied &&
+                        latest.seq !== beamforge.collabNotified
+                    ) {
+                        beamforge.collabNotified = latest.seq;
+                        window.dash_clientside.set_props("collab-inbox", {
+                            data: { session: session, seq: latest.seq },
+                        });
+                    }
+                })
+                // Failed polls are retried on the next tick
+                .catch(() => null)
+                .finally(() => {
+                    beamforge.collabPolling = false;
+                });
+        },
+
+        connectCollabSession: function (collabSession) {
+            const beamforge = window.dash_clientside.beamforge;
+            const key = collabSession ? collabSession.session + "/" + collabSession.client : null;
+            beamforge.collabApplied = collabSession ? collabSession.seq : 0;
+            if (key === beamforge.collabSessionKey) {
+                // Only the applied sequence number changed
+                return window.dash_clientside.no_update;
+            }
+            if (beamforge.collabTimer) {
+                clearInterval(beamforge.collabTimer);
+                beamforge.collabTimer = null;
+            }
+            beamforge.collabSessionKey = key;
+            beamforge.collabNotified = 0;
+            if (collabSession) {
+                const session = collabSession.session;
+                beamforge.collabTimer = setInterval(function () {
+                    beamforge.pollCollabSession(session);
+                }, beamforge.COLLAB_POLL_MS);
+            }
+            return window.dash_clientside.no_update;
+        },
+    },
+});
+
+// Pipeline uploads are posted as the raw file body to the server's upload
+// route rather than as a base64 data URI inside a callback payload. dcc.Upload
+// still provides the drop zone and file picker, but its change and drop events
+// are taken in the capture phase, before React sees them. Only the returned
+// handle of the parsed graph is passed on to Dash, via upload-handle.
+(function () {
+    const UPLOAD_URL = "/_beamforge/upload";
+
+    function uploadPipelineFile(file) {
+        fetch(UPLOAD_URL, {
+            method: "POST",
+            body: file,
+            headers: { "Content-Type": "application/octet-stream" },
+        })
+            .then((response) => response.json())
+            .catch((error) => ({ error: String(error) }))
+            .then((result) => {
+                window.dash_clientside.set_props("upload-handle", {
+                    data: Object.assign({ filename: file.name }, result),
+                });
+            });
+    }
+
+    function inUploadZone(target) {
+        return Boolean(target && target.closest && target.closest("#upload-data"));
+    }
+
+    document.addEventListener(
+        "change",
+        function (event) {
+            if (inUploadZone(event.target) && event.target.files) {
+                event.stopPropagation();
+                if (event.target.files.length) {
+                    uploadPipelineFile(event.target.files[0]);
+                }
+                // Allow the same file to be uploaded again
+                event.target.value = "";
+            }
+        },
+        true
+    );
+
+    document.addEventListener(
+        "drop",
+        function (event) {
+            if (inUploadZone(event.target)) {
+                event.preventDefault();
+                event.stopPropagation();
+                if (event.dataTransfer.files.length) {
+                    uploadPipelineFile(event.dataTransfer.files[0]);
+                }
+            }
+        },
+        true
+    );
+})();
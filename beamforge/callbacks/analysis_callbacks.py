@@ -0,0 +1,333 @@
+# standard libraries
+import math
+
+# third party libraries
+import dash
+from dash import ClientsideFunction, Input, Output, Patch, State, html
+
+from beamforge.callbacks.output_callbacks import format_byte_size, sink_options
+from beamforge.layouts.middle_panel import get_stylesheet
+from beamforge.utils.cost_analyzer import ELEMENT_WISE, IO, SHUFFLE, analyze_pipeline
+from beamforge.utils.expansion_pool import with_pooled_providers
+from beamforge.utils.graph_utils import elements_to_graph, format_log_with_timestamp
+from beamforge.utils.hazards import ERROR, INFO, WARNING, analyze_hazards
+from beamforge.utils.input_profiler import estimate_volumes, profile_sources
+from beamforge.utils.step_metrics import collect_step_metrics
+
+KIND_COLORS = {
+    ELEMENT_WISE: "rgba(40, 167, 69, 0.6)",
+    SHUFFLE: "rgba(220, 53, 69, 0.7)",
+    IO: "rgba(0, 123, 255, 0.6)",
+}
+SEVERITY_COLORS = {
+    ERROR: "#dc3545",
+    WARNING: "#FFC107",
+    INFO: "#17A2B8",
+}
+# Fields shown per source in the input profile, lowest cardinality first
+PROFILE_REPORT_FIELDS = 5
+
+
+def node_selector(node_id):
+    return 'node[id = "%s"]' % str(node_id).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def edge_selector(source, target):
+    return 'edge[source = "%s"][target = "%s"]' % (
+        str(source).replace("\\", "\\\\").replace('"', '\\"'),
+        str(target).replace("\\", "\\\\").replace('"', '\\"'),
+    )
+
+
+def cost_overlay_stylesheet(analysis):
+    """Build the stylesheet rules that color nodes by kind and highlight the critical path."""
+    rules = []
+    for kind, color in KIND_COLORS.items():
+        node_ids = [node_id for node_id, node_kind in analysis["kinds"].items() if node_kind == kind]
+        if node_ids:
+            rules.append(
+                {
+                    "selector": ", ".join(node_selector(node_id) for node_id in node_ids),
+                    "style": {"background-color": color},
+                }
+            )
+    if analysis["fan_out"]:
+        rules.append(
+            {
+                "selector": ", ".join(node_selector(node_id) for node_id in analysis["fan_out"]),
+                "style": {"border-style": "dashed", "border-color": "#FF6F20", "border-width": "3px"},
+            }
+        )
+    critical_path = analysis["critical_path"]
+    if len(critical_path) > 1:
+        rules.append(
+            {
+                "selector": ", ".join(node_selector(node_id) for node_id in critical_path),
+                "style": {"border-color": "#000000", "border-width": "3px"},
+            }
+        )
+        rules.append(
+            {
+                "selector": ", ".join(
+                    edge_selector(source, target) for source, target in zip(critical_path, critical_path[1:])
+                ),
+                "style": {"line-color": "#000000", "target-arrow-color": "#000000", "width": 3},
+            }
+        )
+    return rules
+
+
+def heat_color(ratio):
+    """Interpolate from pale yellow (cold) to dark red (hot) for a ratio in [0, 1]."""
+    cold = (255, 237, 160)
+    hot = (189, 0, 38)
+    r, g, b = (round(c + (h - c) * ratio) for c, h in zip(cold, hot))
+    return f"rgb({r}, {g}, {b})"
+
+
+def metrics_overlay_stylesheet(step_metrics):
+    """Build the stylesheet rules that color nodes by the time spent in them during the last profiled run."""
+    max_msecs = max((metrics["msecs"] for metrics in step_metrics.values()), default=0)
+    rules = []
+    for node_id, metrics in step_metrics.items():
+        ratio = metrics["msecs"] / max_msecs if max_msecs else 0
+        rules.append(
+            {
+                "selector": node_selector(node_id),
+                "style": {
+                    "background-color": heat_color(ratio),
+                    "color": "#FFFFFF" if ratio > 0.5 else "#333333",
+                },
+            }
+        )
+    return rules
+
+
+def hazards_overlay_stylesheet(hazards):
+    """Build the stylesheet rules that outline every node with a hazard in the color of its most severe one."""
+    most_severe = {}
+    for hazard in hazards:
+        # Hazards come most severe first
+        most_severe.setdefault(hazard["node"], hazard["severity"])
+    rules = []
+    for severity, color in SEVERITY_COLORS.items():
+        node_ids = [node_id for node_id, node_severity in most_severe.items() if node_severity == severity]
+        if node_ids:
+            rules.append(
+                {
+                    "selector": ", ".join(node_selector(node_id) for node_id in node_ids),
+                    "style": {"border-color": color, "border-width": "4px"},
+                }
+            )
+    return rules
+
+
+def format_row_count(rows):
+    for unit in ["", "k", "M", "B"]:
+        if rows < 1000 or unit == "B":
+            return f"{rows:.0f}{unit}" if not unit else f"{rows:.1f}{unit}"
+        rows /= 1000
+
+
+def volume_overlay_stylesheet(volumes):
+    """Build the stylesheet rules that label nodes with their estimated rows and color them on a log scale."""
+    max_log = max((math.log10(rows + 1) for rows in volumes.values()), default=0)
+    rules = []
+    for node_id, rows in volumes.items():
+        ratio = math.log10(rows + 1) / max_log if max_log else 0
+        rules.append(
+            {
+                "selector": node_selector(node_id),
+                "style": {
+                    "content": "%s\n~%s rows" % (node_id, format_row_count(rows)),
+                    "background-color": heat_color(ratio),
+                    "color": "#FFFFFF" if ratio > 0.5 else "#333333",
+                },
+            }
+        )
+    return rules
+
+
+def create_input_profile_report(profiles):
+    items = []
+    for node_id, profile in sorted(profiles.items()):
+        fields = sorted(profile["fields"].items(), key=lambda item: item[1])[:PROFILE_REPORT_FIELDS]
+        items.append(
+            html.Li(
+                [
+                    "%s: %d file%s, %s, %s%s rows"
+                    % (
+                        node_id,
+                        profile["files"],
+                        "" if profile["files"] == 1 else "s",
+                        format_byte_size(profile["bytes"]),
+                        "" if profile["exact"] else "~",
+                        format_row_count(profile["rows"]),
+                    ),
+                    html.Br(),
+                    "Distinct values: %s" % ", ".join(f"{field} ({count})" for field, count in fields),
+                ]
+            )
+        )
+    return [
+        html.H6("Input data:", className="mb-1"),
+        html.Ul(items, style={"fontSize": "12px", "paddingLeft": "18px", "marginBottom": "0"}),
+    ]
+
+
+def create_hazard_list(hazards, show_node=True):
+    items = [
+        html.Li(
+            [
+                html.Span(hazard["severity"].upper(), style={"color": SEVERITY_COLORS.get(hazard["severity"])}),
+                f" {hazard['node']}: " if show_node else " ",
+                hazard["message"],
+            ]
+        )
+        for hazard in hazards
+    ]
+    return html.Ul(items, style={"fontSize": "12px", "paddingLeft": "18px", "marginBottom": "0"})
+
+
+def create_cost_report(analysis):
+    stage_count = len(set(analysis["stages"].values()))
+    max_depth = max(analysis["stage_depth"].values(), default=0)
+    fan_out = ", ".join(f"{node_id} ({count} consumers)" for node_id, count in analysis["fan_out"].items())
+    items = [
+        html.Li(f"Predicted fused stages: {stage_count} (max shuffle depth {max_depth})"),
+        html.Li("Shuffles: %s" % (", ".join(analysis["shuffles"]) or "none")),
+        html.Li(
+            "Critical path: %s (%s shuffles)"
+            % (" → ".join(analysis["critical_path"]) or "empty", analysis["critical_path_depth"])
+        ),
+        html.Li("Heavy fan-out: %s" % (fan_out or "none")),
+    ]
+    return html.Ul(items, style={"fontSize": "13px", "paddingLeft": "18px", "marginBottom": "0"})
+
+
+def analyze_cost(G):
+    try:
+        analysis = analyze_pipeline(G)
+    except Exception as e:
+        return None, html.Div(f"Analysis failed: {e}", style={"color": "#dc3545", "fontSize": "12px"})
+    return analysis, create_cost_report(analysis)
+
+
+def find_hazards(G):
+    try:
+        hazards = analyze_hazards(G)
+    except Exception as e:
+        return None, html.Div(f"Hazard analysis failed: {e}", style={"color": "#dc3545", "fontSize": "12px"})
+    if not hazards:
+        return hazards, html.Div("No runtime hazards found", style={"fontSize": "13px"})
+    return hazards, [html.H6("Runtime hazards:", className="mb-1"), create_hazard_list(hazards)]
+
+
+def profile_inputs(G):
+    try:
+        profiles = profile_sources(G)
+        volumes = estimate_volumes(G, profiles)
+    except Exception as e:
+        return None, html.Div(f"Input profiling failed: {e}", style={"color": "#dc3545", "fontSize": "12px"})
+    if not profiles:
+        return None, None
+    return {"profiles": profiles, "volumes": volumes}, create_input_profile_report(profiles)
+
+
+def register_analysis_callbacks(app):
+    app.clientside_callback(
+        ClientsideFunction(namespace="beamforge", function_name="requestAnalysis"),
+        Output("analysis-request", "data"),
+        Input("network-graph", "elements"),
+    )
+
+    # Every analysis of the graph in one request, sent once editing pauses (see requestAnalysis)
+    @app.callback(
+        Output("cost-analysis-store", "data"),
+        Output("cost-analysis-report", "children"),
+        Output("hazards-store", "data"),
+        Output("hazard-report", "children"),
+        Output("input-profile-store", "data"),
+        Output("input-profile-report", "children"),
+        Output("output-sink-dropdown", "options"),
+        Input("analysis-request", "data"),
+        State("network-graph", "elements"),
+        prevent_initial_call=True,
+    )
+    def analyze_graph(request, elements):
+        if not elements:
+            return None, "Add or upload transforms to see the execution analysis", None, None, None, None, []
+        G = elements_to_graph(elements)
+        return (*analyze_cost(G), *find_hazards(G), *profile_inputs(G), sink_options(G))
+
+    @app.callback(
+        Output("node-hazards", "children"),
+        Input("network-graph", "tapNodeData"),
+        Input("hazards-store", "data"),
+    )
+    def display_node_hazards(node_data, hazards):
+        if not node_data or not hazards:
+            return None
+        node_hazards = [hazard for hazard in hazards if hazard["node"] == node_data["id"]]
+        if not node_hazards:
+            return None
+        return html.Div(create_hazard_list(node_hazards, show_node=False), style={"marginTop": "8px"})
+
+    @app.callback(
+        Output("step-metrics-store", "data"),
+        Output("step-metrics-table", "data"),
+        Output("graph-log-table", "data", allow_duplicate=True),
+        Input("profile-pipeline-button", "n_clicks"),
+        State("yaml-content", "value"),
+        State("network-graph", "elements"),
+        State("pipeline-options-input", "value"),
+        prevent_initial_call=True,
+    )
+    def profile_pipeline(n_clicks, yaml_content, elements, pipeline_options):
+        if not n_clicks or not elements:
+            return dash.no_update, dash.no_update, dash.no_update
+
+        node_ids = [element["data"]["id"] for element in elements if "source" not in element["data"]]
+        patched_logs = Patch()
+        try:
+            step_metrics, wall_seconds = collect_step_metrics(
+                with_pooled_providers(yaml_content), node_ids, pipeline_options.split() if pipeline_options else None
+            )
+        except Exception as e:
+            patched_logs.extend(format_log_with_timestamp(f"Error profiling pipeline: {e}\n"))
+            return dash.no_update, dash.no_update, patched_logs
+
+        table_data = [
+            {
+                "Node": node_id,
+                "Elements In": metrics["elements_in"],
+                "Elements Out": metrics["elements_out"],
+                "Time (ms)": metrics["msecs"],
+            }
+            for node_id, metrics in step_metrics.items()
+        ]
+        patched_logs.extend(format_log_with_timestamp(f"Profiled pipeline locally in {wall_seconds:.1f}s\n"))
+        return step_metrics, table_data, patched_logs
+
+    @app.callback(
+        Output("network-graph", "stylesheet"),
+        Input("graph-overlay-dropdown", "value"),
+        Input("cost-analysis-store", "data"),
+        Input("step-metrics-store", "data"),
+        Input("hazards-store", "data"),
+        Input("input-profile-store", "data"),
+        State("network-graph", "stylesheet"),
+    )
+    def update_graph_overlay(overlay, cost_analysis, step_metrics, hazards, input_profile, current_stylesheet):
+        stylesheet = get_stylesheet()
+        if overlay == "cost" and cost_analysis:
+            stylesheet += cost_overlay_stylesheet(cost_analysis)
+        elif overlay == "metrics" and step_metrics:
+            stylesheet += metrics_overlay_stylesheet(step_metrics)
+        elif overlay == "hazards" and hazards:
+            stylesheet += hazards_overlay_stylesheet(hazards)
+        elif overlay == "volume" and input_profile:
+            stylesheet += volume_overlay_stylesheet(input_profile["volumes"])
+        if stylesheet == current_stylesheet:
+            return dash.no_update
+        return stylesheet
@@ -0,0 +1,30 @@
+# third party libraries
+import flask
+from dash import ClientsideFunction, Input, Output
+
+from beamforge.utils.autocomplete import COMPLETION_LIMIT, complete
+from beamforge.utils.transform_parser import BEAM_VERSION
+
+COMPLETION_ROUTE = "/_beamforge/autocomplete/<path:transform_type>"
+COMPLETION_MAX_AGE = 3600
+
+
+def register_autocomplete_callbacks(app):
+    @app.server.route(COMPLETION_ROUTE)
+    def autocomplete(transform_type):
+        prefix = flask.request.args.get("prefix", "")
+        limit = flask.request.args.get("limit", COMPLETION_LIMIT, type=int)
+        response = flask.jsonify(complete(transform_type, prefix, limit))
+
+        # Completions only change with the Beam version, so let the browser reuse them
+        response.cache_control.public = True
+        response.cache_control.max_age = COMPLETION_MAX_AGE
+        response.set_etag(f"{BEAM_VERSION}:{transform_type}:{prefix}:{limit}")
+        return response.make_conditional(flask.request)
+
+    # Point the config editor completer at the selected transform type
+    app.clientside_callback(
+        ClientsideFunction(namespace="beamforge", function_name="setCompletionType"),
+        Output("node-config-completion-type", "data"),
+        Input("node-type-dropdown", "value"),
+    )
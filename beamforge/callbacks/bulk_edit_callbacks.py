@@ -0,0 +1,167 @@
+# standard libraries
+import re
+
+# third party libraries
+import dash
+import yaml
+from dash import ClientsideFunction, Input, Output, Patch, State
+
+from beamforge.callbacks.collab_callbacks import dispatch_operation
+from beamforge.utils.graph_utils import elements_to_graph, format_log_with_timestamp
+
+# Node ids listed in the log entry of a bulk edit before the rest are only counted
+BULK_LOG_NODES = 10
+
+BULK_EDIT_BUTTONS = [
+    "bulk-set-config-button",
+    "bulk-merge-config-button",
+    "bulk-change-type-button",
+    "bulk-delete-subtree-button",
+]
+
+
+def bulk_edit_targets(elements, selected_nodes, type_pattern):
+    """Return the ids of the nodes a bulk edit applies to.
+
+    These are the selected nodes, or every node if none is selected, whose type
+    matches type_pattern.
+
+    Args:
+        elements (list): Cytoscape elements.
+        selected_nodes (list): Data of the selected nodes.
+        type_pattern (str): Regular expression the whole type must match. Empty matches every type.
+
+    Returns:
+        list: Node ids, in graph order.
+
+    Raises:
+        re.error: If type_pattern is not a valid regular expression.
+    """
+    pattern = re.compile(type_pattern or ".*")
+    selected = {node["id"] for node in selected_nodes or []}
+    return [
+        element["data"]["id"]
+        for element in elements or []
+        if "source" not in element["data"]
+        and (not selected or element["data"]["id"] in selected)
+        and pattern.fullmatch(element["data"].get("type") or "")
+    ]
+
+
+def subtree_delete_operation(elements, node_ids):
+    """Build the delete operation for nodes, everything downstream of them, and their edges."""
+    # third party libraries
+    import networkx as nx
+
+    G = elements_to_graph(elements)
+    subtree = set(node_ids)
+    for node_id in node_ids:
+        subtree |= nx.descendants(G, node_id)
+    edges = [
+        [element["data"]["source"], element["data"]["target"]]
+        for element in elements
+        if "source" in element["data"]
+        and (element["data"]["source"] in subtree or element["data"]["target"] in subtree)
+    ]
+    nodes = [element["data"]["id"] for element in elements if element["data"].get("id") in subtree]
+    return {"op": "delete", "nodes": nodes, "edges": edges}
+
+
+def describe_nodes(node_ids):
+    listed = ", ".join(node_ids[:BULK_LOG_NODES])
+    if len(node_ids) > BULK_LOG_NODES:
+        listed += f" and {len(node_ids) - BULK_LOG_NODES} more"
+    return listed
+
+
+def register_bulk_edit_callbacks(app):
+    # Counted in the browser, so that editing the graph does not send it to the server just for the count
+    app.clientside_callback(
+        ClientsideFunction(namespace="beamforge", function_name="countBulkEditTargets"),
+        Output("bulk-edit-targets", "children"),
+        Input("network-graph", "selectedNodeData"),
+        Input("bulk-type-pattern-input", "value"),
+        Input("network-graph", "elements"),
+    )
+
+    @app.callback(
+        Output("network-graph", "elements", allow_duplicate=True),
+        Output("yaml-content", "value", allow_duplicate=True),
+        Output("graph-log-table", "data", allow_duplicate=True),
+        [Input(button, "n_clicks") for button in BULK_EDIT_BUTTONS],
+        State("bulk-type-pattern-input", "value"),
+        State("bulk-config-input", "value"),
+        State("bulk-type-input", "value"),
+        State("network-graph", "selectedNodeData"),
+        State("network-graph", "elements"),
+        State("collab-session", "data"),
+        prevent_initial_call=True,
+    )
+    def apply_bulk_edit(
+        set_clicks,
+        merge_clicks,
+        type_clicks,
+        delete_clicks,
+        type_pattern,
+        config_value,
+        new_type,
+        selected_nodes,
+        elements,
+        collab_session,
+    ):
+        triggered_id = dash.ctx.triggered_id
+        if not elements or not dash.ctx.triggered or not dash.ctx.triggered[0]["value"]:
+            return dash.no_update, dash.no_update, dash.no_update
+
+        patched_logs = Patch()
+        try:
+            targets = bulk_edit_targets(elements, selected_nodes, type_pattern)
+        except re.error as e:
+            patched_logs.extend(format_log_with_timestamp(f"Bulk edit: invalid type pattern: {e}\n"))
+            return dash.no_update, dash.no_update, patched_logs
+        if not targets:
+            patched_logs.extend(format_log_with_timestamp("Bulk edit: no nodes match\n"))
+            return dash.no_update, dash.no_update, patched_logs
+
+        # Every bulk edit is a single operation: one graph update, one YAML regeneration and one log entry
+        if triggered_id in ("bulk-set-config-button", "bulk-merge-config-button"):
+            try:
+                config = yaml.safe_load(config_value or "") or {}
+            except yaml.YAMLError as e:
+                patched_logs.extend(format_log_with_timestamp(f"Bulk edit: invalid config: {e}\n"))
+                return dash.no_update, dash.no_update, patched_logs
+            if not isinstance(config, dict):
+                patched_logs.extend(format_log_with_timestamp("Bulk edit: the config must be a mapping\n"))
+                return dash.no_update, dash.no_update, patched_logs
+            merge = triggered_id == "bulk-merge-config-button"
+            op = {"op": "update_nodes", "nodes": targets, "config": config, "merge": merge}
+            message = f"{'Merged config into' if merge else 'Set config of'} {len(targets)} nodes"
+        elif triggered_id == "bulk-change-type-button":
+            if not new_type:
+                patched_logs.extend(format_log_with_timestamp("Bulk edit: enter the new type\n"))
+                return dash.no_update, dash.no_update, patched_logs
+            op = {"op": "retype_nodes", "nodes": targets, "pattern": type_pattern or ".*", "type": new_type}
+            # Every target matches the same pattern, so one of them tells whether the group references are valid
+            first_type = next(
+                element["data"].get("type") or "" for element in elements if element["data"].get("id") == targets[0]
+            )
+            try:
+                re.compile(op["pattern"]).fullmatch(first_type).expand(new_type)
+            except (re.error, IndexError) as e:
+                patched_logs.extend(format_log_with_timestamp(f"Bulk edit: invalid new type '{new_type}': {e}\n"))
+                return dash.no_update, dash.no_update, patched_logs
+            matching = f" matching '{type_pattern}'" if type_pattern else ""
+            message = f"Changed type of {len(targets)} nodes{matching} to '{new_type}'"
+        else:
+            op = subtree_delete_operation(elements, targets)
+            targets = op["nodes"]
+            message = f"Deleted {len(targets)} nodes"
+
+        patched_elements, yaml_content, applied = dispatch_operation(op, elements, collab_session)
+        if not applied:
+            patched_logs.extend(
+                format_log_with_timestamp(f"Bulk edit: nothing changed for {describe_nodes(targets)}\n")
+            )
+            return dash.no_update, dash.no_update, patched_logs
+        patched_logs.extend(format_log_with_timestamp(f"{message}: {describe_nodes(targets)}\n"))
+        return patched_elements, yaml_content, patched_logs
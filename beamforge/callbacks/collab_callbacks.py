@@ -0,0 +1,138 @@
+# standard libraries
+import copy
+import sqlite3
+import uuid
+
+# third party libraries
+import dash
+import flask
+from dash import ClientsideFunction, Input, Output, Patch, State
+
+from beamforge.utils.collab import (
+    append_operation,
+    apply_operation,
+    latest_sequence,
+    read_operations,
+    replay_session,
+)
+from beamforge.utils.graph_utils import format_log_with_timestamp, generate_yaml_content
+
+COLLAB_SEQ_ROUTE = "/_beamforge/collab/<session>/seq"
+
+
+def dispatch_operation(op, elements, collab_session):
+    """Apply a local graph edit, or send it to the collaborative session the editor has joined.
+
+    In a session the edit is only appended to the session log. It comes back to
+    every editor, this one included, when the editor next polls the log, so all
+    editors apply the same operations in the same order. An edit that does not
+    apply to the editor's graph, such as a rename to an id that is taken, is not
+    appended.
+
+    Args:
+        op (dict): Operation, see beamforge.utils.collab.apply_operation.
+        elements (list): Current Cytoscape elements, modified in place outside a session.
+        collab_session (dict): Data of the collab-session store, or None.
+
+    Returns:
+        tuple: (elements output, YAML output, whether the edit was applied or sent) for the callback.
+    """
+    if collab_session:
+        # Try the edit on a copy first; a reset always applies
+        if op["op"] != "reset" and not apply_operation(copy.deepcopy(elements), op):
+            return dash.no_update, dash.no_update, False
+        append_operation(collab_session["session"], collab_session["client"], op)
+        return dash.no_update, dash.no_update, True
+
+    patched_elements = Patch()
+    if not apply_operation(elements, op, patched_elements):
+        return dash.no_update, dash.no_update, False
+    return patched_elements, generate_yaml_content(elements), True
+
+
+def register_collab_callbacks(app):
+    # Polled by the browsers in a session. Each poll is one short indexed read, so that no
+    # worker or thread is held open per editor, whatever the gunicorn worker class.
+    @app.server.route(COLLAB_SEQ_ROUTE)
+    def collab_sequence(session):
+        try:
+            seq = latest_sequence(session)
+        except sqlite3.Error as e:
+            return flask.jsonify({"error": str(e)}), 500
+        return flask.jsonify({"session": session, "seq": seq})
+
+    @app.callback(
+        Output("collab-session", "data"),
+        Output("network-graph", "elements", allow_duplicate=True),
+        Output("yaml-content", "value", allow_duplicate=True),
+        Output("graph-log-table", "data", allow_duplicate=True),
+        Input("collab-join-button", "n_clicks"),
+        Input("collab-leave-button", "n_clicks"),
+        State("collab-session-input", "value"),
+        State("network-graph", "elements"),
+        prevent_initial_call=True,
+    )
+    def join_collab_session(join_clicks, leave_clicks, session, elements):
+        patched_logs = Patch()
+        if dash.ctx.triggered_id == "collab-leave-button":
+            patched_logs.extend(format_log_with_timestamp("Left collaborative session\n"))
+            return None, dash.no_update, dash.no_update, patched_logs
+
+        session = (session or "").strip()
+        if not session:
+            patched_logs.extend(format_log_with_timestamp("Enter a session name to join\n"))
+            return dash.no_update, dash.no_update, dash.no_update, patched_logs
+
+        client = uuid.uuid4().hex
+        try:
+            session_elements, seq = replay_session(session)
+            if seq == 0:
+                # Start the session from the graph of the editor that opens it
+                seq = append_operation(session, client, {"op": "reset", "elements": elements or []})
+                session_elements = elements or []
+        except sqlite3.Error as e:
+            patched_logs.extend(format_log_with_timestamp(f"Error joining session '{session}': {e}\n"))
+            return dash.no_update, dash.no_update, dash.no_update, patched_logs
+
+        patched_logs.extend(format_log_with_timestamp(f"Joined collaborative session '{session}' at operation {seq}\n"))
+        return (
+            {"session": session, "client": client, "seq": seq},
+            session_elements,
+            generate_yaml_content(session_elements),
+            patched_logs,
+        )
+
+    # Start or stop polling the session's log, which notifies collab-inbox of new operations
+    app.clientside_callback(
+        ClientsideFunction(namespace="beamforge", function_name="connectCollabSession"),
+        Output("collab-inbox", "data"),
+        Input("collab-session", "data"),
+    )
+
+    @app.callback(
+        Output("network-graph", "elements", allow_duplicate=True),
+        Output("yaml-content", "value", allow_duplicate=True),
+        Output("collab-session", "data", allow_duplicate=True),
+        Input("collab-inbox", "data"),
+        State("collab-session", "data"),
+        State("network-graph", "elements"),
+        prevent_initial_call=True,
+    )
+    def apply_collab_operations(inbox, collab_session, elements):
+        if not inbox or not collab_session or inbox.get("session") != collab_session["session"]:
+            return dash.no_update, dash.no_update, dash.no_update
+
+        # The notification only says that there is something new; the operations are
+        # read from the log after the last one applied to this editor
+        ops = read_operations(collab_session["session"], collab_session["seq"])
+        if not ops:
+            return dash.no_update, dash.no_update, dash.no_update
+
+        patched_elements = Patch()
+        for entry in ops:
+            apply_operation(elements, entry["op"], patched_elements)
+        return (
+            patched_elements,
+            generate_yaml_content(elements),
+            dict(collab_session, seq=ops[-1]["seq"]),
+        )
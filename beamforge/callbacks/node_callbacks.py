@@ -10,15 +10,28 @@ import tempfile
 import dash
 import dash_bootstrap_components as dbc
 import yaml
-from dash import Input, Output, State, dcc, html
+from dash import ClientsideFunction, Input, Output, Patch, State, dcc, html
 from dash_ace import DashAceEditor
 
-from beamforge.utils.graph_utils import custom_yaml_dump, format_log_with_timestamp, generate_yaml_content
-from beamforge.utils.transform_parser import BEAM_YAML_TRANSFORMS_CONFIG
+from beamforge.callbacks.collab_callbacks import dispatch_operation
+from beamforge.utils.config_validator import validate_transform_config
+from beamforge.utils.expansion_pool import dry_run_pipeline, with_pooled_providers
+from beamforge.utils.graph_utils import (
+    custom_yaml_dump,
+    elements_to_graph,
+    format_log_with_timestamp,
+    generate_yaml_content,
+    graph_to_elements,
+)
+from beamforge.utils.local_services import prism_pipeline_args
+from beamforge.utils.materialize import commit_materialized, discard_materialized, plan_incremental_run
+from beamforge.utils.preview import selection_output_dir, selection_subgraph
+from beamforge.utils.transform_parser import beam_yaml_transforms_config
+from beamforge.utils.yaml_parser import parse_beam_yaml
 
 
 def get_node_type_options():
-    return [{"label": transform, "value": transform} for transform in BEAM_YAML_TRANSFORMS_CONFIG]
+    return [{"label": transform, "value": transform} for transform in beam_yaml_transforms_config()]
 
 
 def create_dataflow_job_name(base_name="dataflow-job"):
@@ -55,7 +68,7 @@ def extract_job_id_and_create_url(output, region="us-central1"):
     return None
 
 
-def _run_beam_pipeline(runner, pipeline_options, yaml_content, log_message):
+def _run_beam_pipeline(runner, pipeline_options, yaml_content, log_message, incremental=False):
     region = None
     if pipeline_options:
         region_match = re.search(r"--region\s+([\w-]+)", pipeline_options)
@@ -69,6 +82,46 @@ def _run_beam_pipeline(runner, pipeline_options, yaml_content, log_message):
         else:
             pipeline_options = "--region us-central1"
 
+    dry_run = False
+    if pipeline_options and "--dry_run True" in pipeline_options:
+        dry_run = True
+
+    if dry_run and runner != "DataflowRunner" and not pipeline_options.replace("--dry_run True", "").strip():
+        # Expanding the pipeline is all a local dry run does, so do it here with the warm expansion services.
+        # Dry runs with other options, or for Dataflow, go through apache_beam.yaml.main with those options.
+        try:
+            schemas, cached = dry_run_pipeline(yaml_content)
+            log_message += "Dry run succeeded%s. Output schemas:\n" % (" (cached)" if cached else "")
+            for node_id, outputs in schemas.items():
+                for tag, schema in outputs.items():
+                    log_message += f"{node_id}.{tag}: {schema}\n"
+        except Exception as e:
+            log_message += f"Dry run failed: {e}\n"
+        return format_log_with_timestamp(log_message)
+
+    plan = None
+    if incremental and runner != "DataflowRunner" and not dry_run:
+        # Unchanged upstream branches are read back from what earlier local runs materialized
+        try:
+            plan = plan_incremental_run(parse_beam_yaml(yaml_content))
+        except Exception as e:
+            log_message += f"Could not reuse intermediate results: {e}\n"
+        else:
+            if plan["reused"]:
+                log_message += "Reusing the results of %s\n" % ", ".join(sorted(plan["reused"]))
+            if not len(plan["graph"]):
+                discard_materialized(plan)
+                log_message += "All outputs are up to date, nothing to run\n"
+                return format_log_with_timestamp(log_message)
+            yaml_content = generate_yaml_content(graph_to_elements(plan["graph"]))
+
+    if runner != "DataflowRunner":
+        # The Dataflow service expands cross-language transforms itself
+        try:
+            yaml_content = with_pooled_providers(yaml_content)
+        except Exception as e:
+            log_message += f"Could not use the warm expansion services: {e}\n"
+
     with tempfile.TemporaryDirectory() as tmp_dir:
         yaml_path = os.path.join(tmp_dir, "pipeline.yaml")
 
@@ -76,10 +129,6 @@ def _run_beam_pipeline(runner, pipeline_options, yaml_content, log_message):
         with open(yaml_path, "w") as f:
             f.write(yaml_content)
 
-        dry_run = False
-        if pipeline_options and "--dry_run True" in pipeline_options:
-            dry_run = True
-
         # Construct the command
         if runner == "DataflowRunner" and not dry_run:
             command = [
@@ -91,20 +140,28 @@ def _run_beam_pipeline(runner, pipeline_options, yaml_content, log_message):
                 f"--yaml-pipeline-file={yaml_path}",
             ]
         else:
+            runner_args = [f"--runner={runner}"]
+            # Submit to the shared Prism job server instead of starting one for this run
+            if runner == "PrismRunner" and "--job_endpoint" not in (pipeline_options or ""):
+                try:
+                    runner_args = prism_pipeline_args()
+                except Exception as e:
+                    log_message += f"Could not use the shared Prism job server, starting one for this run: {e}\n"
             command = [
                 "python",
                 "-m",
                 "apache_beam.yaml.main",
                 f"--yaml_pipeline_file={yaml_path}",
-                f"--runner={runner}",
-            ]
+            ] + runner_args
         if pipeline_options:
             command.extend(pipeline_options.split())
 
         # Execute the command and capture the output
+        returncode = None
         try:
             process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             stdout, stderr = process.communicate()
+            returncode = process.returncode
             output = (stdout.decode() + "\n" + stderr.decode()).strip()
             log_message += f"Ran pipeline with command: {' '.join(command)}\n"
             log_message += f"Output:\n{output}\n"
@@ -115,6 +172,14 @@ def _run_beam_pipeline(runner, pipeline_options, yaml_content, log_message):
         except Exception as e:
             log_message += f"Error running pipeline: {e}\n"
 
+    if plan is not None:
+        if returncode == 0:
+            committed = commit_materialized(plan)
+            if committed:
+                log_message += "Materialized the results of %s\n" % ", ".join(committed)
+        else:
+            discard_materialized(plan)
+
     return format_log_with_timestamp(log_message)
 
 
@@ -170,6 +235,14 @@ def register_node_callbacks(app):
                             ],
                             className="mb-3 align-items-center",
                         ),
+                        dbc.Row(
+                            [
+                                dbc.Col(html.H6("File:", className="mb-0"), width=4),
+                                dbc.Col(html.Span(node_data.get("file"), style={"fontSize": "14px"}), width=8),
+                            ],
+                            className="mb-3 align-items-center",
+                            style={"display": "flex" if node_data.get("file") else "none"},
+                        ),
                         dbc.Row(
                             [
                                 dbc.Col(
@@ -200,7 +273,11 @@ def register_node_callbacks(app):
                                             enableLiveAutocompletion=True,
                                             enableBasicAutocompletion=True,
                                             tabSize=2,
+                                            # Save the config once typing pauses, not on every keystroke
+                                            debounceChangePeriod=500,
                                         ),
+                                        dcc.Store(id="node-config-completion-type"),
+                                        html.Div(id="node-hazards"),
                                         html.Div(
                                             id="config-error-message",
                                             style={
@@ -223,7 +300,7 @@ def register_node_callbacks(app):
                                         html.H6("Example:", className="mb-2"),
                                         DashAceEditor(
                                             id="node-config-usage",
-                                            value=BEAM_YAML_TRANSFORMS_CONFIG[node_data["type"]],
+                                            value=beam_yaml_transforms_config().get(node_data["type"], ""),
                                             style={
                                                 "border": "1px solid #ced4da",
                                                 "borderRadius": "4px",
@@ -261,24 +338,24 @@ def register_node_callbacks(app):
         Input("node-config-editor", "value"),
         State("network-graph", "tapNodeData"),
         State("network-graph", "elements"),
-        State("graph-log-table", "data"),
+        State("collab-session", "data"),
         prevent_initial_call=True,
     )
-    def save_node_config(config_value, node_data, elements, table_data):
+    def save_node_config(config_value, node_data, elements, collab_session):
         if node_data and config_value:
             try:
                 new_config = yaml.safe_load(config_value)
-                node_id = node_data["id"]
-                updated_elements = []
-                for element in elements:
-                    if element.get("data") and element["data"].get("id") == node_id and new_config != {}:
-                        element["data"]["config"] = new_config
-                    updated_elements.append(element)
-                yaml_content = generate_yaml_content(updated_elements)
+                if new_config == {}:
+                    return dash.no_update, dash.no_update, dash.no_update
+                op = {"op": "set_config", "id": node_data["id"], "config": new_config}
+                patched_elements, yaml_content, applied = dispatch_operation(op, elements, collab_session)
+                # Showing a node in the editor sets its unchanged config, which is not an edit
+                if not applied:
+                    return dash.no_update, dash.no_update, dash.no_update
                 formatted_logs = format_log_with_timestamp(f"Updated config for node '{node_data['id']}'\n")
-                if table_data is None:
-                    table_data = []
-                return updated_elements, yaml_content, table_data + formatted_logs
+                patched_logs = Patch()
+                patched_logs.extend(formatted_logs)
+                return patched_elements, yaml_content, patched_logs
             except yaml.YAMLError as e:
                 print(f"Error processing YAML file: {str(e)}")
                 return dash.no_update, dash.no_update, dash.no_update
@@ -291,26 +368,24 @@ def register_node_callbacks(app):
         Input("node-type-dropdown", "value"),
         State("network-graph", "tapNodeData"),
         State("network-graph", "elements"),
-        State("graph-log-table", "data"),
+        State("collab-session", "data"),
         prevent_initial_call=True,
     )
-    def update_node_type(new_type, node_data, elements, table_data):
+    def update_node_type(new_type, node_data, elements, collab_session):
         if node_data and new_type:
-            node_id = node_data["id"]
-            updated_elements = []
-            for element in elements:
-                if element.get("data") and element["data"].get("id") == node_id and new_type != node_data["type"]:
-                    element["data"]["type"] = new_type
-                    element["data"]["config"] = {}  # Reset config to empty
-                updated_elements.append(element)
-            yaml_content = generate_yaml_content(updated_elements)
+            # Changing the type resets the config to empty
+            op = {"op": "set_type", "id": node_data["id"], "type": new_type}
+            patched_elements, yaml_content, applied = dispatch_operation(op, elements, collab_session)
+            # Showing a node in the editor sets its unchanged type, which is not an edit
+            if not applied:
+                return dash.no_update, dash.no_update, dash.no_update
             formatted_logs = format_log_with_timestamp(f"Changed type of node '{node_data['id']}' to '{new_type}'")
-            if table_data is None:
-                table_data = []
+            patched_logs = Patch()
+            patched_logs.extend(formatted_logs)
             return (
-                updated_elements,
+                patched_elements,
                 yaml_content,
-                table_data + formatted_logs,
+                patched_logs,
             )
         return dash.no_update, dash.no_update, dash.no_update
 
@@ -323,7 +398,7 @@ def register_node_callbacks(app):
     )
     def update_node_config_and_usage(new_type, node_data):
         if node_data:
-            return custom_yaml_dump({}), BEAM_YAML_TRANSFORMS_CONFIG[new_type]
+            return custom_yaml_dump({}), beam_yaml_transforms_config().get(new_type, "")
         return dash.no_update, dash.no_update
 
     @app.callback(
@@ -334,45 +409,38 @@ def register_node_callbacks(app):
         Input("node-id-input", "value"),
         State("network-graph", "tapNodeData"),
         State("network-graph", "elements"),
-        State("graph-log-table", "data"),
+        State("collab-session", "data"),
         prevent_initial_call=True,
     )
-    def update_node_id(new_node_id, node_data, elements, table_data):
+    def update_node_id(new_node_id, node_data, elements, collab_session):
         if len(new_node_id) == 0:
             formatted_logs = format_log_with_timestamp("Node ID cannot be empty\n")
-            if table_data is None:
-                table_data = []
-            return dash.no_update, dash.no_update, dash.no_update, table_data + formatted_logs
+            patched_logs = Patch()
+            patched_logs.extend(formatted_logs)
+            return dash.no_update, dash.no_update, dash.no_update, patched_logs
         if node_data and node_data["id"] != new_node_id:
             old_node_id = node_data["id"]
-            updated_elements = []
-            for element in elements:
-                if element.get("data") and element["data"].get("id") == old_node_id:
-                    element["data"]["id"] = new_node_id
-                    node_data = element["data"]
-                elif element.get("data") and element["data"].get("source") == old_node_id:
-                    element["data"]["source"] = new_node_id
-                    element["data"]["id"] = None
-                elif element.get("data") and element["data"].get("target") == old_node_id:
-                    element["data"]["target"] = new_node_id
-                    element["data"]["id"] = None
-                updated_elements.append(element)
-            yaml_content = generate_yaml_content(updated_elements)
-            formatted_logs = format_log_with_timestamp(f"Renamed node from '{node_data['id']}' to '{new_node_id}'\n")
-            if table_data is None:
-                table_data = []
-            return updated_elements, node_data, yaml_content, table_data + formatted_logs
+            op = {"op": "rename", "id": old_node_id, "new_id": new_node_id}
+            patched_elements, yaml_content, applied = dispatch_operation(op, elements, collab_session)
+            patched_logs = Patch()
+            if not applied:
+                patched_logs.extend(
+                    format_log_with_timestamp(
+                        f"Could not rename node '{old_node_id}' to '{new_node_id}': a node with that ID already "
+                        "exists or the node is no longer in the graph\n"
+                    )
+                )
+                return dash.no_update, dash.no_update, dash.no_update, patched_logs
+            node_data = dict(node_data, id=new_node_id)
+            patched_logs.extend(format_log_with_timestamp(f"Renamed node from '{old_node_id}' to '{new_node_id}'\n"))
+            return patched_elements, node_data, yaml_content, patched_logs
         return dash.no_update, dash.no_update, dash.no_update, dash.no_update
 
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace="beamforge", function_name="disableRunPipelineButton"),
         Output("run-pipeline-button", "disabled"),
         Input("run-pipeline-button", "n_clicks"),
     )
-    def disable_run_pipeline_button(n_clicks):
-        if n_clicks is None:
-            return False  # Button starts enabled
-        else:
-            return True  # Disable after click
 
     @app.callback(
         Output("graph-log-table", "data", allow_duplicate=True),
@@ -380,18 +448,60 @@ def register_node_callbacks(app):
         Input("run-pipeline-button", "n_clicks"),
         State("pipeline-runner-dropdown", "value"),
         State("pipeline-options-input", "value"),
+        State("incremental-run-checklist", "value"),
         State("yaml-content", "value"),
-        State("graph-log-table", "data"),
         prevent_initial_call=True,
     )
-    def run_beam_pipeline(n_clicks, runner, pipeline_options, yaml_content, table_data):
+    def run_beam_pipeline(n_clicks, runner, pipeline_options, run_modes, yaml_content):
         if n_clicks is None:
             return dash.no_update, dash.no_update
 
-        formatted_logs = _run_beam_pipeline(runner, pipeline_options, yaml_content, "")
-        if table_data is None:
-            table_data = []
-        return table_data + formatted_logs, False
+        incremental = "incremental" in (run_modes or [])
+        formatted_logs = _run_beam_pipeline(runner, pipeline_options, yaml_content, "", incremental)
+        patched_logs = Patch()
+        patched_logs.extend(formatted_logs)
+        return patched_logs, False
+
+    app.clientside_callback(
+        ClientsideFunction(namespace="beamforge", function_name="enableRunSelectionButton"),
+        Output("run-selection-button", "disabled"),
+        Input("network-graph", "selectedNodeData"),
+    )
+
+    @app.callback(
+        Output("graph-log-table", "data", allow_duplicate=True),
+        Input("run-selection-button", "n_clicks"),
+        State("network-graph", "selectedNodeData"),
+        State("network-graph", "elements"),
+        State("pipeline-runner-dropdown", "value"),
+        State("pipeline-options-input", "value"),
+        State("incremental-run-checklist", "value"),
+        prevent_initial_call=True,
+    )
+    def run_selected_subgraph(n_clicks, selected_nodes, elements, runner, pipeline_options, run_modes):
+        if not n_clicks or not selected_nodes:
+            return dash.no_update
+
+        patched_logs = Patch()
+        if runner == "DataflowRunner":
+            # The temporary sinks write to local files
+            patched_logs.extend(format_log_with_timestamp("Running a selection needs a local runner\n"))
+            return patched_logs
+
+        G = elements_to_graph(elements)
+        output_dir = selection_output_dir()
+        pruned, sinks = selection_subgraph(G, [node["id"] for node in selected_nodes], output_dir)
+        log_message = "Running selection %s (%d of %d nodes)\n" % (
+            ", ".join(node["id"] for node in selected_nodes),
+            len(pruned) - len(sinks),
+            len(G),
+        )
+        for node_id, path in sinks.items():
+            log_message += f"Output of {node_id}: {path}*\n"
+        yaml_content = generate_yaml_content(graph_to_elements(pruned))
+        incremental = "incremental" in (run_modes or [])
+        patched_logs.extend(_run_beam_pipeline(runner, pipeline_options, yaml_content, log_message, incremental))
+        return patched_logs
 
     @app.callback(
         Output("graph-log-table", "data", allow_duplicate=True),
@@ -409,36 +519,54 @@ def register_node_callbacks(app):
         Output("config-validation-status", "style"),
         Output("config-error-message", "children"),
         Output("config-error-message", "style"),
+        Output("node-config-editor", "annotations"),
         Input("node-config-editor", "value"),
+        State("node-type-dropdown", "value"),
     )
-    def validate_yaml_config(config_value):
-        if not config_value:
-            return (
-                "Empty configuration",
-                {"color": "#6c757d", "marginBottom": "5px", "fontSize": "12px"},
-                "",
-                {"display": "none"},
-            )
-
+    def validate_yaml_config(config_value, node_type):
+        error_message_style = {
+            "color": "#dc3545",
+            "fontSize": "12px",
+            "marginTop": "5px",
+            "display": "block",
+            "whiteSpace": "pre-wrap",
+            "fontFamily": "monospace",
+        }
         try:
-            yaml.safe_load(config_value)
-            return (
-                "✓ Valid YAML",
-                {"color": "#28a745", "marginBottom": "5px", "fontSize": "12px"},
-                "",
-                {"display": "none"},
-            )
+            annotations = validate_transform_config(node_type, config_value or "")
         except yaml.YAMLError as e:
+            mark = getattr(e, "problem_mark", None)
             return (
                 "✗ Invalid YAML",
                 {"color": "#dc3545", "marginBottom": "5px", "fontSize": "12px"},
                 str(e),
-                {
-                    "color": "#dc3545",
-                    "fontSize": "12px",
-                    "marginTop": "5px",
-                    "display": "block",
-                    "whiteSpace": "pre-wrap",
-                    "fontFamily": "monospace",
-                },
+                error_message_style,
+                [{"row": mark.line, "column": mark.column, "type": "error", "text": str(e)}] if mark else [],
+            )
+
+        errors = [annotation for annotation in annotations if annotation["type"] == "error"]
+        messages = "\n".join(f"Line {annotation['row'] + 1}: {annotation['text']}" for annotation in annotations)
+        if errors:
+            return (
+                f"✗ Invalid {node_type} config",
+                {"color": "#dc3545", "marginBottom": "5px", "fontSize": "12px"},
+                messages,
+                error_message_style,
+                annotations,
+            )
+
+        if not config_value:
+            status = "Empty configuration"
+            status_style = {"color": "#6c757d", "marginBottom": "5px", "fontSize": "12px"}
+        else:
+            status = "✓ Valid YAML"
+            status_style = {"color": "#28a745", "marginBottom": "5px", "fontSize": "12px"}
+        if annotations:
+            return (
+                f"{status} ({len(annotations)} warnings)",
+                status_style,
+                messages,
+                dict(error_message_style, color="#856404"),
+                annotations,
             )
+        return status, status_style, "", {"display": "none"}, annotations
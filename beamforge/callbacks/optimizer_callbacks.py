@@ -0,0 +1,103 @@
+# third party libraries
+import dash
+from dash import ALL, Input, Output, Patch, State, html
+
+from beamforge.callbacks.collab_callbacks import dispatch_operation
+from beamforge.utils.graph_utils import format_log_with_timestamp
+from beamforge.utils.optimizer import apply_rewrite, optimize_pipeline, propose_rewrites
+
+OPTIMIZER_PROMPT = "Click Analyze to find rewrites for the current pipeline"
+
+
+def create_optimizer_report(proposals):
+    if not proposals:
+        return html.Div("No rewrites apply to this pipeline", style={"fontSize": "13px"})
+
+    items = []
+    for index, proposal in enumerate(proposals):
+        items.append(
+            html.Div(
+                [
+                    html.Div(
+                        [
+                            html.Span(proposal["description"], style={"fontSize": "13px", "flexGrow": "1"}),
+                            html.Button(
+                                "Apply",
+                                id={"type": "apply-rewrite-button", "index": index},
+                                className="beam-button",
+                            ),
+                        ],
+                        style={"display": "flex", "alignItems": "center", "gap": "5px"},
+                    ),
+                    html.Details(
+                        [
+                            html.Summary("Diff", style={"fontSize": "12px"}),
+                            html.Pre(proposal["diff"], style={"fontSize": "11px", "whiteSpace": "pre-wrap"}),
+                        ]
+                    ),
+                ],
+                style={"borderBottom": "1px solid #EAEAEA", "padding": "5px 0"},
+            )
+        )
+    return items
+
+
+def register_optimizer_callbacks(app):
+    # Proposals are only computed on request, since finding them renders the whole pipeline once per rewrite
+    @app.callback(
+        Output("optimizer-proposals", "data"),
+        Output("optimizer-report", "children"),
+        Input("analyze-rewrites-button", "n_clicks"),
+        State("network-graph", "elements"),
+        prevent_initial_call=True,
+    )
+    def suggest_rewrites(n_clicks, elements):
+        if not elements:
+            return None, "Add or upload transforms to see the suggested rewrites"
+        try:
+            proposals = propose_rewrites(elements)
+        except Exception as e:
+            return None, html.Div(f"Optimizer failed: {e}", style={"color": "#dc3545", "fontSize": "12px"})
+        return proposals, create_optimizer_report(proposals)
+
+    @app.callback(
+        Output("network-graph", "elements", allow_duplicate=True),
+        Output("yaml-content", "value", allow_duplicate=True),
+        Output("graph-log-table", "data", allow_duplicate=True),
+        Output("optimizer-proposals", "data", allow_duplicate=True),
+        Output("optimizer-report", "children", allow_duplicate=True),
+        Input({"type": "apply-rewrite-button", "index": ALL}, "n_clicks"),
+        Input("apply-all-rewrites-button", "n_clicks"),
+        State("optimizer-proposals", "data"),
+        State("network-graph", "elements"),
+        State("collab-session", "data"),
+        prevent_initial_call=True,
+    )
+    def apply_rewrites(rewrite_clicks, apply_all_clicks, proposals, elements, collab_session):
+        triggered_id = dash.ctx.triggered_id
+        if not elements or not dash.ctx.triggered or not dash.ctx.triggered[0]["value"]:
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
+
+        patched_logs = Patch()
+        if triggered_id == "apply-all-rewrites-button":
+            rewritten_elements, applied = optimize_pipeline(elements)
+        elif proposals and triggered_id["index"] < len(proposals):
+            # The rewrite is rebuilt from the current pipeline, which may have changed since the analysis
+            proposal = proposals[triggered_id["index"]]
+            rewrite = apply_rewrite(elements, proposal["rule"], proposal["nodes"])
+            if rewrite is None:
+                message = f"Optimizer: {proposal['description']} no longer applies, analyze the pipeline again\n"
+                patched_logs.extend(format_log_with_timestamp(message))
+                return dash.no_update, dash.no_update, patched_logs, dash.no_update, dash.no_update
+            rewritten_elements, applied = rewrite[0], [rewrite[1]]
+        else:
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
+        if not applied:
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
+
+        # One reset operation, so that the whole rewrite reaches a collaborative session at once
+        op = {"op": "reset", "elements": rewritten_elements}
+        patched_elements, yaml_string, _ = dispatch_operation(op, elements, collab_session)
+        patched_logs.extend(format_log_with_timestamp("".join(f"Optimizer: {line}\n" for line in applied)))
+        # The other proposals were computed against the previous pipeline
+        return patched_elements, yaml_string, patched_logs, None, OPTIMIZER_PROMPT
@@ -0,0 +1,87 @@
+# third party libraries
+import dash
+from dash import Input, Output, State
+
+from beamforge.callbacks.preview_callbacks import format_preview_value
+from beamforge.utils.graph_utils import elements_to_graph
+from beamforge.utils.output_browser import (
+    OUTPUT_PAGE_SIZE,
+    estimate_row_count,
+    find_sink_shards,
+    local_sinks,
+    read_page,
+)
+
+
+def format_byte_size(size):
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def sink_options(G):
+    """Return the dropdown options of the local sinks of a pipeline graph, updated with the graph analysis."""
+    return [{"label": f"{node_id} ({path})", "value": node_id} for node_id, (_, path) in local_sinks(G).items()]
+
+
+def register_output_callbacks(app):
+    @app.callback(
+        Output("output-browser-table", "columns"),
+        Output("output-browser-table", "data"),
+        Output("output-browser-summary", "children"),
+        Output("output-browser-state", "data"),
+        Input("output-sink-dropdown", "value"),
+        Input("output-prev-button", "n_clicks"),
+        Input("output-next-button", "n_clicks"),
+        State("output-browser-state", "data"),
+        State("network-graph", "elements"),
+        prevent_initial_call=True,
+    )
+    def browse_output(node_id, prev_clicks, next_clicks, browser_state, elements):
+        sinks = local_sinks(elements_to_graph(elements or []))
+        if node_id not in sinks:
+            return [], [], "Pick a local sink to browse what the last run wrote", None
+
+        # The cursors of the pages seen so far, so that Previous can go back
+        if dash.ctx.triggered_id == "output-sink-dropdown" or not browser_state or browser_state["node"] != node_id:
+            browser_state = {"node": node_id, "cursors": [None], "next": None}
+        elif dash.ctx.triggered_id == "output-next-button":
+            if not browser_state["next"]:
+                return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+            browser_state["cursors"].append(browser_state["next"])
+        elif dash.ctx.triggered_id == "output-prev-button":
+            if len(browser_state["cursors"]) == 1:
+                return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+            browser_state["cursors"].pop()
+
+        sink_type, path = sinks[node_id]
+        shards = find_sink_shards(path)
+        if not shards:
+            return [], [], f"No output found at {path}*", None
+        try:
+            rows, browser_state["next"] = read_page(sink_type, shards, browser_state["cursors"][-1])
+            count = estimate_row_count(sink_type, shards)
+        except Exception as e:
+            return [], [], f"Could not read the output: {e}", None
+
+        columns = []
+        for row in rows:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+        first_row = (len(browser_state["cursors"]) - 1) * OUTPUT_PAGE_SIZE + 1
+        summary = "Rows %d-%d of %s%d (%d shards, %s)" % (
+            first_row,
+            first_row + len(rows) - 1,
+            "" if count["exact"] else "about ",
+            count["rows"],
+            count["shards"],
+            format_byte_size(count["bytes"]),
+        )
+        return (
+            [{"name": column, "id": column} for column in columns],
+            [{key: format_preview_value(value) for key, value in row.items()} for row in rows],
+            summary,
+            browser_state,
+        )
@@ -0,0 +1,82 @@
+# third party libraries
+import dash
+from dash import Input, Output, Patch, State
+
+from beamforge.callbacks.collab_callbacks import dispatch_operation
+from beamforge.utils.graph_utils import format_log_with_timestamp, graph_to_elements
+from beamforge.utils.pipeline_files import (
+    load_pipeline_files,
+    merge_pipeline_files,
+    pipeline_files_graph,
+    pipeline_files_state,
+)
+
+
+def _log(message):
+    patched_logs = Patch()
+    patched_logs.extend(format_log_with_timestamp(message))
+    return patched_logs
+
+
+def register_pipeline_files_callbacks(app):
+    @app.callback(
+        Output("network-graph", "elements", allow_duplicate=True),
+        Output("yaml-content", "value", allow_duplicate=True),
+        Output("graph-log-table", "data", allow_duplicate=True),
+        Output("pipeline-files-store", "data"),
+        Input("pipeline-files-load-button", "n_clicks"),
+        Input("pipeline-files-interval", "n_intervals"),
+        State("pipeline-files-input", "value"),
+        State("pipeline-files-store", "data"),
+        State("network-graph", "elements"),
+        State("collab-session", "data"),
+        prevent_initial_call=True,
+    )
+    def load_pipeline_files_graph(n_clicks, n_intervals, root_path, loaded_files, elements, collab_session):
+        if dash.ctx.triggered_id == "pipeline-files-interval":
+            # Watching reloads the files that were loaded last, whatever the input box says now
+            if not loaded_files:
+                return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+            root_path = loaded_files["root"]
+        elif not n_clicks or not (root_path or "").strip():
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+        root_path = root_path.strip()
+
+        # Loading the same root again only re-reads and re-parses the files that changed
+        reload = bool(loaded_files) and loaded_files["root"] == root_path
+        try:
+            loaded = load_pipeline_files(root_path, loaded_files["files"] if reload else None)
+        except (OSError, ValueError) as e:
+            if dash.ctx.triggered_id == "pipeline-files-interval":
+                # Files are often briefly invalid while being saved, try again on the next tick
+                return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+            log = _log(f"Error loading pipeline files from {root_path}: {e}\n")
+            return dash.no_update, dash.no_update, log, dash.no_update
+
+        changed = loaded["changed"] + loaded["removed"]
+        if reload and not changed:
+            if dash.ctx.triggered_id == "pipeline-files-interval":
+                return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+            store = dict(loaded_files, files=loaded["files"])
+            return dash.no_update, dash.no_update, _log(f"Pipeline files of {root_path} are unchanged\n"), store
+
+        G = pipeline_files_graph(loaded)
+        # The state of this load tells the next reload which changes were made in the editor
+        store = {"root": root_path, "files": loaded["files"], **pipeline_files_state(G)}
+        merged = merge_pipeline_files(elements, G, loaded_files) if reload else graph_to_elements(G)
+        op = {"op": "reset", "elements": merged}
+        patched_elements, yaml_content, _ = dispatch_operation(op, elements or [], collab_session)
+        if reload:
+            unchanged = len(loaded["files"]) - len(loaded["changed"])
+            message = f"Reloaded {', '.join(changed)} ({unchanged} files unchanged)\n"
+        else:
+            message = f"Loaded {G.number_of_nodes()} transforms from {len(loaded['files'])} files of {root_path}\n"
+        return patched_elements, yaml_content, _log(message), store
+
+    @app.callback(
+        Output("pipeline-files-interval", "disabled"),
+        Input("pipeline-files-watch", "value"),
+        Input("pipeline-files-store", "data"),
+    )
+    def toggle_pipeline_files_watch(watch, loaded_files):
+        return not (watch and loaded_files)
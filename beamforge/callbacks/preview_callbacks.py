@@ -0,0 +1,67 @@
+# third party libraries
+from dash import Input, Output, State, dash_table, html
+
+from beamforge.utils.graph_utils import elements_to_graph
+from beamforge.utils.preview import PREVIEW_ROW_LIMIT, PREVIEW_RUNNERS, preview_node_output
+
+
+def format_preview_value(value):
+    if isinstance(value, (dict, list)):
+        return str(value)
+    return value
+
+
+def register_preview_callbacks(app):
+    @app.callback(
+        Output("node-preview", "children"),
+        Input("preview-node-button", "n_clicks"),
+        State("network-graph", "tapNodeData"),
+        State("network-graph", "elements"),
+        State("pipeline-runner-dropdown", "value"),
+        prevent_initial_call=True,
+    )
+    def preview_node(n_clicks, node_data, elements, runner):
+        if not n_clicks or not node_data:
+            return "Click a node, then Preview Output to see a sample of what it produces"
+
+        # Previews always run locally, even when a remote runner is selected
+        if runner not in PREVIEW_RUNNERS:
+            runner = "DirectRunner"
+
+        try:
+            rows = preview_node_output(elements_to_graph(elements), node_data["id"], runner=runner)
+        except Exception as e:
+            return html.Div(
+                f"Preview failed: {e}",
+                style={"color": "#dc3545", "fontSize": "12px", "whiteSpace": "pre-wrap", "fontFamily": "monospace"},
+            )
+
+        if not rows:
+            return html.Div("No output rows", style={"color": "#6c757d", "fontSize": "12px"})
+
+        columns = []
+        for row in rows:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+
+        return html.Div(
+            [
+                html.Div(
+                    f"First {len(rows)} rows of '{node_data['id']}' (sources capped at {PREVIEW_ROW_LIMIT} records)",
+                    style={"color": "#6c757d", "fontSize": "12px", "marginBottom": "5px"},
+                ),
+                dash_table.DataTable(
+                    columns=[{"name": column, "id": column} for column in columns],
+                    data=[{key: format_preview_value(value) for key, value in row.items()} for row in rows],
+                    style_table={"overflowX": "auto"},
+                    style_cell={
+                        "fontFamily": "Roboto, Arial, sans-serif",
+                        "fontSize": "12px",
+                        "textAlign": "left",
+                        "padding": "5px",
+                    },
+                    style_header={"backgroundColor": "#F5F5F5", "fontWeight": "500"},
+                ),
+            ]
+        )
@@ -0,0 +1,103 @@
+# standard libraries
+import sqlite3
+
+# third party libraries
+import dash
+from dash import Input, Output, Patch, State
+
+from beamforge.callbacks.collab_callbacks import dispatch_operation
+from beamforge.utils.graph_utils import format_log_with_timestamp, generate_yaml_content
+from beamforge.utils.project_store import list_pipelines, list_versions, load_pipeline, save_pipeline
+
+
+def _log(message):
+    patched_logs = Patch()
+    patched_logs.extend(format_log_with_timestamp(message))
+    return patched_logs
+
+
+def register_project_callbacks(app):
+    @app.callback(
+        Output("project-pipeline-dropdown", "value"),
+        Output("graph-log-table", "data", allow_duplicate=True),
+        Input("save-project-button", "n_clicks"),
+        State("project-name-input", "value"),
+        State("network-graph", "elements"),
+        State("network-graph", "layout"),
+        prevent_initial_call=True,
+    )
+    def save_project(n_clicks, name, elements, layout):
+        if not n_clicks:
+            return dash.no_update, dash.no_update
+        name = (name or "").strip()
+        if not name:
+            return dash.no_update, _log("Enter a pipeline name to save\n")
+        if not elements:
+            return dash.no_update, _log("Nothing to save, the pipeline is empty\n")
+
+        try:
+            version, created = save_pipeline(name, generate_yaml_content(elements), elements, layout)
+        except sqlite3.Error as e:
+            return dash.no_update, _log(f"Error saving pipeline '{name}': {e}\n")
+        if created:
+            return name, _log(f"Saved pipeline '{name}' as version {version}\n")
+        return name, _log(f"Pipeline '{name}' is unchanged from version {version}\n")
+
+    @app.callback(
+        Output("project-pipeline-dropdown", "options"),
+        Output("project-version-dropdown", "options"),
+        Output("project-version-dropdown", "value"),
+        Output("graph-log-table", "data", allow_duplicate=True),
+        Input("project-pipeline-dropdown", "value"),
+        prevent_initial_call="initial_duplicate",
+    )
+    def refresh_saved_pipelines(name):
+        try:
+            pipelines = list_pipelines()
+            versions = list_versions(name) if name else []
+        except sqlite3.Error as e:
+            return [], [], None, _log(f"Error reading project store: {e}\n")
+
+        pipeline_options = [{"label": pipeline["name"], "value": pipeline["name"]} for pipeline in pipelines]
+        version_options = [
+            {"label": f"v{version['version']}", "value": version["version"], "title": version["created_at"]}
+            for version in versions
+        ]
+        return pipeline_options, version_options, versions[0]["version"] if versions else None, dash.no_update
+
+    @app.callback(
+        Output("network-graph", "elements", allow_duplicate=True),
+        Output("network-graph", "layout", allow_duplicate=True),
+        Output("yaml-content", "value", allow_duplicate=True),
+        Output("project-name-input", "value"),
+        Output("graph-log-table", "data", allow_duplicate=True),
+        Input("open-project-button", "n_clicks"),
+        State("project-pipeline-dropdown", "value"),
+        State("project-version-dropdown", "value"),
+        State("network-graph", "elements"),
+        State("collab-session", "data"),
+        prevent_initial_call=True,
+    )
+    def open_project(n_clicks, name, version, elements, collab_session):
+        if not n_clicks or not name:
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
+
+        try:
+            pipeline = load_pipeline(name, version)
+        except sqlite3.Error as e:
+            log = _log(f"Error opening '{name}': {e}\n")
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update, log
+        if pipeline is None:
+            log = _log(f"Pipeline '{name}' not found\n")
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update, log
+
+        # In a collaborative session the opened pipeline reaches every editor through the operation log
+        op = {"op": "reset", "elements": pipeline["elements"]}
+        patched_elements, _, _ = dispatch_operation(op, elements or [], collab_session)
+        return (
+            patched_elements,
+            pipeline["layout"] or dash.no_update,
+            pipeline["yaml"],
+            name,
+            _log(f"Opened pipeline '{name}' version {pipeline['version']}\n"),
+        )
@@ -1,28 +1,42 @@
-# standard libraries
-import base64
-
 # third party libraries
+import dash
 import yaml
 from dash import Input, Output, State
 
 from beamforge.utils.graph_utils import custom_yaml_dump, generate_yaml_content
+from beamforge.utils.project_store import load_graph
+from beamforge.utils.templating import render_stored_template
 
 
 def register_yaml_callbacks(app):
     @app.callback(
         Output("yaml-content", "value"),
-        Input("upload-data", "contents"),
+        Input("upload-handle", "data"),
+        Input("jinja-variables-input", "n_blur"),
+        State("jinja-variables-input", "value"),
         prevent_initial_call=True,
     )
-    def update_yaml_content(contents):
-        if contents is None:
+    def update_yaml_content(upload, n_blur, jinja_variables):
+        if not upload:
             return "YAML content will appear here..."
-
-        content_type, content_string = contents.split(",")
-        decoded = base64.b64decode(content_string)
+        if "error" in upload:
+            return f"Error processing YAML file: {upload['error']}"
+
+        if upload.get("template"):
+            try:
+                content = render_stored_template(upload["handle"], jinja_variables)["yaml"]
+            except Exception as e:
+                return f"Error rendering template: {type(e).__name__}: {e}"
+        elif dash.ctx.triggered_id == "jinja-variables-input":
+            return dash.no_update
+        else:
+            graph = load_graph(upload["handle"])
+            if graph is None:
+                return "Uploaded file is no longer available, please upload it again"
+            content = graph["yaml"]
 
         try:
-            yaml_dict = yaml.safe_load(decoded)
+            yaml_dict = yaml.safe_load(content)
             formatted_yaml = custom_yaml_dump(yaml_dict)
             return formatted_yaml
         except Exception as e:
@@ -0,0 +1,278 @@
+# standard libraries
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# third party libraries
+import networkx as nx
+import yaml
+
+from beamforge.utils.graph_utils import custom_yaml_dump
+from beamforge.utils.yaml_parser import parse_beam_yaml
+
+CACHE_FILE_NAME = ".beamforge-cache.json"
+CACHE_VERSION = 1
+YAML_EXTENSIONS = (".yaml", ".yml")
+
+
+def find_yaml_files(paths):
+    """Expand files and directories into a sorted list of YAML files.
+
+    Args:
+        paths (list): Files or directories to search.
+
+    Returns:
+        list: Paths of the YAML files found.
+    """
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+                files.update(os.path.join(root, name) for name in names if name.endswith(YAML_EXTENSIONS))
+        else:
+            files.add(path)
+    return sorted(files)
+
+
+def validate_pipeline(content):
+    """Check that a Beam YAML pipeline parses into a well-formed graph.
+
+    Args:
+        content (str): Beam YAML text.
+
+    Returns:
+        list: Error messages, empty if the pipeline is valid.
+    """
+    try:
+        G = parse_beam_yaml(content)
+    except Exception as e:
+        return [f"{type(e).__name__}: {e}"]
+
+    errors = []
+    for node_id, node_data in G.nodes(data=True):
+        # Inputs that do not name a transform show up as nodes without a type
+        if "type" not in node_data:
+            errors.append(f"Unknown input '{node_id}'")
+    if not nx.is_directed_acyclic_graph(G):
+        errors.append("Pipeline graph has a cycle")
+    return errors
+
+
+def has_comments(content):
+    """Return whether a YAML document has comments, i.e. a # outside every scalar."""
+    if "#" not in content:
+        return False
+    scalars = [
+        (token.start_mark.index, token.end_mark.index)
+        for token in yaml.scan(content)
+        if isinstance(token, yaml.ScalarToken)
+    ]
+    return any(not any(start <= match.start() < end for start, end in scalars) for match in re.finditer("#", content))
+
+
+def format_pipeline(content, force=False):
+    """Return the canonical formatting of a Beam YAML document.
+
+    Args:
+        content (str): Beam YAML text.
+        force (bool): Format documents with comments too, dropping the comments.
+
+    Returns:
+        tuple: (formatted, skipped) where formatted is the formatted text, or
+        None if the document is left as is, and skipped says why.
+    """
+    data = yaml.safe_load(content)
+    if not isinstance(data, dict):
+        return None, "Not a mapping"
+    if not force and has_comments(content):
+        return None, "Has comments, which formatting would drop (use --force to format anyway)"
+    return custom_yaml_dump(data), None
+
+
+def graph_pipeline(content):
+    """Return the nodes and edges of a Beam YAML pipeline as JSON-serializable data."""
+    G = parse_beam_yaml(content)
+    return {
+        "nodes": [
+            {"id": node_id, "type": node_data.get("type", "Unknown"), "config": node_data.get("config", {})}
+            for node_id, node_data in G.nodes(data=True)
+        ],
+        "edges": [{"source": source, "target": target} for source, target in G.edges()],
+    }
+
+
+def process_file(command, path, check=False, force=False):
+    """Run one subcommand on one file. Executed in a worker process.
+
+    Args:
+        command (str): One of validate, fmt or graph.
+        path (str): YAML file to process.
+        check (bool): For fmt, report files that would change instead of rewriting them.
+        force (bool): For fmt, also rewrite files with comments.
+
+    Returns:
+        dict: Result record with at least path, ok and sha256.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except OSError as e:
+        return {"path": path, "ok": False, "sha256": None, "errors": [str(e)]}
+
+    result = {"path": path, "ok": True, "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest()}
+    try:
+        if command == "validate":
+            result["errors"] = validate_pipeline(content)
+            result["ok"] = not result["errors"]
+        elif command == "fmt":
+            formatted, skipped = format_pipeline(content, force)
+            result["changed"] = formatted is not None and formatted != content
+            if skipped:
+                result["skipped"] = skipped
+            elif result["changed"] and check:
+                result["ok"] = False
+            elif result["changed"]:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(formatted)
+                result["sha256"] = hashlib.sha256(formatted.encode("utf-8")).hexdigest()
+        elif command == "graph":
+            result["graph"] = graph_pipeline(content)
+    except Exception as e:
+        result["ok"] = False
+        result["errors"] = [f"{type(e).__name__}: {e}"]
+    return result
+
+
+def _process_file_args(args):
+    return process_file(*args)
+
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "results": {}}
+
+
+def save_cache(cache_path, cache):
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def run(command, paths, jobs=None, cache_path=CACHE_FILE_NAME, check=False, force=False):
+    """Run a subcommand over many files in a process pool, skipping files cached as unchanged.
+
+    Only successful results are cached, keyed by subcommand and content hash, so
+    a failing file is re-checked on every run.
+
+    Args:
+        command (str): One of validate, fmt or graph.
+        paths (list): Files or directories to process.
+        jobs (int): Number of worker processes, defaults to the CPU count.
+        cache_path (str): Cache file location, or None to disable caching.
+        check (bool): For fmt, do not rewrite files.
+        force (bool): For fmt, also rewrite files with comments.
+
+    Returns:
+        list: One result record per file, in path order.
+    """
+    files = find_yaml_files(paths)
+    cache = load_cache(cache_path) if cache_path else {"version": CACHE_VERSION, "results": {}}
+    cached = cache["results"]
+    # Checking a file does not rewrite it, and files skipped for their comments are rewritten
+    # with --force, so both get their own cache entries
+    cache_command = command + ("-check" if check else "") + ("-force" if force else "")
+
+    results = {}
+    pending = []
+    for path in files:
+        key = f"{cache_command}:{os.path.abspath(path)}"
+        entry = cached.get(key)
+        try:
+            digest = file_sha256(path) if entry else None
+        except OSError:
+            digest = None
+        if entry and entry["sha256"] == digest:
+            results[path] = dict(entry["result"], path=path, cached=True)
+        else:
+            pending.append(path)
+
+    if pending:
+        chunksize = max(1, len(pending) // ((jobs or os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for result in executor.map(
+                _process_file_args, [(command, path, check, force) for path in pending], chunksize=chunksize
+            ):
+                results[result["path"]] = dict(result, cached=False)
+                if result["ok"]:
+                    key = f"{cache_command}:{os.path.abspath(result['path'])}"
+                    cached[key] = {"sha256": result["sha256"], "result": result}
+
+    if cache_path:
+        save_cache(cache_path, cache)
+    return [results[path] for path in files]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="beamforge", description="Headless tools for Beam YAML pipelines.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, description in [
+        ("validate", "Check that pipelines parse into a well-formed graph"),
+        ("fmt", "Rewrite pipelines in the canonical BeamForge YAML format"),
+        ("graph", "Emit the nodes and edges of each pipeline"),
+    ]:
+        subparser = subparsers.add_parser(name, help=description, description=description)
+        subparser.add_argument("paths", nargs="+", help="YAML files or directories to process")
+        subparser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+        subparser.add_argument("--cache", default=CACHE_FILE_NAME, help="Content-hash cache file")
+        subparser.add_argument("--no-cache", action="store_true", help="Process every file")
+        if name == "fmt":
+            subparser.add_argument("--check", action="store_true", help="Fail on files that would be reformatted")
+            subparser.add_argument("--force", action="store_true", help="Also rewrite files with comments")
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.command,
+        args.paths,
+        jobs=args.jobs,
+        cache_path=None if args.no_cache else args.cache,
+        check=getattr(args, "check", False),
+        force=getattr(args, "force", False),
+    )
+
+    # One JSON record per line, followed by a summary record
+    for result in results:
+        sys.stdout.write(json.dumps(result) + "\n")
+    failed = sum(1 for result in results if not result["ok"])
+    summary = {
+        "summary": True,
+        "command": args.command,
+        "files": len(results),
+        "failed": failed,
+        "cached": sum(1 for result in results if result["cached"]),
+    }
+    sys.stdout.write(json.dumps(summary) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
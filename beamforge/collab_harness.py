@@ -0,0 +1,187 @@
+# standard libraries
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# Editing actions of the simulated editors: those of the load test, plus adding edges, uploading a
+# pipeline and opening a saved one, which replace the whole graph
+ACTIONS = [
+    "tap",
+    "edit_config",
+    "rename",
+    "set_type",
+    "add_node",
+    "delete_node",
+    "add_edge",
+    "upload",
+    "open_project",
+]
+ACTION_WEIGHTS = [2, 4, 1, 1, 3, 1, 2, 0.2, 0.2]
+# Chance that an editor's browser polls the session log between two actions, so that
+# editors often act on a view of the graph that is behind the log
+POLL_PROBABILITY = 0.5
+SAVED_PIPELINE = "collab-harness"
+
+
+class CollabEditor:
+    """One simulated browser in a collaborative session, driving the app's real callbacks."""
+
+    def __init__(self, session, editor, make_pipeline):
+        self.session = session
+        self.editor = editor
+        self.make_pipeline = make_pipeline
+
+    @property
+    def applied(self):
+        return (self.editor.props.get("collab-session.data") or {}).get("seq", 0)
+
+    def join(self):
+        self.editor.set_prop("collab-session-input.value", self.session)
+        self.editor.click("collab-join-button")
+        if not self.editor.props.get("collab-session.data"):
+            raise RuntimeError(f"Joining session {self.session} failed")
+
+    def poll(self):
+        """Poll the latest sequence number and notify collab-inbox if behind, as pollCollabSession does.
+
+        Returns:
+            bool: Whether the editor was behind the log.
+        """
+        latest = self.editor.client.get_json(f"/_beamforge/collab/{self.session}/seq")
+        if latest["seq"] <= self.applied:
+            return False
+        self.editor.set_prop("collab-inbox.data", {"session": self.session, "seq": latest["seq"]})
+        return True
+
+    def act(self, action):
+        if action == "upload":
+            self.editor.upload(self.make_pipeline(self.editor.rng))
+        elif action == "open_project":
+            self.editor.props["project-pipeline-dropdown.value"] = SAVED_PIPELINE
+            self.editor.props["project-version-dropdown.value"] = None
+            self.editor.click("open-project-button")
+        elif action == "add_edge" and len(self.editor.nodes()) >= 2:
+            self.editor.props["network-graph.selectedNodeData"] = self.editor.rng.sample(self.editor.nodes(), 2)
+            self.editor.click("add-edge-button")
+        else:
+            self.editor.act("add_node" if action == "add_edge" else action)
+
+
+def run_editor(editor, ops, latencies, lock):
+    """Make random edits in a session as one editor, polling the log in between like a browser."""
+    rng = editor.editor.rng
+    for _ in range(ops):
+        if rng.random() < POLL_PROBABILITY:
+            editor.poll()
+        action = rng.choices(ACTIONS, weights=ACTION_WEIGHTS)[0]
+        start = time.perf_counter()
+        try:
+            editor.act(action)
+        except Exception as e:
+            editor.editor.errors.append(f"{action}: {e!r}")
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+
+def simulate(editors, ops, nodes=10, seed=0):
+    """Run concurrent editors against one session through the app's callbacks and check that they converge.
+
+    Every editor is a browser session on the Flask test client that joins the
+    session, then uploads, opens, and edits the graph, and polls the session
+    log between actions. The app uses the project store of BEAMFORGE_STORE_DIR.
+
+    Args:
+        editors (int): Number of concurrent editors.
+        ops (int): Number of actions per editor.
+        nodes (int): Transforms in each uploaded or opened pipeline.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Summary with throughput, action latency percentiles, errors and
+        whether every editor ended with the same elements as a replay of the log.
+    """
+    # Imported here rather than at the top, so that main can point the project store at a temporary directory first
+    from beamforge.loadtest import EditorSession, FlaskClient, callbacks_by_input, layout_props, synthetic_pipeline
+    from beamforge.utils.collab import replay_session
+    from beamforge.utils.graph_utils import graph_to_elements
+    from beamforge.utils.project_store import save_pipeline
+    from beamforge.utils.yaml_parser import parse_beam_yaml
+
+    session = f"harness-{seed}-{time.time_ns()}"
+    content = synthetic_pipeline(nodes, random.Random(seed))
+    save_pipeline(SAVED_PIPELINE, content, graph_to_elements(parse_beam_yaml(content)))
+
+    clients = [FlaskClient() for _ in range(editors)]
+    callbacks = callbacks_by_input(clients[0].get_json("/_dash-dependencies"))
+    layout = layout_props(clients[0].get_json("/_dash-layout"))
+    replicas = [
+        CollabEditor(
+            session,
+            EditorSession(client, callbacks, layout, random.Random(seed * 1000 + index)),
+            lambda rng: synthetic_pipeline(nodes, rng),
+        )
+        for index, client in enumerate(clients)
+    ]
+    for replica in replicas:
+        replica.join()
+
+    latencies = []
+    lock = threading.Lock()
+    threads = [threading.Thread(target=run_editor, args=(replica, ops, latencies, lock)) for replica in replicas]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # Let every browser catch up with the edits made after it stopped
+    for replica in replicas:
+        while replica.poll():
+            pass
+
+    final_elements, final_seq = replay_session(session)
+    latencies.sort()
+    errors = [error for replica in replicas for error in replica.editor.errors]
+    return {
+        "editors": editors,
+        "operations": final_seq,
+        "seconds": round(elapsed, 3),
+        "operations_per_second": round(final_seq / elapsed, 1),
+        "action_ms_p50": round(statistics.median(latencies) * 1000, 3),
+        "action_ms_p99": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+        "nodes": sum(1 for element in final_elements if "source" not in element["data"]),
+        "errors": errors[:20],
+        "converged": not errors
+        and all(
+            replica.applied == final_seq and replica.editor.props.get("network-graph.elements") == final_elements
+            for replica in replicas
+        ),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent editors in a collaborative session.")
+    parser.add_argument("--editors", type=int, default=16, help="Number of concurrent editors")
+    parser.add_argument("--ops", type=int, default=100, help="Actions per editor")
+    parser.add_argument("--nodes", type=int, default=10, help="Transforms in each uploaded or opened pipeline")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--store", default=None, help="Project store directory, defaults to a temporary one")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Set before the app, and with it the project store, is imported
+        os.environ["BEAMFORGE_STORE_DIR"] = args.store or tmp_dir
+        summary = simulate(args.editors, args.ops, args.nodes, args.seed)
+    sys.stdout.write(json.dumps(summary) + "\n")
+    return 0 if summary["converged"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
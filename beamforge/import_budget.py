@@ -0,0 +1,111 @@
+# standard libraries
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+# Heavy dependencies that are only imported on first use, never at startup
+DEFERRED_MODULES = ("apache_beam", "networkx", "requests", "bs4")
+IMPORT_BUDGET_SECONDS = 3.0
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def measure_import(module="beamforge.app", env=None):
+    """Import a module in a fresh interpreter and collect per-module import times.
+
+    Args:
+        module (str): Module to import.
+        env (dict): Environment of the interpreter, the current one if None.
+
+    Returns:
+        dict: seconds (cumulative import time of the module), modules (every
+        module imported on the way, mapped to the module that imported it, None
+        at the top) and slowest (the ten modules with the highest own import
+        time, in milliseconds).
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    own_times = {}
+    importers = {}
+    cumulative = 0
+    # Modules are listed after the ones they import, which are indented one level deeper
+    waiting = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        own_us, cumulative_us, indent, name = match.groups()
+        own_times[name] = int(own_us)
+        importers[name] = None
+        while waiting and waiting[-1][1] > len(indent):
+            importers[waiting.pop()[0]] = name
+        waiting.append((name, len(indent)))
+        if name == module:
+            cumulative = int(cumulative_us)
+    slowest = sorted(own_times, key=own_times.get, reverse=True)[:10]
+    return {
+        "seconds": cumulative / 1e6,
+        "modules": importers,
+        "slowest": {name: round(own_times[name] / 1000, 1) for name in slowest},
+    }
+
+
+def _top_level(name):
+    return name.split(".")[0] if name else None
+
+
+def check_import_budget(module="beamforge.app", budget=IMPORT_BUDGET_SECONDS, deferred=DEFERRED_MODULES, env=None):
+    """Check that importing a module stays within a time budget and leaves heavy dependencies unloaded.
+
+    A deferred package counts as loaded only if the module's own package, rather
+    than one of its dependencies, imports it: Dash, for one, always imports requests.
+
+    Args:
+        module (str): Module to import.
+        budget (float): Maximum cumulative import time in seconds.
+        deferred (iterable): Top-level packages that must not be imported.
+        env (dict): Environment of the interpreter, the current one if None.
+
+    Returns:
+        dict: Measurement summary, with ok telling whether the budget was met.
+    """
+    measurement = measure_import(module, env)
+    importers = measurement["modules"]
+    loaded = sorted(
+        name for name in deferred if name in importers and _top_level(importers[name]) in (_top_level(module), None)
+    )
+    return {
+        "module": module,
+        "seconds": round(measurement["seconds"], 3),
+        "budget": budget,
+        "eagerly_imported": loaded,
+        "slowest_ms": measurement["slowest"],
+        "ok": measurement["seconds"] <= budget and not loaded,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the startup import time of BeamForge against a budget.")
+    parser.add_argument("--module", default="beamforge.app", help="Module to import")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_SECONDS, help="Import time budget in seconds")
+    args = parser.parse_args(argv)
+
+    summary = check_import_budget(args.module, args.budget)
+    sys.stdout.write(json.dumps(summary) + "\n")
+    return 0 if summary["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -58,6 +58,9 @@ def create_left_panel():
                         "borderBottom": "2px solid #FF6F20",
                     },
                 ),
+                # assets/clientside.js posts picked or dropped files straight to the upload
+                # route, instead of dcc.Upload reading them, and stores the returned handle
+                dcc.Store(id="upload-handle"),
                 dcc.Upload(
                     id="upload-data",
                     children=html.Div(
@@ -91,6 +94,112 @@ def create_left_panel():
                     multiple=False,
                     accept=".yaml,.yml",
                 ),
+                dcc.Textarea(
+                    id="jinja-variables-input",
+                    placeholder='Jinja variables for templated pipelines, e.g. {"region": "us-central1"}',
+                    style={
+                        "width": "calc(100% - 20px)",
+                        "height": "60px",
+                        "margin": "0 10px 10px 10px",
+                        "fontFamily": "monospace",
+                        "fontSize": "12px",
+                    },
+                ),
+                html.Div(
+                    style={"margin": "0 10px 10px 10px"},
+                    children=[
+                        html.Div(
+                            style={"display": "flex", "gap": "5px", "alignItems": "center"},
+                            children=[
+                                dcc.Input(
+                                    id="pipeline-files-input",
+                                    type="text",
+                                    placeholder="Root file of a multi-file pipeline",
+                                    style={"flexGrow": "1", "minWidth": "0"},
+                                ),
+                                dcc.Checklist(
+                                    id="pipeline-files-watch",
+                                    options=[{"label": " Watch", "value": "watch"}],
+                                    value=[],
+                                    style={"fontSize": "13px"},
+                                ),
+                                html.Button(
+                                    "Load",
+                                    id="pipeline-files-load-button",
+                                    className="beam-button",
+                                ),
+                            ],
+                        ),
+                        dcc.Store(id="pipeline-files-store"),
+                        dcc.Interval(id="pipeline-files-interval", interval=2000, disabled=True),
+                    ],
+                ),
+                html.Div(
+                    style={"margin": "0 10px 10px 10px"},
+                    children=[
+                        html.Div(
+                            style={"display": "flex", "gap": "5px", "marginBottom": "5px"},
+                            children=[
+                                dcc.Input(
+                                    id="project-name-input",
+                                    type="text",
+                                    placeholder="Pipeline name",
+                                    debounce=True,
+                                    style={"flexGrow": "1", "minWidth": "0"},
+                                ),
+                                html.Button(
+                                    "Save",
+                                    id="save-project-button",
+                                    className="beam-button",
+                                ),
+                            ],
+                        ),
+                        html.Div(
+                            style={"display": "flex", "gap": "5px"},
+                            children=[
+                                dcc.Dropdown(
+                                    id="project-pipeline-dropdown",
+                                    placeholder="Saved pipelines",
+                                    style={"flexGrow": "1", "minWidth": "0"},
+                                ),
+                                dcc.Dropdown(
+                                    id="project-version-dropdown",
+                                    placeholder="Version",
+                                    clearable=False,
+                                    style={"width": "90px"},
+                                ),
+                                html.Button(
+                                    "Open",
+                                    id="open-project-button",
+                                    className="beam-button",
+                                ),
+                            ],
+                        ),
+                        html.Div(
+                            style={"display": "flex", "gap": "5px", "marginTop": "5px"},
+                            children=[
+                                dcc.Input(
+                                    id="collab-session-input",
+                                    type="text",
+                                    placeholder="Collaborative session",
+                                    style={"flexGrow": "1", "minWidth": "0"},
+                                ),
+                                html.Button(
+                                    "Join",
+                                    id="collab-join-button",
+                                    className="beam-button",
+                                ),
+                                html.Button(
+                                    "Leave",
+                                    id="collab-leave-button",
+                                    className="beam-button",
+                                ),
+                            ],
+                        ),
+                        dcc.Store(id="collab-session"),
+                        dcc.Store(id="collab-inbox"),
+                    ],
+                ),
                 html.Div(
                     style={"flexGrow": "1", "overflow": "auto"},
                     children=[
@@ -91,6 +91,26 @@ def create_middle_panel():
                                     ),  # Added float left to put other buttons to the left
                                     html.Div(
                                         [
+                                            dcc.Dropdown(
+                                                id="graph-overlay-dropdown",
+                                                options=[
+                                                    {"label": "No overlay", "value": "none"},
+                                                    {"label": "Execution cost", "value": "cost"},
+                                                    {"label": "Runtime metrics", "value": "metrics"},
+                                                    {"label": "Hazards", "value": "hazards"},
+                                                    {"label": "Data volume", "value": "volume"},
+                                                ],
+                                                value="none",
+                                                clearable=False,
+                                                searchable=False,
+                                                style={
+                                                    "width": "160px",
+                                                    "display": "inline-block",
+                                                    "verticalAlign": "middle",
+                                                    "fontSize": "14px",
+                                                    "marginRight": "5px",
+                                                },
+                                            ),
                                             html.Button(
                                                 "Zoom In",
                                                 id="zoom-in",
@@ -148,6 +168,11 @@ def create_middle_panel():
                                         zoom=1,
                                         pan={"x": 50, "y": 50},
                                     ),
+                                    dcc.Store(id="cost-analysis-store"),
+                                    dcc.Store(id="step-metrics-store"),
+                                    dcc.Store(id="hazards-store"),
+                                    dcc.Store(id="input-profile-store"),
+                                    dcc.Store(id="analysis-request"),
                                 ],
                                 style={
                                     "width": "100%",
@@ -170,6 +195,7 @@ def create_middle_panel():
                                     children=[
                                         dash_table.DataTable(
                                             id="graph-log-table",
+                                            data=[],
                                             columns=[
                                                 {
                                                     "name": "Timestamp",
@@ -1,7 +1,7 @@
 # third party libraries
 import dash_bootstrap_components as dbc
 import dash_resizable_panels as drp
-from dash import dcc, html
+from dash import dash_table, dcc, html
 
 
 def create_right_panel():
@@ -39,8 +39,130 @@ def create_right_panel():
                                 )
                             ],
                         ),
+                        html.Div(
+                            [
+                                html.Button(
+                                    "Preview Output",
+                                    id="preview-node-button",
+                                    className="beam-button",
+                                ),
+                            ],
+                            style={
+                                "display": "flex",
+                                "justifyContent": "center",
+                                "marginTop": "10px",
+                            },
+                        ),
+                        dcc.Loading(
+                            type="default",
+                            color="#FF6F20",
+                            children=[html.Div(id="node-preview", style={"marginTop": "10px"})],
+                        ),
                     ]
                 ),
+                html.Div(
+                    [
+                        html.H3(
+                            "Bulk Edit",
+                            style={
+                                "textAlign": "center",
+                                "fontSize": "28px",
+                                "fontWeight": "bold",
+                                "color": "#FF6F20",
+                                "margin": "5px 5px",
+                                "padding": "10px",
+                                "paddingBottom": "8px",
+                                "fontFamily": "Roboto, sans-serif",
+                                "borderRadius": "5px",
+                            },
+                        ),
+                        dbc.Card(
+                            children=[
+                                dbc.CardBody(
+                                    [
+                                        dcc.Input(
+                                            id="bulk-type-pattern-input",
+                                            type="text",
+                                            placeholder="Type pattern, e.g. WriteTo(Csv|Json)",
+                                            debounce=True,
+                                            style={
+                                                "width": "100%",
+                                                "padding": "6px 10px",
+                                                "border": "1px solid #ced4da",
+                                                "borderRadius": "6px",
+                                                "fontSize": "14px",
+                                                "marginBottom": "8px",
+                                            },
+                                        ),
+                                        html.Div(
+                                            id="bulk-edit-targets",
+                                            style={"fontSize": "13px", "marginBottom": "8px"},
+                                        ),
+                                        dcc.Textarea(
+                                            id="bulk-config-input",
+                                            placeholder="Config patch (YAML), e.g. num_shards: 4",
+                                            style={
+                                                "width": "100%",
+                                                "height": "80px",
+                                                "padding": "10px",
+                                                "border": "1px solid #ced4da",
+                                                "borderRadius": "6px",
+                                                "fontSize": "14px",
+                                                "backgroundColor": "#ffffff",
+                                                "boxShadow": "inset 0 1px 2px rgba(0,0,0,.05)",
+                                                "resize": "vertical",
+                                            },
+                                        ),
+                                        dcc.Input(
+                                            id="bulk-type-input",
+                                            type="text",
+                                            placeholder="New type, may use groups of the pattern, e.g. WriteToParquet",
+                                            style={
+                                                "width": "100%",
+                                                "padding": "6px 10px",
+                                                "border": "1px solid #ced4da",
+                                                "borderRadius": "6px",
+                                                "fontSize": "14px",
+                                                "marginBottom": "8px",
+                                            },
+                                        ),
+                                        html.Div(
+                                            [
+                                                html.Button(
+                                                    "Set Config",
+                                                    id="bulk-set-config-button",
+                                                    className="beam-button",
+                                                ),
+                                                html.Button(
+                                                    "Merge Config",
+                                                    id="bulk-merge-config-button",
+                                                    className="beam-button",
+                                                ),
+                                                html.Button(
+                                                    "Change Type",
+                                                    id="bulk-change-type-button",
+                                                    className="beam-button",
+                                                ),
+                                                html.Button(
+                                                    "Delete Subtree",
+                                                    id="bulk-delete-subtree-button",
+                                                    className="beam-button",
+                                                ),
+                                            ],
+                                            style={
+                                                "display": "flex",
+                                                "flexWrap": "wrap",
+                                                "justifyContent": "center",
+                                                "gap": "10px",
+                                            },
+                                        ),
+                                    ]
+                                )
+                            ]
+                        ),
+                    ],
+                    style={"marginTop": "20px"},
+                ),
                 html.Div(
                     [
                         html.H3(
@@ -118,6 +240,17 @@ def create_right_panel():
                                             ],
                                             style={"marginBottom": "10px"},
                                         ),
+                                        dcc.Checklist(
+                                            id="incremental-run-checklist",
+                                            options=[
+                                                {
+                                                    "label": " Reuse unchanged intermediate results (local runs)",
+                                                    "value": "incremental",
+                                                }
+                                            ],
+                                            value=[],
+                                            style={"fontSize": "14px"},
+                                        ),
                                     ]
                                 )
                             ]
@@ -134,6 +267,23 @@ def create_right_panel():
                                                 "marginRight": "10px",
                                             },
                                         ),
+                                        html.Button(
+                                            "Run Selection",
+                                            id="run-selection-button",
+                                            className="beam-button",
+                                            disabled=True,
+                                            style={
+                                                "marginRight": "10px",
+                                            },
+                                        ),
+                                        html.Button(
+                                            "Profile Run",
+                                            id="profile-pipeline-button",
+                                            className="beam-button",
+                                            style={
+                                                "marginRight": "10px",
+                                            },
+                                        ),
                                         html.Button(
                                             "Clear Logs",
                                             id="clear-graph-logs",
@@ -150,6 +300,187 @@ def create_right_panel():
                         ),
                     ]
                 ),
+                html.Div(
+                    [
+                        html.H3(
+                            "Execution Analysis",
+                            style={
+                                "textAlign": "center",
+                                "fontSize": "28px",
+                                "fontWeight": "bold",
+                                "color": "#FF6F20",
+                                "margin": "5px 5px",
+                                "padding": "10px",
+                                "paddingBottom": "8px",
+                                "fontFamily": "Roboto, sans-serif",
+                                "borderRadius": "5px",
+                            },
+                        ),
+                        dbc.Card(
+                            children=[
+                                dbc.CardBody(
+                                    [
+                                        html.Div(id="cost-analysis-report"),
+                                        html.Div(id="hazard-report", style={"marginTop": "10px"}),
+                                        html.Div(id="input-profile-report", style={"marginTop": "10px"}),
+                                    ]
+                                )
+                            ]
+                        ),
+                    ],
+                    style={"marginTop": "20px"},
+                ),
+                html.Div(
+                    [
+                        html.H3(
+                            "Optimizer",
+                            style={
+                                "textAlign": "center",
+                                "fontSize": "28px",
+                                "fontWeight": "bold",
+                                "color": "#FF6F20",
+                                "margin": "5px 5px",
+                                "padding": "10px",
+                                "paddingBottom": "8px",
+                                "fontFamily": "Roboto, sans-serif",
+                                "borderRadius": "5px",
+                            },
+                        ),
+                        dbc.Card(
+                            children=[
+                                dbc.CardBody(
+                                    [
+                                        dcc.Store(id="optimizer-proposals"),
+                                        html.Div(
+                                            "Click Analyze to find rewrites for the current pipeline",
+                                            id="optimizer-report",
+                                            style={"fontSize": "13px"},
+                                        ),
+                                        html.Div(
+                                            [
+                                                html.Button(
+                                                    "Analyze",
+                                                    id="analyze-rewrites-button",
+                                                    className="beam-button",
+                                                ),
+                                                html.Button(
+                                                    "Apply All",
+                                                    id="apply-all-rewrites-button",
+                                                    className="beam-button",
+                                                ),
+                                            ],
+                                            style={
+                                                "display": "flex",
+                                                "justifyContent": "center",
+                                                "gap": "5px",
+                                                "marginTop": "10px",
+                                            },
+                                        ),
+                                    ]
+                                )
+                            ]
+                        ),
+                    ],
+                    style={"marginTop": "20px"},
+                ),
+                html.Div(
+                    [
+                        html.H3(
+                            "Step Metrics",
+                            style={
+                                "textAlign": "center",
+                                "fontSize": "28px",
+                                "fontWeight": "bold",
+                                "color": "#FF6F20",
+                                "margin": "5px 5px",
+                                "padding": "10px",
+                                "paddingBottom": "8px",
+                                "fontFamily": "Roboto, sans-serif",
+                                "borderRadius": "5px",
+                            },
+                        ),
+                        dcc.Loading(
+                            type="default",
+                            color="#FF6F20",
+                            children=[
+                                dash_table.DataTable(
+                                    id="step-metrics-table",
+                                    columns=[
+                                        {"name": "Node", "id": "Node"},
+                                        {"name": "Elements In", "id": "Elements In", "type": "numeric"},
+                                        {"name": "Elements Out", "id": "Elements Out", "type": "numeric"},
+                                        {"name": "Time (ms)", "id": "Time (ms)", "type": "numeric"},
+                                    ],
+                                    data=[],
+                                    sort_action="native",
+                                    sort_by=[{"column_id": "Time (ms)", "direction": "desc"}],
+                                    style_table={"overflowX": "auto"},
+                                    style_cell={
+                                        "fontFamily": "Roboto, Arial, sans-serif",
+                                        "fontSize": "12px",
+                                        "textAlign": "left",
+                                        "padding": "5px",
+                                    },
+                                    style_header={"backgroundColor": "#F5F5F5", "fontWeight": "500"},
+                                ),
+                            ],
+                        ),
+                    ],
+                    style={"marginTop": "20px"},
+                ),
+                html.Div(
+                    [
+                        html.H3(
+                            "Outputs",
+                            style={
+                                "textAlign": "center",
+                                "fontSize": "28px",
+                                "fontWeight": "bold",
+                                "color": "#FF6F20",
+                                "margin": "5px 5px",
+                                "padding": "10px",
+                                "paddingBottom": "8px",
+                                "fontFamily": "Roboto, sans-serif",
+                                "borderRadius": "5px",
+                            },
+                        ),
+                        dcc.Dropdown(
+                            id="output-sink-dropdown",
+                            placeholder="Local sink",
+                            style={"fontSize": "14px"},
+                        ),
+                        dcc.Store(id="output-browser-state"),
+                        html.Div(
+                            id="output-browser-summary",
+                            style={"color": "#6c757d", "fontSize": "12px", "margin": "5px 0"},
+                        ),
+                        dash_table.DataTable(
+                            id="output-browser-table",
+                            data=[],
+                            style_table={"overflowX": "auto"},
+                            style_cell={
+                                "fontFamily": "Roboto, Arial, sans-serif",
+                                "fontSize": "12px",
+                                "textAlign": "left",
+                                "padding": "5px",
+                            },
+                            style_header={"backgroundColor": "#F5F5F5", "fontWeight": "500"},
+                        ),
+                        html.Div(
+                            [
+                                html.Button("Previous", id="output-prev-button", className="beam-button"),
+                                html.Button("Next", id="output-next-button", className="beam-button"),
+                            ],
+                            style={
+                                "display": "flex",
+                                "justifyContent": "center",
+                                "gap": "5px",
+                                "marginTop": "10px",
+                            },
+                        ),
+                    ],
+                    style={"marginTop": "20px"},
+                ),
             ],
             style={"height": "100%", "overflowY": "auto", "padding": "10px"},
         ),
@@ -0,0 +1,447 @@
+# standard libraries
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from beamforge.callbacks.graph_callbacks import UPLOAD_ROUTE
+
+# Each editing action fires the callbacks of the property it changes, then those
+# of the properties their responses change, up to this many rounds
+CASCADE_DEPTH = 4
+ACTIONS = ["tap", "edit_config", "rename", "set_type", "add_node", "delete_node"]
+ACTION_WEIGHTS = [3, 4, 1, 1, 2, 1]
+TRANSFORM_TYPES = ["MapToFields", "Filter", "Combine", "Sql"]
+
+
+def synthetic_pipeline(nodes, rng):
+    """Generate a Beam YAML pipeline of the given size, with sources, branches and sinks.
+
+    Args:
+        nodes (int): Number of transforms.
+        rng (random.Random): Random generator.
+
+    Returns:
+        str: Beam YAML pipeline.
+    """
+    # third party libraries
+    import yaml
+
+    transforms = []
+    sources = max(1, nodes // 10)
+    for index in range(nodes):
+        name = f"step-{index}"
+        if index < sources:
+            transforms.append(
+                {"type": "Create", "name": name, "config": {"elements": [{"id": i, "value": i * 10} for i in range(3)]}}
+            )
+            continue
+        upstream = transforms[rng.randrange(index)]["name"]
+        if index >= nodes - sources:
+            transforms.append(
+                {"type": "WriteToJson", "name": name, "input": upstream, "config": {"path": f"/tmp/{name}.json"}}
+            )
+            continue
+        transform_type = rng.choice(TRANSFORM_TYPES)
+        config = {
+            "MapToFields": {"language": "python", "fields": {"id": "id", "value": "value + 1"}},
+            "Filter": {"language": "python", "keep": "value > 5"},
+            "Combine": {"group_by": "id", "combine": {"value": "sum"}},
+            "Sql": {"query": "SELECT id, value FROM PCOLLECTION"},
+        }[transform_type]
+        transforms.append({"type": transform_type, "name": name, "input": upstream, "config": config})
+    return yaml.safe_dump({"pipeline": {"transforms": transforms}}, sort_keys=False)
+
+
+def apply_patch(value, patch):
+    """Apply a serialized dash.Patch to a property value, as the Dash renderer does.
+
+    Args:
+        value: Current property value.
+        patch (dict): Serialized Patch, with its list of operations.
+
+    Returns:
+        The patched value.
+    """
+    root = {"value": value}
+    for operation in patch["operations"]:
+        location = ["value"] + operation["location"]
+        parent = root
+        for key in location[:-1]:
+            parent = parent[key]
+        params = operation["params"]
+        kind = operation["operation"]
+        if kind == "Assign":
+            parent[location[-1]] = params["value"]
+            continue
+        if kind == "Delete":
+            del parent[location[-1]]
+            continue
+        target = parent[location[-1]]
+        if kind == "Append":
+            target.append(params["value"])
+        elif kind == "Prepend":
+            target.insert(0, params["value"])
+        elif kind == "Insert":
+            target.insert(params["index"], params["value"])
+        elif kind == "Extend":
+            target.extend(params["value"])
+        elif kind == "Remove":
+            target.remove(params["value"])
+        elif kind == "Clear":
+            target.clear()
+        elif kind == "Merge":
+            target.update(params["value"])
+        else:
+            raise ValueError(f"Unsupported patch operation {kind}")
+    return root["value"]
+
+
+def _parse_outputs(output):
+    outputs = []
+    for part in output[2:-2].split("...") if output.startswith("..") else [output]:
+        component_id, _, prop = part.rpartition(".")
+        outputs.append({"id": component_id, "property": prop})
+    return outputs
+
+
+def layout_props(layout, props=None):
+    """Collect the initial property values of every component with an id in a serialized Dash layout.
+
+    Returns:
+        dict: "id.property" to its value.
+    """
+    props = {} if props is None else props
+    if isinstance(layout, list):
+        for child in layout:
+            layout_props(child, props)
+    elif isinstance(layout, dict) and "props" in layout:
+        component_id = layout["props"].get("id")
+        for prop, value in layout["props"].items():
+            if isinstance(component_id, str):
+                props[f"{component_id}.{prop}"] = value
+            layout_props(value, props)
+    return props
+
+
+def callbacks_by_input(dependencies):
+    """Index the server-side callbacks from /_dash-dependencies by the properties that trigger them.
+
+    Clientside callbacks and callbacks on pattern-matching ids are left out.
+
+    Returns:
+        dict: "id.property" to the list of dependencies it is an input of.
+    """
+    index = {}
+    for dependency in dependencies:
+        if dependency.get("clientside_function"):
+            continue
+        if any(item["id"].startswith("{") for item in dependency["inputs"] + dependency["state"]):
+            continue
+        for item in dependency["inputs"]:
+            index.setdefault(f"{item['id']}.{item['property']}", []).append(dependency)
+    return index
+
+
+class EditorSession:
+    """One simulated editor: a browser-side store of property values and the callbacks it fires."""
+
+    def __init__(self, client, callbacks, layout, rng):
+        self.client = client
+        self.callbacks = callbacks
+        self.rng = rng
+        self.props = dict(layout)
+        self.request_latencies = []
+        self.errors = []
+
+    def _values(self, items):
+        return [dict(item, value=self.props.get(f"{item['id']}.{item['property']}")) for item in items]
+
+    def _post(self, dependency, changed):
+        outputs = _parse_outputs(dependency["output"])
+        payload = {
+            "output": dependency["output"],
+            "outputs": outputs if dependency["output"].startswith("..") else outputs[0],
+            "inputs": self._values(dependency["inputs"]),
+            "state": self._values(dependency["state"]),
+            "changedPropIds": changed,
+        }
+        start = time.perf_counter()
+        status, body = self.client.post_json("/_dash-update-component", payload)
+        self.request_latencies.append(time.perf_counter() - start)
+        if status == 204:
+            return []
+        if status != 200:
+            self.errors.append(f"{dependency['output']}: HTTP {status}")
+            return []
+
+        updated = []
+        for component_id, props in body.get("response", {}).items():
+            for prop, value in props.items():
+                key = f"{component_id}.{prop.split('@')[0]}"
+                if isinstance(value, dict) and "__dash_patch_update" in value:
+                    value = apply_patch(self.props.get(key), value)
+                self.props[key] = value
+                # Components rendered by a callback can be inputs of others
+                layout_props(value, self.props)
+                updated.append(key)
+        return updated
+
+    def set_prop(self, key, value):
+        """Change a property as a user would and fire every callback that follows from it."""
+        self.props[key] = value
+        changed = [key]
+        fired = set()
+        for _ in range(CASCADE_DEPTH):
+            updated = []
+            for prop in changed:
+                for dependency in self.callbacks.get(prop, []):
+                    if dependency["output"] in fired:
+                        continue
+                    fired.add(dependency["output"])
+                    inputs = [f"{item['id']}.{item['property']}" for item in dependency["inputs"]]
+                    updated.extend(self._post(dependency, [prop for prop in inputs if prop in changed]))
+            if not updated:
+                break
+            changed = updated
+
+    def click(self, button_id):
+        key = f"{button_id}.n_clicks"
+        self.set_prop(key, (self.props.get(key) or 0) + 1)
+
+    def nodes(self):
+        elements = self.props.get("network-graph.elements") or []
+        return [element["data"] for element in elements if "source" not in element["data"]]
+
+    def upload(self, yaml_content):
+        status, body = self.client.post_bytes(UPLOAD_ROUTE, yaml_content.encode("utf-8"))
+        if status != 200:
+            self.errors.append(f"upload: HTTP {status}")
+            return
+        self.set_prop("upload-handle.data", body)
+
+    def settle(self):
+        """Send the analysis request the browser sends once the editor pauses, see requestAnalysis."""
+        self.set_prop("analysis-request.data", (self.props.get("analysis-request.data") or 0) + 1)
+
+    def act(self, action):
+        """Perform one editing action on the current graph."""
+        nodes = self.nodes()
+        if action == "add_node" or not nodes:
+            self.click("add-node-button")
+            return
+        node = self.rng.choice(nodes)
+        if action == "delete_node":
+            self.props["network-graph.selectedNodeData"] = [node]
+            self.props["network-graph.selectedEdgeData"] = []
+            self.click("delete-selected")
+            return
+
+        # Editing a node starts by selecting it
+        self.set_prop("network-graph.tapNodeData", node)
+        if action == "edit_config":
+            config = dict(node.get("config") or {}, note=f"edit {self.rng.randrange(1 << 20)}")
+            self.set_prop("node-config-editor.value", json.dumps(config))
+        elif action == "rename":
+            self.set_prop("node-id-input.value", f"{node['id']}-{self.rng.randrange(1000)}")
+        elif action == "set_type":
+            options = self.props.get("node-type-dropdown.options") or [{"value": "MapToFields"}]
+            self.set_prop("node-type-dropdown.value", self.rng.choice(options)["value"])
+
+
+class FlaskClient:
+    """Drive the app in this process through the Flask test client."""
+
+    def __init__(self):
+        from beamforge.app import app
+
+        self.client = app.server.test_client()
+
+    def get_json(self, path):
+        return self.client.get(path).get_json()
+
+    def post_json(self, path, payload):
+        response = self.client.post(path, json=payload)
+        return response.status_code, response.get_json(silent=True) or {}
+
+    def post_bytes(self, path, data):
+        response = self.client.post(path, data=data, content_type="application/octet-stream")
+        return response.status_code, response.get_json(silent=True) or {}
+
+
+class HttpClient:
+    """Drive a running BeamForge server over HTTP."""
+
+    def __init__(self, url):
+        # third party libraries
+        import requests
+
+        self.url = url.rstrip("/")
+        self.session = requests.Session()
+
+    def get_json(self, path):
+        return self.session.get(self.url + path).json()
+
+    def post_json(self, path, payload):
+        response = self.session.post(self.url + path, json=payload)
+        return response.status_code, response.json() if response.content else {}
+
+    def post_bytes(self, path, data):
+        response = self.session.post(self.url + path, data=data)
+        return response.status_code, response.json() if response.content else {}
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_worker(worker, users, ops, nodes, seed, url=None):
+    """Run concurrent editing sessions against one app instance.
+
+    Args:
+        worker (int): Worker index, used to derive the random seeds.
+        users (int): Concurrent editors in this worker, one thread each.
+        ops (int): Editing actions per editor, after uploading a pipeline.
+        nodes (int): Transforms in each editor's synthetic pipeline.
+        seed (int): Random seed.
+        url (str): URL of a running server. The app is served in-process if None.
+
+    Returns:
+        dict: Request and action latencies in seconds, errors, and the resident
+        memory of the worker before and after the sessions.
+    """
+    rss_start = _rss_bytes()
+    clients = [HttpClient(url) if url else FlaskClient() for _ in range(users)]
+    callbacks = callbacks_by_input(clients[0].get_json("/_dash-dependencies"))
+    layout = layout_props(clients[0].get_json("/_dash-layout"))
+    rss_ready = _rss_bytes()
+
+    sessions = [
+        EditorSession(client, callbacks, layout, random.Random(f"{seed}-{worker}-{user}"))
+        for user, client in enumerate(clients)
+    ]
+    action_latencies = []
+    lock = threading.Lock()
+
+    def run_session(session):
+        session.upload(synthetic_pipeline(nodes, session.rng))
+        session.settle()
+        for _ in range(ops):
+            action = session.rng.choices(ACTIONS, weights=ACTION_WEIGHTS)[0]
+            start = time.perf_counter()
+            try:
+                session.act(action)
+                session.settle()
+            except Exception as e:
+                session.errors.append(f"{action}: {e!r}")
+            with lock:
+                action_latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=run_session, args=(session,)) for session in sessions]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "seconds": time.perf_counter() - start,
+        "request_latencies": [latency for session in sessions for latency in session.request_latencies],
+        "action_latencies": action_latencies,
+        "errors": [error for session in sessions for error in session.errors],
+        "rss_start": rss_start,
+        "rss_ready": rss_ready,
+        "rss_end": _rss_bytes(),
+    }
+
+
+def _percentiles(latencies):
+    latencies = sorted(latencies)
+    if not latencies:
+        return {}
+    return {
+        f"p{percentile}_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))] * 1000, 1)
+        for percentile in (50, 95, 99)
+    }
+
+
+def simulate(workers, users, ops, nodes, seed=0, url=None):
+    """Run editing sessions in worker processes and summarize throughput, latency and memory.
+
+    Args:
+        workers (int): Worker processes, each with its own app instance unless url is given.
+        users (int): Concurrent editors per worker.
+        ops (int): Editing actions per editor.
+        nodes (int): Transforms in each synthetic pipeline.
+        seed (int): Random seed.
+        url (str): URL of a running server to load instead of in-process apps.
+
+    Returns:
+        dict: Load test summary.
+    """
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        results = pool.starmap(run_worker, [(worker, users, ops, nodes, seed, url) for worker in range(workers)])
+    elapsed = time.perf_counter() - start
+
+    request_latencies = [latency for result in results for latency in result["request_latencies"]]
+    action_latencies = [latency for result in results for latency in result["action_latencies"]]
+    errors = [error for result in results for error in result["errors"]]
+    busy_seconds = max(result["seconds"] for result in results)
+    summary = {
+        "workers": workers,
+        "editors": workers * users,
+        "nodes": nodes,
+        "actions": len(action_latencies),
+        "requests": len(request_latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(request_latencies) / busy_seconds, 1),
+        "actions_per_second": round(len(action_latencies) / busy_seconds, 1),
+        "request": _percentiles(request_latencies),
+        "action": _percentiles(action_latencies),
+        "errors": len(errors),
+        "first_errors": errors[:5],
+    }
+    if not url:
+        summary["memory_growth_mb"] = [
+            round((result["rss_end"] - result["rss_ready"]) / 2**20, 1) for result in results
+        ]
+        summary["memory_mb"] = [round(result["rss_end"] / 2**20, 1) for result in results]
+    if request_latencies:
+        summary["request"]["mean_ms"] = round(statistics.mean(request_latencies) * 1000, 1)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Dash callbacks with simulated concurrent editors.")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes, each serving its own app")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent editors per worker")
+    parser.add_argument("--ops", type=int, default=50, help="Editing actions per editor")
+    parser.add_argument("--nodes", type=int, default=50, help="Transforms in each synthetic pipeline")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--url", default=None, help="Load a running server instead of in-process apps")
+    parser.add_argument("--store", default=None, help="Project store directory, defaults to a temporary one")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Set before the workers are spawned, so that their apps save projects there instead of the user's store
+        store_dir = args.store or tmp_dir
+        os.environ["BEAMFORGE_STORE_DIR"] = store_dir
+        os.environ["BEAMFORGE_MATERIALIZE_DIR"] = os.path.join(store_dir, "materialized")
+        summary = simulate(args.workers, args.users, args.ops, args.nodes, args.seed, args.url)
+    sys.stdout.write(json.dumps(summary) + "\n")
+    return 0 if not summary["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# standard libraries
+import bisect
+import functools
+import re
+
+# third party libraries
+import yaml
+
+from beamforge.utils.transform_parser import BEAM_VERSION, beam_yaml_transforms_config, beam_yaml_transforms_params
+
+COMPLETION_LIMIT = 50
+# Transform types come from the request, so the number of cached indexes is bounded
+COMPLETION_INDEX_CACHE_SIZE = 256
+
+# Values the docs describe in prose rather than in the parameter type
+KNOWN_ENUM_VALUES = {
+    "language": ["generic", "python", "javascript", "sql", "java"],
+}
+ONE_OF_PATTERN = re.compile(r"one of ([^.]*)", re.IGNORECASE)
+QUOTED_WORD_PATTERN = re.compile(r"[`'\"]([\w.-]+)[`'\"]")
+
+
+class PrefixIndex:
+    """Sorted completion terms supporting prefix lookups by binary search."""
+
+    def __init__(self, entries):
+        # Keep the best scoring entry per completion value
+        best = {}
+        for entry in entries:
+            if entry["value"] not in best or entry["score"] > best[entry["value"]]["score"]:
+                best[entry["value"]] = entry
+        self._entries = sorted(best.values(), key=lambda entry: entry["value"].lower())
+        self._keys = [entry["value"].lower() for entry in self._entries]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, prefix, limit=COMPLETION_LIMIT):
+        """Return up to limit entries starting with prefix (case-insensitive), or all of them if limit is 0."""
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_right(self._keys, prefix + "\uffff", lo=start)
+        matches = self._entries[start:end]
+        if limit and len(matches) > limit:
+            matches = sorted(matches, key=lambda entry: -entry["score"])[:limit]
+        return matches
+
+
+def _completion(value, meta, score):
+    return {"name": value, "value": value, "score": score, "meta": meta}
+
+
+def _parameter_completions(parameters):
+    for parameter in parameters:
+        score = 1000 if parameter["required"] else 900
+        yield _completion(parameter["name"], parameter["type"], score)
+
+        enum_values = list(KNOWN_ENUM_VALUES.get(parameter["name"], []))
+        one_of = ONE_OF_PATTERN.search(parameter.get("description", ""))
+        if one_of:
+            enum_values.extend(QUOTED_WORD_PATTERN.findall(one_of.group(1)))
+        for value in enum_values:
+            yield _completion(value, f"{parameter['name']} value", 800)
+
+        yield from _parameter_completions(parameter["fields"])
+
+
+def _example_field_names(value):
+    """Yield the mapping keys used anywhere in a usage example config."""
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield str(key)
+            yield from _example_field_names(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _example_field_names(child)
+
+
+@functools.lru_cache(maxsize=COMPLETION_INDEX_CACHE_SIZE)
+def build_completion_index(transform_type, beam_version=BEAM_VERSION):
+    """Build the completion index of a transform from the transform catalog.
+
+    The index holds the transform's config keys (including nested Row fields),
+    enum values of those keys, and the field names used in its usage example.
+
+    Args:
+        transform_type (str): Beam YAML transform type.
+        beam_version (str): Beam version the catalog was built for, part of the cache key.
+
+    Returns:
+        PrefixIndex: Index of Ace completion entries.
+    """
+    entries = list(_parameter_completions(beam_yaml_transforms_params().get(transform_type, [])))
+    try:
+        example = yaml.safe_load(beam_yaml_transforms_config().get(transform_type) or "")
+    except yaml.YAMLError:
+        example = None
+    entries.extend(_completion(name, "example field", 500) for name in _example_field_names(example))
+    return PrefixIndex(entries)
+
+
+def complete(transform_type, prefix, limit=COMPLETION_LIMIT):
+    """Return Ace completion entries for a prefix typed in the config editor of a transform.
+
+    Args:
+        transform_type (str): Beam YAML transform type.
+        prefix (str): Word being typed.
+        limit (int): Maximum number of entries, 0 for no limit.
+
+    Returns:
+        list: Ace completion dicts with name, value, score and meta.
+    """
+    return build_completion_index(transform_type).lookup(prefix or "", limit)
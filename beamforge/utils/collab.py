@@ -0,0 +1,312 @@
+# standard libraries
+import copy
+import json
+import os
+import re
+
+from beamforge.utils.project_store import connect
+
+# Operations a collaborative session exchanges instead of full element snapshots:
+#   reset         {"elements": [...]}                     replace the whole graph, used to start a session
+#   add_node      {"id", "type", "config"}
+#   delete        {"nodes": [id, ...], "edges": [[source, target], ...]}
+#   add_edge      {"source", "target"}
+#   rename        {"id", "new_id"}
+#   set_config    {"id", "config"}
+#   set_type      {"id", "type"}                          also resets the config
+#   update_nodes  {"nodes": [id, ...], "config", "merge"}  set the config of many nodes, or merge it in
+#   retype_nodes  {"nodes": [id, ...], "pattern", "type"}  retype those whose type matches pattern to type, which
+#                                                         may refer to its groups (e.g. "\\1"); also resets the configs
+OPERATIONS = {
+    "reset",
+    "add_node",
+    "delete",
+    "add_edge",
+    "rename",
+    "set_config",
+    "set_type",
+    "update_nodes",
+    "retype_nodes",
+}
+
+# Every this many operations, the log of a session is compacted into one reset to the elements
+# they lead to, so that it does not grow without bound
+COMPACT_EVERY = int(os.environ.get("BEAMFORGE_COLLAB_COMPACT_EVERY", 500))
+
+
+def _node_index(elements, node_id):
+    for index, element in enumerate(elements):
+        if "source" not in element["data"] and element["data"].get("id") == node_id:
+            return index
+    return None
+
+
+def _has_edge(elements, source, target):
+    return any(
+        (element["data"].get("source"), element["data"].get("target")) in {(source, target), (target, source)}
+        for element in elements
+        if "source" in element["data"]
+    )
+
+
+def merge_config(config, config_patch):
+    """Merge a config patch into a config, like a JSON merge patch.
+
+    Nested mappings are merged key by key, a None value removes the key, and
+    any other value replaces it.
+
+    Args:
+        config (dict): Current config, left unchanged.
+        config_patch (dict): Keys to set, merge or remove.
+
+    Returns:
+        dict: The merged config.
+    """
+    if not isinstance(config_patch, dict):
+        return copy.deepcopy(config_patch)
+    merged = dict(config) if isinstance(config, dict) else {}
+    for key, value in config_patch.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = merge_config(merged.get(key), value)
+    return merged
+
+
+def _edit_nodes(elements, op, patch):
+    # Bulk edits look their nodes up in one pass, so that thousands of targets stay cheap
+    node_ids = set(op.get("nodes", []))
+    if op["op"] == "retype_nodes":
+        try:
+            pattern = re.compile(op["pattern"])
+        except re.error:
+            return False
+
+    changed = False
+    for index, element in enumerate(elements):
+        data = element["data"]
+        if "source" in data or data.get("id") not in node_ids:
+            continue
+        if op["op"] == "update_nodes":
+            config = merge_config(data.get("config"), op["config"]) if op.get("merge") else copy.deepcopy(op["config"])
+            if data.get("config") == config:
+                continue
+            data["config"] = config
+            if patch is not None:
+                patch[index]["data"]["config"] = config
+        else:
+            match = pattern.fullmatch(data.get("type") or "")
+            if not match:
+                continue
+            try:
+                new_type = match.expand(op["type"])
+            except (re.error, IndexError):
+                # A bad group reference fails on the first matching node, before anything changed
+                return False
+            if data.get("type") == new_type:
+                continue
+            data["type"] = new_type
+            data["config"] = {}
+            if patch is not None:
+                patch[index]["data"]["type"] = new_type
+                patch[index]["data"]["config"] = {}
+        changed = True
+    return changed
+
+
+def apply_operation(elements, op, patch=None):
+    """Apply a graph operation to Cytoscape elements in place.
+
+    Operations that no longer make sense when they are applied, such as editing
+    a node another editor has deleted, are skipped. Since every editor applies
+    the same operations in the same order, all editors end up with the same
+    elements.
+
+    Args:
+        elements (list): Cytoscape elements, modified in place.
+        op (dict): Operation, with its kind under "op" (see OPERATIONS).
+        patch (dash.Patch): If given, receives the same changes so that they
+            can be sent to the browser as a delta.
+
+    Returns:
+        bool: Whether the operation changed the elements.
+
+    Raises:
+        ValueError: If the operation kind is unknown.
+    """
+    kind = op.get("op")
+    if kind not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {kind}")
+
+    if kind == "reset":
+        elements[:] = copy.deepcopy(op["elements"])
+        if patch is not None:
+            # A copy, since the patch is only serialized after later operations of the same batch changed elements
+            patch.clear()
+            patch.extend(copy.deepcopy(op["elements"]))
+        return True
+
+    if kind == "add_node":
+        if _node_index(elements, op["id"]) is not None:
+            return False
+        node = {"data": {"id": op["id"], "type": op.get("type", "UNKNOWN"), "config": op.get("config", {})}}
+        elements.append(node)
+        if patch is not None:
+            patch.append(node)
+        return True
+
+    if kind == "delete":
+        node_ids = set(op.get("nodes", []))
+        edges = {tuple(edge) for edge in op.get("edges", [])}
+        removed_indices = []
+        for index, element in enumerate(elements):
+            data = element["data"]
+            if "source" in data:
+                if (data["source"], data["target"]) in edges or (data["target"], data["source"]) in edges:
+                    removed_indices.append(index)
+            elif data.get("id") in node_ids:
+                removed_indices.append(index)
+        # Delete from the back so that the remaining indices stay valid
+        for index in reversed(removed_indices):
+            del elements[index]
+            if patch is not None:
+                del patch[index]
+        return bool(removed_indices)
+
+    if kind in ("update_nodes", "retype_nodes"):
+        return _edit_nodes(elements, op, patch)
+
+    if kind == "add_edge":
+        source, target = op["source"], op["target"]
+        if (
+            _node_index(elements, source) is None
+            or _node_index(elements, target) is None
+            or _has_edge(elements, source, target)
+        ):
+            return False
+        edge = {"data": {"source": source, "target": target}}
+        elements.append(edge)
+        if patch is not None:
+            patch.append(edge)
+        return True
+
+    index = _node_index(elements, op["id"])
+    if index is None:
+        return False
+
+    if kind == "rename":
+        old_id, new_id = op["id"], op["new_id"]
+        if not new_id or _node_index(elements, new_id) is not None:
+            return False
+        for edge_index, element in enumerate(elements):
+            data = element["data"]
+            if edge_index == index:
+                data["id"] = new_id
+                if patch is not None:
+                    patch[edge_index]["data"]["id"] = new_id
+            for end in ("source", "target"):
+                if data.get(end) == old_id:
+                    data[end] = new_id
+                    data["id"] = None
+                    if patch is not None:
+                        patch[edge_index]["data"][end] = new_id
+                        patch[edge_index]["data"]["id"] = None
+        return True
+
+    data = elements[index]["data"]
+    if kind == "set_config":
+        if data.get("config") == op["config"]:
+            return False
+        data["config"] = op["config"]
+        if patch is not None:
+            patch[index]["data"]["config"] = op["config"]
+        return True
+
+    # set_type
+    if data.get("type") == op["type"]:
+        return False
+    data["type"] = op["type"]
+    data["config"] = {}
+    if patch is not None:
+        patch[index]["data"]["type"] = op["type"]
+        patch[index]["data"]["config"] = {}
+    return True
+
+
+def _compact(conn, session, seq):
+    """Replace the operations of a session up to seq with a reset to the elements they lead to.
+
+    The reset keeps sequence number seq, so editors that applied it see no
+    change, and editors behind it read the reset next and catch up from it.
+    """
+    elements = []
+    rows = conn.execute("SELECT op FROM collab_ops WHERE session = ? AND seq <= ? ORDER BY seq", (session, seq))
+    for (op,) in rows.fetchall():
+        apply_operation(elements, json.loads(op))
+    conn.execute("DELETE FROM collab_ops WHERE session = ? AND seq < ?", (session, seq))
+    conn.execute(
+        "UPDATE collab_ops SET op = ? WHERE session = ? AND seq = ?",
+        (json.dumps({"op": "reset", "elements": elements}), session, seq),
+    )
+
+
+def append_operation(session, client, op, path=None, compact_every=COMPACT_EVERY):
+    """Append an operation to the log of a session.
+
+    The log is the single source of ordering: the sequence number is assigned
+    under the database write lock, so concurrent writers from any thread or
+    worker process get distinct, gapless numbers. Every compact_every
+    operations, the log is compacted in the same transaction.
+
+    Args:
+        session (str): Session name.
+        client (str): Id of the editor sending the operation.
+        op (dict): Operation, see apply_operation.
+        path (str): Project store file.
+        compact_every (int): Operations between compactions of the log.
+
+    Returns:
+        int: Sequence number of the operation.
+    """
+    if op.get("op") not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {op.get('op')}")
+    with connect(path, immediate=True) as conn:
+        seq = conn.execute(
+            "INSERT INTO collab_ops (session, seq, client, op) "
+            "SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM collab_ops WHERE session = ? "
+            "RETURNING seq",
+            (session, client, json.dumps(op), session),
+        ).fetchone()[0]
+        if compact_every and seq % compact_every == 0:
+            _compact(conn, session, seq)
+        return seq
+
+
+def read_operations(session, after=0, path=None):
+    """Return the operations of a session after a sequence number, as dicts with seq, client and op."""
+    with connect(path) as conn:
+        rows = conn.execute(
+            "SELECT seq, client, op FROM collab_ops WHERE session = ? AND seq > ? ORDER BY seq",
+            (session, after),
+        )
+        return [{"seq": seq, "client": client, "op": json.loads(op)} for seq, client, op in rows]
+
+
+def latest_sequence(session, path=None):
+    """Return the sequence number of the last operation of a session, or 0 if it has none."""
+    with connect(path) as conn:
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM collab_ops WHERE session = ?", (session,)).fetchone()[0]
+
+
+def replay_session(session, path=None):
+    """Rebuild the elements of a session from its operation log.
+
+    Returns:
+        tuple: (elements, last sequence number)
+    """
+    elements = []
+    seq = 0
+    for entry in read_operations(session, path=path):
+        apply_operation(elements, entry["op"])
+        seq = entry["seq"]
+    return elements, seq
@@ -0,0 +1,148 @@
+# standard libraries
+import functools
+import re
+
+# third party libraries
+import yaml
+
+from beamforge.utils.transform_parser import BEAM_VERSION, beam_yaml_transforms_params
+
+ATOMIC_TYPES = {
+    "string": (str,),
+    "boolean": (bool,),
+    "byte": (int,),
+    "int16": (int,),
+    "int32": (int,),
+    "int64": (int,),
+    "float": (int, float),
+    "double": (int, float),
+    "decimal": (int, float),
+    "bytes": (str, bytes),
+}
+CONTAINER_TYPE_PATTERN = re.compile(r"^(Array|Iterable|Map)\[(.*)\]$")
+
+# Use the libyaml bindings when available, config edits are validated on every keystroke
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _compile_type(type_name):
+    """Compile a documentation type name such as ``Array[string]`` into a predicate, or None for any type."""
+    if type_name in ATOMIC_TYPES:
+        python_types = ATOMIC_TYPES[type_name]
+        if bool in python_types:
+            return lambda value: isinstance(value, bool)
+        return lambda value: isinstance(value, python_types) and not isinstance(value, bool)
+    if type_name == "Row":
+        return lambda value: isinstance(value, dict)
+
+    match = CONTAINER_TYPE_PATTERN.match(type_name)
+    if match and match.group(1) == "Map":
+        return lambda value: isinstance(value, dict)
+    if match:
+        check_element = _compile_type(match.group(2))
+        if check_element is None:
+            return lambda value: isinstance(value, list)
+        return lambda value: isinstance(value, list) and all(check_element(element) for element in value)
+    return None
+
+
+def _compile_fields(parameters):
+    return {
+        parameter["name"]: (
+            parameter["required"],
+            parameter["type"],
+            _compile_type(parameter["type"]),
+            _compile_fields(parameter["fields"]) if parameter["fields"] else None,
+        )
+        for parameter in parameters
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def compile_config_validator(transform_type, beam_version=BEAM_VERSION):
+    """Compile the config schema of a transform from the catalog's parameter metadata.
+
+    Args:
+        transform_type (str): Beam YAML transform type.
+        beam_version (str): Beam version the catalog was built for, part of the cache key.
+
+    Returns:
+        dict: Field name to (required, type name, type predicate, nested fields), or None if
+            the catalog has no parameter metadata for the transform.
+    """
+    parameters = beam_yaml_transforms_params().get(transform_type)
+    if parameters is None:
+        return None
+    return _compile_fields(parameters)
+
+
+def _annotation(mark, annotation_type, text):
+    return {"row": mark.line, "column": mark.column, "type": annotation_type, "text": text}
+
+
+def _validate_mapping(fields, node, data, path, annotations):
+    nodes_by_key = {}
+    if isinstance(node, yaml.MappingNode):
+        nodes_by_key = {key_node.value: (key_node, value_node) for key_node, value_node in node.value}
+
+    for name, (required, type_name, check, nested_fields) in fields.items():
+        if name not in data:
+            if required:
+                annotations.append(_annotation(node.start_mark, "error", f"Missing required field '{path}{name}'"))
+            continue
+        value = data[name]
+        key_node, value_node = nodes_by_key.get(name, (node, node))
+        if value is None and not required:
+            continue
+        if check is not None and not check(value):
+            annotations.append(
+                _annotation(
+                    value_node.start_mark,
+                    "error",
+                    f"Field '{path}{name}' should be {type_name}, got {type(value).__name__}",
+                )
+            )
+        elif nested_fields and isinstance(value, dict):
+            _validate_mapping(nested_fields, value_node, value, f"{path}{name}.", annotations)
+
+    for name in data:
+        if name not in fields:
+            key_node = nodes_by_key.get(str(name), (node, node))[0]
+            annotations.append(_annotation(key_node.start_mark, "warning", f"Unknown field '{path}{name}'"))
+
+
+def validate_transform_config(transform_type, config_text):
+    """Validate a transform config against the compiled schema of its type.
+
+    Args:
+        transform_type (str): Beam YAML transform type.
+        config_text (str): YAML text of the config, as typed in the editor.
+
+    Returns:
+        list: Ace editor annotations (row, column, type and text), where type is
+            "error" for missing or mistyped fields and "warning" for unknown fields.
+
+    Raises:
+        yaml.YAMLError: If config_text is not valid YAML.
+    """
+    fields = compile_config_validator(transform_type)
+    if fields is None:
+        return []
+
+    loader = YAML_LOADER(config_text)
+    try:
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else None
+    finally:
+        loader.dispose()
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        mark = node.start_mark if node is not None else yaml.Mark("config", 0, 0, 0, None, None)
+        return [_annotation(mark, "error", f"Config should be a mapping, got {type(data).__name__}")]
+    if node is None:
+        node = yaml.MappingNode("tag:yaml.org,2002:map", [], yaml.Mark("config", 0, 0, 0, None, None))
+
+    annotations = []
+    _validate_mapping(fields, node, data, "", annotations)
+    return annotations
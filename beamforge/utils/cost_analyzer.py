@@ -0,0 +1,176 @@
+# standard libraries
+import functools
+import re
+import threading
+from collections import OrderedDict
+
+from beamforge.utils.preview import upstream_hashes
+
+ELEMENT_WISE = "element-wise"
+SHUFFLE = "shuffle"
+IO = "io"
+
+SHUFFLE_TYPES = {"GroupBy", "Combine", "Flatten", "Join", "Reshuffle", "GroupIntoBatches"}
+IO_TYPES = {"Create"}
+IO_PREFIXES = ("ReadFrom", "WriteTo")
+SQL_SHUFFLE_PATTERN = re.compile(r"\b(join|group\s+by|distinct|union|intersect|except)\b", re.IGNORECASE)
+
+# A shuffle costs far more than a fused step, so it dominates the critical path
+SHUFFLE_COST = 10
+FAN_OUT_THRESHOLD = 3
+# Per-node results, keyed by the hash of the node and everything upstream of it
+NODE_ANALYSIS_CACHE_SIZE = 16384
+
+_node_analysis_cache = OrderedDict()
+_node_analysis_cache_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify(transform_type, query):
+    if transform_type.startswith(IO_PREFIXES) or transform_type in IO_TYPES:
+        return IO
+    if transform_type in SHUFFLE_TYPES:
+        return SHUFFLE
+    if transform_type == "Sql" and SQL_SHUFFLE_PATTERN.search(query or ""):
+        return SHUFFLE
+    return ELEMENT_WISE
+
+
+def classify_transform(transform_type, config):
+    """Classify a transform as element-wise, shuffle or I/O.
+
+    Args:
+        transform_type (str): Beam YAML transform type.
+        config (dict): Transform config. Only Sql queries affect the result.
+
+    Returns:
+        str: One of ELEMENT_WISE, SHUFFLE or IO.
+    """
+    query = config.get("query") if transform_type == "Sql" and isinstance(config, dict) else None
+    return _classify(transform_type or "Unknown", query)
+
+
+def predict_fusion_stages(G, kinds):
+    """Group nodes into the stages a runner is expected to fuse them into.
+
+    A node is fused with its producers unless it is a shuffle, in which case it
+    starts a new stage that its own consumers are fused into.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+        kinds (dict): Classification of every node.
+
+    Returns:
+        dict: Mapping of node id to stage index, numbered in topological order.
+    """
+    # third party libraries
+    import networkx as nx
+
+    parent = {node_id: node_id for node_id in G.nodes}
+
+    def find(node_id):
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
+    for source, target in G.edges():
+        if kinds[target] != SHUFFLE:
+            parent[find(target)] = find(source)
+
+    stage_ids = {}
+    stages = {}
+    for node_id in nx.topological_sort(G):
+        root = find(node_id)
+        stages[node_id] = stage_ids.setdefault(root, len(stage_ids))
+    return stages
+
+
+def _analyze_node(G, node_id, upstream_results):
+    """Compute the results of a node that only depend on it and its upstream, given those of its inputs."""
+    node_data = G.nodes[node_id]
+    kind = classify_transform(node_data.get("type", "Unknown"), node_data.get("config") or {})
+    predecessors = sorted(G.predecessors(node_id))
+    depth = max((upstream_results[pred]["depth"] for pred in predecessors), default=0)
+    # Cost of the most expensive path ending at the node, and the input it comes through
+    cost, via = 0, None
+    for pred in predecessors:
+        if via is None or upstream_results[pred]["cost"] > cost:
+            cost, via = upstream_results[pred]["cost"], pred
+    if via is not None:
+        cost += SHUFFLE_COST if kind == SHUFFLE else 1
+    return {"kind": kind, "depth": depth + (1 if kind == SHUFFLE else 0), "cost": cost, "via": via}
+
+
+def analyze_pipeline(G):
+    """Statically estimate the execution shape of a pipeline graph.
+
+    The kind, shuffle depth and most expensive incoming path of every node are
+    cached per node by the hash of the node and its upstream, so after an edit
+    only the edited nodes and those downstream of them are analyzed again.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph, as returned by parse_beam_yaml.
+
+    Returns:
+        dict: Analysis with the keys
+            kinds: node id to ELEMENT_WISE, SHUFFLE or IO,
+            stages: node id to predicted fusion stage,
+            stage_depth: stage index to the number of shuffles before it,
+            shuffles: shuffle node ids in topological order,
+            critical_path: node ids of the most expensive source-to-sink path,
+            critical_path_depth: number of shuffles on the critical path,
+            fan_out: node id to number of consumers, for nodes at or above FAN_OUT_THRESHOLD.
+
+    Raises:
+        ValueError: If the graph has a cycle.
+    """
+    # third party libraries
+    import networkx as nx
+
+    if not nx.is_directed_acyclic_graph(G):
+        raise ValueError("Pipeline graph has a cycle")
+
+    order = list(nx.topological_sort(G))
+    hashes = upstream_hashes(G, order)
+    results = {}
+    with _node_analysis_cache_lock:
+        for node_id in order:
+            if hashes[node_id] in _node_analysis_cache:
+                _node_analysis_cache.move_to_end(hashes[node_id])
+                results[node_id] = _node_analysis_cache[hashes[node_id]]
+
+    analyzed = {}
+    for node_id in order:
+        if node_id not in results:
+            results[node_id] = analyzed[hashes[node_id]] = _analyze_node(G, node_id, results)
+
+    with _node_analysis_cache_lock:
+        _node_analysis_cache.update(analyzed)
+        while len(_node_analysis_cache) > NODE_ANALYSIS_CACHE_SIZE:
+            _node_analysis_cache.popitem(last=False)
+
+    kinds = {node_id: results[node_id]["kind"] for node_id in G.nodes}
+    stages = predict_fusion_stages(G, kinds)
+    stage_depth = {}
+    for node_id, stage in stages.items():
+        stage_depth[stage] = max(stage_depth.get(stage, 0), results[node_id]["depth"])
+
+    critical_path = []
+    node_id = max(order, key=lambda node_id: results[node_id]["cost"], default=None)
+    while node_id is not None:
+        critical_path.append(node_id)
+        node_id = results[node_id]["via"]
+    critical_path.reverse()
+
+    return {
+        "kinds": kinds,
+        "stages": stages,
+        "stage_depth": stage_depth,
+        "shuffles": [node_id for node_id in order if kinds[node_id] == SHUFFLE],
+        "critical_path": critical_path,
+        "critical_path_depth": sum(1 for node_id in critical_path if kinds[node_id] == SHUFFLE),
+        "fan_out": {
+            node_id: G.out_degree(node_id) for node_id in G.nodes if G.out_degree(node_id) >= FAN_OUT_THRESHOLD
+        },
+    }
@@ -0,0 +1,255 @@
+# standard libraries
+import copy
+import functools
+import hashlib
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+
+# third party libraries
+import yaml
+
+from beamforge.utils.graph_utils import custom_yaml_dump
+from beamforge.utils.local_services import ensure_local_service
+from beamforge.utils.preview import source_file_stamps, upstream_hashes
+from beamforge.utils.step_metrics import match_node_id
+from beamforge.utils.yaml_parser import parse_beam_yaml
+
+# Beam's own provider files, which map each cross-language transform type to
+# the expansion service jar that provides it
+STANDARD_PROVIDER_FILES = ("standard_providers.yaml", "standard_io.yaml")
+EXPANSION_SERVICE_IDLE_TIMEOUT = int(os.environ.get("BEAMFORGE_EXPANSION_SERVICE_IDLE_TIMEOUT", 1800))
+SCHEMA_CACHE_SIZE = 1024
+
+_schema_cache = OrderedDict()
+_schema_cache_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def java_provider_specs():
+    """Index Beam's standard jar-backed provider specs by the transform types they provide.
+
+    Only types without a Python implementation are included, so that pipelines
+    that can be expanded without Java never start an expansion service.
+
+    Returns:
+        dict: Transform type to (provider spec, gradle target of its jar).
+    """
+    # third party libraries
+    import apache_beam.yaml
+    from apache_beam.yaml import yaml_provider
+
+    standard_providers = yaml_provider.standard_providers()
+    index = {}
+    for file_name in STANDARD_PROVIDER_FILES:
+        with open(os.path.join(os.path.dirname(apache_beam.yaml.__file__), file_name)) as f:
+            specs = yaml.safe_load(f) or []
+        for spec in specs:
+            jar_spec = spec if spec.get("type") == "beamJar" else (spec.get("config") or {}).get("underlying_provider")
+            if not isinstance(jar_spec, dict) or jar_spec.get("type") != "beamJar":
+                continue
+            gradle_target = jar_spec["config"]["gradle_target"]
+            for transform_type in spec.get("transforms", {}):
+                providers = standard_providers.get(transform_type, [])
+                if providers and all(
+                    isinstance(provider.underlying_provider(), yaml_provider.ExternalJavaProvider)
+                    for provider in providers
+                ):
+                    index.setdefault(transform_type, (spec, gradle_target))
+    return index
+
+
+def expansion_service_name(gradle_target):
+    return "expansion-" + gradle_target.replace(":", "-").strip("-")
+
+
+def _expansion_service_command(gradle_target):
+    # third party libraries
+    from apache_beam.utils import subprocess_server
+
+    jar = subprocess_server.JavaJarServer.local_jar(subprocess_server.JavaJarServer.path_to_beam_jar(gradle_target))
+    (port,) = subprocess_server.pick_port(None)
+    command = [subprocess_server.JavaHelper.get_java(), "-jar", jar, port, f"--filesToStage={jar}"]
+    return command, f"localhost:{port}"
+
+
+def ensure_expansion_service(gradle_target, store_dir=None):
+    """Return the address of the warm expansion service for a jar, starting it if needed.
+
+    Args:
+        gradle_target (str): Gradle target of the Beam expansion service jar.
+        store_dir (str): Directory holding the service's state, lock and log files.
+
+    Returns:
+        str: host:port of the expansion service.
+    """
+    return ensure_local_service(
+        expansion_service_name(gradle_target),
+        functools.partial(_expansion_service_command, gradle_target),
+        EXPANSION_SERVICE_IDLE_TIMEOUT,
+        store_dir=store_dir,
+    )
+
+
+def _as_remote(spec, address, transform_types):
+    """Replace the jar-backed provider in a spec, possibly under a renaming provider, with a remote one.
+
+    The spec is narrowed to transform_types, so that the remote provider does
+    not take over transforms that Python also provides, such as Flatten.
+    """
+    spec = copy.deepcopy(spec)
+    spec["transforms"] = {name: urn for name, urn in spec["transforms"].items() if name in transform_types}
+    if spec.get("type") == "beamJar":
+        return {"type": "remote", "config": {"address": address}, "transforms": spec["transforms"]}
+    underlying = spec["config"]["underlying_provider"]
+    spec["config"]["underlying_provider"] = {
+        "type": "remote",
+        "config": {"address": address},
+        "transforms": underlying["transforms"],
+    }
+    return spec
+
+
+def pooled_provider_specs(transform_types, store_dir=None):
+    """Provider specs that point the given transform types at warm expansion services.
+
+    Services that cannot be started are left out with a warning, so that Beam
+    falls back to starting its own.
+
+    Args:
+        transform_types (iterable): Transform types used by a pipeline.
+        store_dir (str): Directory holding the services' state, lock and log files.
+
+    Returns:
+        list: Provider specs for the pipeline's ``providers`` section.
+    """
+    index = java_provider_specs()
+    specs = []
+    seen = set()
+    for transform_type in sorted(set(transform_types)):
+        if transform_type not in index:
+            continue
+        spec, gradle_target = index[transform_type]
+        if id(spec) in seen:
+            continue
+        seen.add(id(spec))
+        try:
+            address = ensure_expansion_service(gradle_target, store_dir)
+        except Exception as e:
+            warnings.warn(f"Could not start an expansion service for {gradle_target}: {e}")
+            continue
+        specs.append(_as_remote(spec, address, index))
+    return specs
+
+
+def with_pooled_providers(yaml_content, store_dir=None):
+    """Point the cross-language transforms of a Beam YAML pipeline at warm expansion services.
+
+    Args:
+        yaml_content (str): Beam YAML pipeline.
+        store_dir (str): Directory holding the services' state, lock and log files.
+
+    Returns:
+        str: The pipeline with the extra providers, or unchanged if it uses none.
+    """
+    G = parse_beam_yaml(yaml_content)
+    specs = pooled_provider_specs((node_data.get("type") for _, node_data in G.nodes(data=True)), store_dir)
+    if not specs:
+        return yaml_content
+    data = yaml.safe_load(yaml_content)
+    data["providers"] = list(data.get("providers") or []) + specs
+    return custom_yaml_dump(data)
+
+
+def _format_schema(element_type):
+    # third party libraries
+    from apache_beam.typehints.schemas import named_fields_from_element_type
+
+    try:
+        fields = named_fields_from_element_type(element_type)
+    except (TypeError, ValueError):
+        return str(element_type)
+    return ", ".join(f"{name}: {getattr(field_type, '__name__', field_type)}" for name, field_type in fields)
+
+
+def _expand_output_schemas(yaml_content, node_ids):
+    # third party libraries
+    import apache_beam as beam
+    from apache_beam.yaml import yaml_transform
+
+    pipeline = beam.Pipeline()
+    yaml_transform.expand_pipeline(pipeline, yaml_content)
+
+    schemas = {}
+
+    class SchemaVisitor(beam.pipeline.PipelineVisitor):
+        def enter_composite_transform(self, transform_node):
+            self.visit_transform(transform_node)
+
+        def visit_transform(self, transform_node):
+            label = transform_node.full_label
+            node_id = match_node_id(label, node_ids)
+            if node_id is not None and "/" not in label:
+                schemas[node_id] = {
+                    tag if isinstance(tag, str) else "output": _format_schema(pcoll.element_type)
+                    for tag, pcoll in transform_node.outputs.items()
+                }
+
+    pipeline.visit(SchemaVisitor())
+    return schemas
+
+
+def dry_run_pipeline(yaml_content, store_dir=None):
+    """Expand a Beam YAML pipeline without running it and report the output schema of every node.
+
+    Cross-language transforms are expanded by the warm expansion services.
+    Schemas are cached per node by the hash of its upstream subgraph (types,
+    configs and edges) and the modification times of the local files its
+    sources read, since sources such as ReadFromCsv infer their schema from
+    the file. Both are folded along the edges in topological order, in linear
+    time. A dry run only expands the pipeline again when some node's upstream
+    changed.
+
+    Args:
+        yaml_content (str): Beam YAML pipeline.
+        store_dir (str): Directory holding the services' state, lock and log files.
+
+    Returns:
+        tuple: (schemas, cached) where schemas maps each node id to its output
+        element types by output tag, and cached tells whether no expansion was needed.
+
+    Raises:
+        ValueError: If the pipeline graph has a cycle.
+    """
+    # third party libraries
+    import networkx as nx
+
+    G = parse_beam_yaml(yaml_content)
+    if not nx.is_directed_acyclic_graph(G):
+        raise ValueError("Pipeline graph has a cycle")
+    order = list(nx.topological_sort(G))
+    hashes = upstream_hashes(G, order)
+    stamps = dict(source_file_stamps(G))
+    # The file stamps of the sources reach every node downstream of them, as the hashes do
+    cache_keys = {}
+    for node_id in order:
+        entry = [hashes[node_id], stamps.get(node_id)]
+        entry.append(sorted(cache_keys[upstream_id] for upstream_id in G.predecessors(node_id)))
+        cache_keys[node_id] = hashlib.sha256(json.dumps(entry).encode("utf-8")).hexdigest()
+    with _schema_cache_lock:
+        if all(key in _schema_cache for key in cache_keys.values()):
+            for key in cache_keys.values():
+                _schema_cache.move_to_end(key)
+            return {node_id: _schema_cache[key] for node_id, key in cache_keys.items()}, True
+
+    schemas = _expand_output_schemas(with_pooled_providers(yaml_content, store_dir), set(G.nodes))
+
+    with _schema_cache_lock:
+        for node_id, key in cache_keys.items():
+            if node_id in schemas:
+                _schema_cache[key] = schemas[node_id]
+        while len(_schema_cache) > SCHEMA_CACHE_SIZE:
+            _schema_cache.popitem(last=False)
+    return schemas, False
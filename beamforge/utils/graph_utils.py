@@ -25,8 +25,8 @@ def custom_yaml_dump(data):
     )
 
 
-def generate_yaml_content(elements):
-    yaml_data = {"pipeline": {}}
+def pipeline_transforms(elements):
+    """Return the transforms of the pipeline section generate_yaml_content writes for the elements."""
     nodes_data = {}
     for elem in elements:
         if "source" in elem["data"]:
@@ -38,6 +38,8 @@ def generate_yaml_content(elements):
                 "name": node_id,
                 "config": elem["data"].get("config", {}),
             }
+            if "windowing" in elem["data"]:
+                nodes_data[node_id]["windowing"] = elem["data"]["windowing"]
     for elem in elements:
         if "source" in elem["data"]:
             target_node_id = elem["data"]["target"]
@@ -47,13 +49,80 @@ def generate_yaml_content(elements):
                 if "input" not in nodes_data[target_node_id]:
                     nodes_data[target_node_id]["input"] = {}
                 nodes_data[target_node_id]["input"][elem["data"]["source"]] = source_node_id
+    return list(nodes_data.values())
 
-    yaml_data["pipeline"]["transforms"] = list(nodes_data.values())
 
+def generate_yaml_content(elements):
+    yaml_data = {"pipeline": {"transforms": pipeline_transforms(elements)}}
     yaml_string = custom_yaml_dump(yaml_data)
     return yaml_string
 
 
+def graph_to_elements(G):
+    """
+    Convert a NetworkX pipeline graph into Cytoscape elements.
+
+    Args:
+        G: The NetworkX DiGraph, as returned by parse_beam_yaml.
+
+    Returns:
+        A list of Cytoscape node elements followed by edge elements.
+    """
+    elements = []
+
+    # Add nodes
+    for node_id, node_data in G.nodes(data=True):
+        data = {
+            "id": node_id,
+            "type": node_data.get("type", "Unknown"),
+            "config": node_data.get("config", {}),
+        }
+        # The file a node was loaded from and its origin there, for pipelines split across files
+        for key in ("file", "origin"):
+            if key in node_data:
+                data[key] = node_data[key]
+        # Beam YAML's transform-level windowing, which sits next to config
+        if "windowing" in node_data:
+            data["windowing"] = node_data["windowing"]
+        elements.append({"data": data})
+
+    # Add edges
+    for source, target in G.edges():
+        elements.append({"data": {"source": source, "target": target}})
+
+    return elements
+
+
+def elements_to_graph(elements):
+    """
+    Convert Cytoscape elements back into a NetworkX graph.
+
+    Args:
+        elements: The Cytoscape elements of the pipeline graph.
+
+    Returns:
+        A NetworkX DiGraph with the same node attributes as parse_beam_yaml.
+    """
+    # third party libraries
+    import networkx as nx
+
+    G = nx.DiGraph()
+    for elem in elements:
+        if "source" not in elem["data"]:
+            G.add_node(
+                elem["data"]["id"],
+                type=elem["data"].get("type", "Unknown"),
+                config=elem["data"].get("config", {}),
+            )
+            for key in ("file", "origin", "windowing"):
+                if key in elem["data"]:
+                    G.nodes[elem["data"]["id"]][key] = elem["data"][key]
+    for elem in elements:
+        if "source" in elem["data"]:
+            G.add_edge(elem["data"]["source"], elem["data"]["target"])
+    return G
+
+
 def format_log_with_timestamp(log_message):
     if not log_message:
         return []
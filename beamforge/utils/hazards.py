@@ -0,0 +1,295 @@
+# standard libraries
+import ast
+import importlib
+import os
+import threading
+import warnings
+import weakref
+from importlib.metadata import entry_points
+
+from beamforge.utils.cost_analyzer import SHUFFLE, classify_transform
+from beamforge.utils.optimizer import python_predicate_to_sql
+
+INFO = "info"
+WARNING = "warning"
+ERROR = "error"
+SEVERITY_ORDER = {ERROR: 0, WARNING: 1, INFO: 2}
+
+# Extra rule modules, as a comma-separated list of importable module names.
+# Installed packages can instead expose rules under this entry point group.
+HAZARD_RULES_ENV = "BEAMFORGE_HAZARD_RULES"
+HAZARD_RULES_ENTRY_POINT_GROUP = "beamforge.hazard_rules"
+
+# Aggregations a runner can lift into a combiner before the shuffle
+COMBINER_FRIENDLY_FNS = {"sum", "min", "max", "mean", "count", "all", "any"}
+# Aggregations that keep every value, so the shuffle moves the whole input anyway
+COLLECTING_FNS = {"group", "concat"}
+UNBOUNDED_SOURCES = {"ReadFromPubSub", "ReadFromPubSubLite", "ReadFromKafka"}
+GROUPING_TYPES = {"Combine", "GroupBy"}
+# Transforms that group by key per window, and so never emit in the global window of an unbounded input
+WINDOWED_GROUPING_TYPES = GROUPING_TYPES | {"Join"}
+
+HAZARD_RULES = []
+
+_plugins_loaded = False
+_plugins_lock = threading.Lock()
+
+_unwindowed_sources_cache = weakref.WeakKeyDictionary()
+_unwindowed_sources_lock = threading.Lock()
+
+
+def register_rule(rule=None, *, types=None):
+    """Register a hazard rule, as a decorator.
+
+    A rule is called as ``rule(G, node_id, node_data)`` for every node of the
+    pipeline graph, or only for nodes of the given transform types, and yields
+    ``(severity, message)`` pairs, with severity one of INFO, WARNING or ERROR.
+
+    Args:
+        rule (callable): The rule, when used as ``@register_rule``.
+        types (iterable): Transform types the rule applies to, when used as
+            ``@register_rule(types=[...])``. All types by default.
+
+    Returns:
+        callable: The rule, unchanged.
+    """
+
+    def decorator(func):
+        func.hazard_types = frozenset(types) if types else None
+        if func not in HAZARD_RULES:
+            HAZARD_RULES.append(func)
+        return func
+
+    return decorator(rule) if rule is not None else decorator
+
+
+def load_plugin_rules():
+    """Import the rule modules named in BEAMFORGE_HAZARD_RULES and the beamforge.hazard_rules entry points, once.
+
+    An entry point may name a module, which registers its rules on import, or a
+    rule function. Plugins that fail to load are skipped with a warning.
+    """
+    global _plugins_loaded
+    with _plugins_lock:
+        if _plugins_loaded:
+            return
+        _plugins_loaded = True
+
+        for module_name in filter(None, (name.strip() for name in os.environ.get(HAZARD_RULES_ENV, "").split(","))):
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                warnings.warn(f"Could not load hazard rules from {module_name}: {e}")
+        for entry_point in entry_points(group=HAZARD_RULES_ENTRY_POINT_GROUP):
+            try:
+                loaded = entry_point.load()
+            except Exception as e:
+                warnings.warn(f"Could not load hazard rules from {entry_point.value}: {e}")
+                continue
+            if callable(loaded):
+                register_rule(loaded, types=getattr(loaded, "hazard_types", None))
+
+
+def _aggregation_fn(aggregation):
+    """Return the function name of a Combine aggregation, or None for custom ones."""
+    if isinstance(aggregation, str):
+        return aggregation
+    if isinstance(aggregation, dict):
+        fn = aggregation.get("fn")
+        if isinstance(fn, dict):
+            fn = fn.get("type")
+        if isinstance(fn, str):
+            return fn
+    return None
+
+
+def _group_by_fields(config):
+    group_by = config.get("group_by")
+    if group_by is None:
+        return []
+    return [group_by] if isinstance(group_by, str) else list(group_by)
+
+
+def _field_expression(G, node_id, field):
+    """Find the expression an upstream MapToFields assigns to a field, following single inputs."""
+    for _ in range(len(G)):
+        predecessors = list(G.predecessors(node_id))
+        if len(predecessors) != 1:
+            return None
+        node_id = predecessors[0]
+        node_data = G.nodes[node_id]
+        if node_data.get("type") == "MapToFields":
+            fields = (node_data.get("config") or {}).get("fields") or {}
+            if field in fields:
+                return fields[field], (node_data.get("config") or {}).get("language")
+        elif classify_transform(node_data.get("type", "Unknown"), node_data.get("config") or {}) == SHUFFLE:
+            return None
+    return None
+
+
+def _is_low_cardinality(expression, language):
+    """Whether an expression can only take a handful of values, e.g. a comparison or a constant."""
+    if isinstance(expression, (bool, int, float)):
+        return True
+    if not isinstance(expression, str) or language != "python":
+        return False
+    try:
+        tree = ast.parse(expression.strip(), mode="eval").body
+    except SyntaxError:
+        return False
+    if isinstance(tree, ast.IfExp):
+        return all(isinstance(branch, ast.Constant) for branch in (tree.body, tree.orelse))
+    return isinstance(tree, (ast.Compare, ast.BoolOp, ast.Constant)) or (
+        isinstance(tree, ast.UnaryOp) and isinstance(tree.op, ast.Not)
+    )
+
+
+@register_rule(types=["Combine"])
+def combine_without_combiner(G, node_id, node_data):
+    combine = (node_data.get("config") or {}).get("combine")
+    if not isinstance(combine, dict) or not combine:
+        return
+    fns = {name: _aggregation_fn(aggregation) for name, aggregation in combine.items()}
+    collecting = [name for name, fn in fns.items() if fn in COLLECTING_FNS]
+    if collecting:
+        yield WARNING, (
+            "Aggregations %s keep every value, so nothing is combined before the shuffle and large keys must fit "
+            "in memory" % ", ".join(collecting)
+        )
+    if not any(fn in COMBINER_FRIENDLY_FNS for fn in fns.values()) and not collecting:
+        yield INFO, (
+            "No built-in aggregation (%s); custom combine functions are only lifted before the shuffle if they "
+            "merge accumulators efficiently" % ", ".join(sorted(COMBINER_FRIENDLY_FNS))
+        )
+
+
+@register_rule(types=GROUPING_TYPES)
+def low_cardinality_key(G, node_id, node_data):
+    group_by = _group_by_fields(node_data.get("config") or {})
+    if not group_by:
+        if node_data.get("type") == "GroupBy":
+            yield WARNING, "Grouping without a key puts every element on a single worker"
+        return
+    low_cardinality = []
+    for field in group_by:
+        found = _field_expression(G, node_id, field)
+        if found is not None and _is_low_cardinality(*found):
+            low_cardinality.append(field)
+    if low_cardinality and len(low_cardinality) == len(group_by):
+        yield WARNING, (
+            "Key %s is computed as a condition or constant upstream, so only a few keys exist; the work cannot "
+            "spread over more workers than keys and each key becomes hot" % ", ".join(low_cardinality)
+        )
+
+
+@register_rule(types=["MapToFields", "Filter"])
+def python_udf_with_cheaper_language(G, node_id, node_data):
+    config = node_data.get("config") or {}
+    if config.get("language") != "python":
+        return
+    if node_data.get("type") == "MapToFields":
+        fields = config.get("fields")
+        if (
+            isinstance(fields, dict)
+            and fields
+            and all(isinstance(value, str) and value.isidentifier() for value in fields.values())
+        ):
+            yield WARNING, (
+                "Fields are only selected or renamed; without a language the projection runs without a Python worker"
+            )
+    else:
+        keep = config.get("keep")
+        if isinstance(keep, str) and python_predicate_to_sql(keep):
+            yield WARNING, (
+                "Predicate is a plain comparison; with language: sql it runs without a Python worker "
+                "(condition: %s)" % python_predicate_to_sql(keep)
+            )
+
+
+def _sets_windowing(node_data):
+    """Whether a transform windows its output, as WindowInto or through transform-level or config windowing."""
+    return (
+        node_data.get("type") == "WindowInto"
+        or bool(node_data.get("windowing"))
+        or bool((node_data.get("config") or {}).get("windowing"))
+    )
+
+
+def unwindowed_unbounded_sources(G):
+    """Map every node to the unbounded sources whose elements reach its output without being windowed.
+
+    Computed in one pass over the graph in topological order, once per graph.
+    Cyclic graphs map every node to no sources.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+
+    Returns:
+        dict: Node id to a frozenset of unbounded source ids.
+    """
+    # third party libraries
+    import networkx as nx
+
+    with _unwindowed_sources_lock:
+        if G in _unwindowed_sources_cache:
+            return _unwindowed_sources_cache[G]
+
+    reaching = {}
+    if nx.is_directed_acyclic_graph(G):
+        for node_id in nx.topological_sort(G):
+            node_data = G.nodes[node_id]
+            if _sets_windowing(node_data):
+                reaching[node_id] = frozenset()
+                continue
+            sources = {node_id} if node_data.get("type") in UNBOUNDED_SOURCES else set()
+            for upstream_id in G.predecessors(node_id):
+                sources |= reaching[upstream_id]
+            reaching[node_id] = frozenset(sources)
+
+    with _unwindowed_sources_lock:
+        _unwindowed_sources_cache[G] = reaching
+    return reaching
+
+
+@register_rule(types=WINDOWED_GROUPING_TYPES)
+def unwindowed_unbounded_grouping(G, node_id, node_data):
+    # Windowing on the grouping transform itself applies to its input
+    if _sets_windowing(node_data):
+        return
+    reaching = unwindowed_unbounded_sources(G)
+    sources = set()
+    for upstream_id in G.predecessors(node_id):
+        sources |= reaching.get(upstream_id, frozenset())
+    if sources:
+        yield ERROR, (
+            "Groups unbounded input from %s in the global window, so it never emits results; add a WindowInto "
+            "or windowing before it" % ", ".join(sorted(sources))
+        )
+
+
+def analyze_hazards(G):
+    """Run the registered hazard rules over a pipeline graph.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph, as returned by parse_beam_yaml.
+
+    Returns:
+        list: Hazards, most severe first, each a dict with node, rule,
+        severity and message. Rules that fail are reported as INFO hazards
+        of the node they failed on, rather than failing the analysis.
+    """
+    load_plugin_rules()
+    hazards = []
+    for node_id, node_data in G.nodes(data=True):
+        for rule in list(HAZARD_RULES):
+            types = getattr(rule, "hazard_types", None)
+            if types is not None and node_data.get("type") not in types:
+                continue
+            try:
+                found = list(rule(G, node_id, node_data) or [])
+            except Exception as e:
+                found = [(INFO, f"Rule failed: {e}")]
+            for severity, message in found:
+                hazards.append({"node": node_id, "rule": rule.__name__, "severity": severity, "message": message})
+    hazards.sort(key=lambda hazard: SEVERITY_ORDER.get(hazard["severity"], len(SEVERITY_ORDER)))
+    return hazards
@@ -0,0 +1,240 @@
+# standard libraries
+import csv
+import glob
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from beamforge.utils.cost_analyzer import SHUFFLE, classify_transform
+
+# Bytes read from the head of each sampled text file, rows read from each Parquet file
+PROFILE_SAMPLE_BYTES = 1024 * 1024
+PROFILE_SAMPLE_ROWS = 10000
+# Files sampled per source; the rows of the others are extrapolated from their size
+PROFILE_MAX_FILES = 64
+PROFILE_WORKERS = 8
+PROFILE_CACHE_SIZE = 1024
+
+# Local file sources that can be profiled, and the format of their files
+PROFILED_SOURCES = {
+    "ReadFromCsv": "csv",
+    "ReadFromJson": "json",
+    "ReadFromText": "text",
+    "ReadFromParquet": "parquet",
+}
+
+_profile_cache = OrderedDict()
+_profile_cache_lock = threading.Lock()
+
+
+def _sample_text_file(path, file_format, size):
+    with open(path, "rb") as f:
+        head = f.read(PROFILE_SAMPLE_BYTES)
+    complete = len(head) >= size
+    if not complete:
+        # Drop the last, possibly cut off, line
+        head = head[: head.rfind(b"\n") + 1]
+    text = head.decode("utf-8", errors="replace")
+
+    header_bytes = 0
+    if file_format == "csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+        header_bytes = head.find(b"\n") + 1
+    elif file_format == "json":
+        rows = []
+        for line in text.splitlines():
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                continue
+    else:
+        rows = [{"line": line} for line in text.splitlines()]
+
+    if complete or not rows:
+        return rows, len(rows), complete
+    return rows, round(len(rows) * (size - header_bytes) / max(len(head) - header_bytes, 1)), False
+
+
+def _sample_parquet_file(path):
+    # third party libraries
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    # The row count is in the footer, the sample is the first rows
+    batch = next(parquet_file.iter_batches(batch_size=PROFILE_SAMPLE_ROWS), None)
+    return batch.to_pylist() if batch is not None else [], parquet_file.metadata.num_rows, True
+
+
+def _distinct_values(rows):
+    values = {}
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        for field, value in row.items():
+            values.setdefault(field, set()).add(json.dumps(value, sort_keys=True, default=str))
+    return values
+
+
+def profile_file(path, file_format):
+    """Profile one input file from a sample of its head.
+
+    Results are cached by path, modification time and size.
+
+    Args:
+        path (str): Local file path.
+        file_format (str): One of the formats in PROFILED_SOURCES.
+
+    Returns:
+        dict: bytes, rows (the count, or an estimate from the sample), exact
+        (whether rows was counted), sampled_rows and values (field name to the
+        set of distinct values in the sample).
+    """
+    stat = os.stat(path)
+    cache_key = (path, stat.st_mtime_ns, stat.st_size, file_format)
+    with _profile_cache_lock:
+        if cache_key in _profile_cache:
+            _profile_cache.move_to_end(cache_key)
+            return _profile_cache[cache_key]
+
+    if file_format == "parquet":
+        rows, row_count, exact = _sample_parquet_file(path)
+    else:
+        rows, row_count, exact = _sample_text_file(path, file_format, stat.st_size)
+    profile = {
+        "bytes": stat.st_size,
+        "rows": row_count,
+        "exact": exact,
+        "sampled_rows": len(rows),
+        "values": _distinct_values(rows),
+    }
+
+    with _profile_cache_lock:
+        _profile_cache[cache_key] = profile
+        while len(_profile_cache) > PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile
+
+
+def _source_files(config):
+    path = config.get("path")
+    if not isinstance(path, str) or "://" in path:
+        return []
+    return sorted(file_path for file_path in glob.glob(path) if os.path.isfile(file_path))
+
+
+def profile_sources(G):
+    """Profile the local files read by the file sources of a pipeline graph.
+
+    Globs are expanded and up to PROFILE_MAX_FILES files per source, spread
+    over the matches, are sampled in a thread pool.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+
+    Returns:
+        dict: Source node id to its profile with files, bytes, rows, exact,
+        sampled_rows and fields (field name to its estimated number of distinct
+        values). Sources without local files are left out.
+    """
+    sources = {}
+    for node_id, node_data in G.nodes(data=True):
+        file_format = PROFILED_SOURCES.get(node_data.get("type"))
+        if file_format:
+            files = _source_files(node_data.get("config") or {})
+            if files:
+                step = max(len(files) / PROFILE_MAX_FILES, 1)
+                sampled = [files[int(index * step)] for index in range(min(len(files), PROFILE_MAX_FILES))]
+                sources[node_id] = (file_format, files, sampled)
+
+    tasks = {(path, file_format) for file_format, _, sampled in sources.values() for path in sampled}
+    with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as executor:
+        file_profiles = dict(zip(tasks, executor.map(lambda task: profile_file(*task), tasks)))
+
+    profiles = {}
+    for node_id, (file_format, files, sampled) in sources.items():
+        sampled_profiles = [file_profiles[(path, file_format)] for path in sampled]
+        total_bytes = sum(os.path.getsize(path) for path in files)
+        sampled_bytes = sum(profile["bytes"] for profile in sampled_profiles)
+        sampled_rows = sum(profile["rows"] for profile in sampled_profiles)
+        row_count = round(sampled_rows * total_bytes / sampled_bytes) if sampled_bytes else sampled_rows
+        rows_seen = sum(profile["sampled_rows"] for profile in sampled_profiles)
+        values = {}
+        for profile in sampled_profiles:
+            for field, field_values in profile["values"].items():
+                values.setdefault(field, set()).update(field_values)
+        profiles[node_id] = {
+            "files": len(files),
+            "bytes": total_bytes,
+            "rows": row_count,
+            "exact": len(sampled) == len(files) and all(profile["exact"] for profile in sampled_profiles),
+            "sampled_rows": rows_seen,
+            # A field that is unique in the sample is taken to be unique in every row
+            "fields": {
+                field: len(field_values) if len(field_values) < rows_seen else row_count
+                for field, field_values in values.items()
+            },
+        }
+    return profiles
+
+
+def _group_count(group_by, rows, upstream_fields):
+    if isinstance(group_by, str):
+        group_by = [group_by]
+    if not group_by or not all(isinstance(field, str) and field in upstream_fields for field in group_by):
+        return rows
+    groups = 1
+    for field in group_by:
+        groups *= upstream_fields[field]
+    return min(groups, rows)
+
+
+def estimate_volumes(G, profiles):
+    """Propagate the row counts of profiled sources through a pipeline graph.
+
+    Element-wise transforms are assumed to keep every row (an upper bound for
+    filters), Flatten adds its inputs up, and grouping transforms produce at
+    most one row per combination of distinct group_by values seen in the
+    sampled source rows.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+        profiles (dict): Source profiles, as returned by profile_sources.
+
+    Returns:
+        dict: Node id to its estimated output rows, for nodes whose inputs are
+        all known.
+    """
+    # third party libraries
+    import networkx as nx
+
+    rows = {}
+    fields = {}
+    for node_id in nx.topological_sort(G):
+        node_data = G.nodes[node_id]
+        config = node_data.get("config") or {}
+        transform_type = node_data.get("type", "Unknown")
+        predecessors = list(G.predecessors(node_id))
+        if node_id in profiles:
+            rows[node_id] = profiles[node_id]["rows"]
+            fields[node_id] = profiles[node_id]["fields"]
+            continue
+        if transform_type == "Create" and isinstance(config.get("elements"), list):
+            rows[node_id] = len(config["elements"])
+            fields[node_id] = {}
+            continue
+        if not predecessors or any(pred not in rows for pred in predecessors):
+            continue
+
+        input_rows = sum(rows[pred] for pred in predecessors)
+        upstream_fields = {}
+        for pred in predecessors:
+            upstream_fields.update(fields[pred])
+        if classify_transform(transform_type, config) == SHUFFLE and transform_type != "Flatten":
+            rows[node_id] = _group_count(config.get("group_by"), input_rows, upstream_fields)
+        else:
+            rows[node_id] = input_rows
+        fields[node_id] = upstream_fields
+    return rows
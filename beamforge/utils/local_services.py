@@ -0,0 +1,259 @@
+# standard libraries
+import contextlib
+import fcntl
+import json
+import os
+import signal
+import subprocess
+import threading
+import time
+
+from beamforge.utils.project_store import STORE_DIR
+
+# Local services (the Prism job server, expansion services) are shared by every
+# BeamForge process using the same store directory. The pid and endpoint of each
+# live in a state file, guarded by a file lock, so any worker can reuse a
+# service another worker started.
+PRISM_SERVICE_NAME = "prism"
+PRISM_IDLE_TIMEOUT = int(os.environ.get("BEAMFORGE_PRISM_IDLE_TIMEOUT", 600))
+SERVICE_STARTUP_TIMEOUT = 60
+SERVICE_HEALTH_TIMEOUT = 2
+SERVICE_REAPER_INTERVAL = 30
+
+TERMINAL_JOB_STATES = {"DONE", "FAILED", "CANCELLED", "DRAINED", "UPDATED"}
+
+# Services this process has used, with their idle timeout and busy check, for the reaper
+_idle_policies = {}
+_reaper_started = False
+_reaper_lock = threading.Lock()
+
+
+def _store_file(file_name, store_dir=None):
+    store_dir = store_dir or STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+    return os.path.join(store_dir, file_name)
+
+
+@contextlib.contextmanager
+def _service_lock(name, store_dir=None):
+    with open(_store_file(f"{name}.lock", store_dir), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_state(name, store_dir=None):
+    try:
+        with open(_store_file(f"{name}.json", store_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_state(name, state, store_dir=None):
+    path = _store_file(f"{name}.json", store_dir)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def _remove_state(name, store_dir=None):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(_store_file(f"{name}.json", store_dir))
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def check_service(endpoint, timeout=SERVICE_HEALTH_TIMEOUT):
+    """Check that a gRPC service answers on an endpoint.
+
+    Args:
+        endpoint (str): host:port of the service.
+        timeout (float): Seconds to wait for the gRPC channel to become ready.
+
+    Returns:
+        bool: Whether the service is up.
+    """
+    # third party libraries
+    import grpc
+
+    with grpc.insecure_channel(endpoint) as channel:
+        try:
+            grpc.channel_ready_future(channel).result(timeout=timeout)
+        except grpc.FutureTimeoutError:
+            return False
+    return True
+
+
+def _start_service(name, command, endpoint, store_dir=None):
+    log_path = _store_file(f"{name}.log", store_dir)
+    with open(log_path, "ab") as log_file:
+        # A new session keeps the service running when the worker that started it exits
+        process = subprocess.Popen(
+            [str(arg) for arg in command],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + SERVICE_STARTUP_TIMEOUT
+    while not check_service(endpoint):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError(f"Local service {name} did not start, see {log_path}")
+    now = time.time()
+    state = {"pid": process.pid, "endpoint": endpoint, "started_at": now, "last_used": now}
+    _write_state(name, state, store_dir)
+    return state
+
+
+def _stop_service(name, state, store_dir=None):
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(state["pid"], signal.SIGTERM)
+    _remove_state(name, store_dir)
+
+
+def ensure_local_service(name, command_and_endpoint, idle_timeout, is_busy=None, store_dir=None):
+    """Return the endpoint of a shared local service, starting it if it is not running.
+
+    Args:
+        name (str): Service name, which also names its state, lock and log files.
+        command_and_endpoint (callable): Returns the command that starts the
+            service and the endpoint it will serve on. Only called to start it.
+        idle_timeout (float): Seconds without use after which the service is stopped.
+        is_busy (callable): Called with the endpoint; if it returns True, the
+            service is still in use and is not stopped when idle.
+        store_dir (str): Directory holding the state, lock and log files.
+
+    Returns:
+        str: host:port of the service.
+
+    Raises:
+        RuntimeError: If the service does not come up.
+    """
+    with _service_lock(name, store_dir):
+        state = _read_state(name, store_dir)
+        if state and _process_alive(state["pid"]) and check_service(state["endpoint"]):
+            state["last_used"] = time.time()
+            _write_state(name, state, store_dir)
+        else:
+            if state:
+                _stop_service(name, state, store_dir)
+            command, endpoint = command_and_endpoint()
+            state = _start_service(name, command, endpoint, store_dir)
+    _idle_policies[(name, store_dir)] = (idle_timeout, is_busy)
+    _start_idle_reaper()
+    return state["endpoint"]
+
+
+def stop_local_service(name, store_dir=None):
+    """Stop a shared local service, if it is running."""
+    with _service_lock(name, store_dir):
+        state = _read_state(name, store_dir)
+        if state:
+            _stop_service(name, state, store_dir)
+
+
+def stop_idle_local_service(name, idle_timeout, is_busy=None, store_dir=None):
+    """Stop a shared local service if it was not used for idle_timeout seconds and is not busy.
+
+    Returns:
+        bool: Whether the service was stopped.
+    """
+    with _service_lock(name, store_dir):
+        state = _read_state(name, store_dir)
+        if not state:
+            return False
+        if not _process_alive(state["pid"]):
+            _remove_state(name, store_dir)
+            return False
+        if time.time() - state["last_used"] < idle_timeout:
+            return False
+        if is_busy is not None and is_busy(state["endpoint"]):
+            state["last_used"] = time.time()
+            _write_state(name, state, store_dir)
+            return False
+        _stop_service(name, state, store_dir)
+        return True
+
+
+def _start_idle_reaper():
+    global _reaper_started
+    with _reaper_lock:
+        if _reaper_started:
+            return
+        _reaper_started = True
+
+    def reap():
+        while True:
+            time.sleep(SERVICE_REAPER_INTERVAL)
+            for (name, store_dir), (idle_timeout, is_busy) in list(_idle_policies.items()):
+                with contextlib.suppress(Exception):
+                    stop_idle_local_service(name, idle_timeout, is_busy, store_dir)
+
+    threading.Thread(target=reap, name="beamforge-service-reaper", daemon=True).start()
+
+
+def _has_running_jobs(endpoint):
+    # third party libraries
+    import grpc
+    from apache_beam.portability.api import beam_job_api_pb2, beam_job_api_pb2_grpc
+
+    with grpc.insecure_channel(endpoint) as channel:
+        stub = beam_job_api_pb2_grpc.JobServiceStub(channel)
+        try:
+            jobs = stub.GetJobs(beam_job_api_pb2.GetJobsRequest(), timeout=SERVICE_HEALTH_TIMEOUT).job_info
+        except grpc.RpcError:
+            return False
+    return any(beam_job_api_pb2.JobState.Enum.Name(job.state) not in TERMINAL_JOB_STATES for job in jobs)
+
+
+def _prism_command_and_endpoint():
+    # third party libraries
+    from apache_beam.options.pipeline_options import PipelineOptions
+    from apache_beam.runners.portability.prism_runner import PrismJobServer
+
+    # Resolves (and on first use downloads) the Prism binary for the installed Beam version
+    return PrismJobServer(PipelineOptions([])).subprocess_cmd_and_endpoint()
+
+
+def ensure_prism_job_server(store_dir=None):
+    """Return the endpoint of the shared local Prism job server, starting it if it is not running.
+
+    The server is stopped after PRISM_IDLE_TIMEOUT seconds without submissions
+    or running jobs.
+
+    Returns:
+        str: host:port of the job service, for ``--job_endpoint``.
+    """
+    return ensure_local_service(
+        PRISM_SERVICE_NAME, _prism_command_and_endpoint, PRISM_IDLE_TIMEOUT, _has_running_jobs, store_dir
+    )
+
+
+def stop_prism_job_server(store_dir=None):
+    """Stop the shared local Prism job server, if it is running."""
+    stop_local_service(PRISM_SERVICE_NAME, store_dir)
+
+
+def prism_pipeline_args(store_dir=None):
+    """Pipeline options that submit a run to the shared local Prism job server.
+
+    The SDK harness runs in the submitting process (LOOPBACK), as with PrismRunner.
+
+    Returns:
+        list: Options replacing ``--runner=PrismRunner``.
+    """
+    endpoint = ensure_prism_job_server(store_dir)
+    return ["--runner=PortableRunner", f"--job_endpoint={endpoint}", "--environment_type=LOOPBACK"]
@@ -0,0 +1,304 @@
+# standard libraries
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from beamforge.utils.preview import SINK_PREFIXES, local_input_files, subgraph_hash, upstream_subgraph
+from beamforge.utils.project_store import STORE_DIR
+
+# Intermediate results of local runs, one directory of Parquet shards per
+# upstream subgraph content hash and input file stamps
+MATERIALIZE_DIR = os.environ.get("BEAMFORGE_MATERIALIZE_DIR", os.path.join(STORE_DIR, "materialized"))
+MATERIALIZE_CACHE_BYTES = int(os.environ.get("BEAMFORGE_MATERIALIZE_CACHE_BYTES", 2 * 1024**3))
+COMPLETE_MARKER = "_COMPLETE"
+FAILED_MARKER = "_FAILED"
+OUTPUT_PREFIX = "output"
+SHARD_ROWS = 100000
+# Staging directories of runs that never finished are removed after this many seconds
+STAGING_MAX_AGE = 24 * 3600
+
+# Transforms with several tagged outputs, whose main output cannot be written as one table
+MULTI_OUTPUT_TYPES = {"Partition"}
+# Transforms that set the windows or timestamps of their output, which Parquet does not keep
+WINDOWING_TYPES = {"WindowInto", "AssignTimestamps"}
+
+
+def materialization_key(G, node_id):
+    """Key the output of a node by its upstream subgraph and the files its sources read.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+        node_id (str): Node whose output is keyed.
+
+    Returns:
+        str: Hex digest, or None if an upstream source does not read local files
+        and so cannot be checked for changes.
+    """
+    upstream = upstream_subgraph(G, node_id)
+    stamps = []
+    for upstream_id, node_data in upstream.nodes(data=True):
+        if node_data.get("type", "").startswith("ReadFrom"):
+            files = local_input_files(node_data.get("config") or {})
+            if not files:
+                return None
+            stamps.append([upstream_id, files])
+    digest = hashlib.sha256(subgraph_hash(upstream).encode("utf-8"))
+    digest.update(json.dumps(stamps, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _materializable(node_data):
+    transform_type = node_data.get("type", "")
+    return (
+        not transform_type.startswith(SINK_PREFIXES)
+        and transform_type not in MULTI_OUTPUT_TYPES
+        and "error_handling" not in (node_data.get("config") or {})
+    )
+
+
+def windowed_nodes(G):
+    """Find the nodes whose output has windows or timestamps that reading it back from Parquet would lose.
+
+    Those are the nodes that assign windows or timestamps, through their type or
+    transform-level or config windowing, and everything downstream of them.
+    Results read back from the cache are all in the global window.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+
+    Returns:
+        set: Node ids.
+    """
+    pending = [
+        node_id
+        for node_id, node_data in G.nodes(data=True)
+        if node_data.get("type") in WINDOWING_TYPES
+        or node_data.get("windowing")
+        or (node_data.get("config") or {}).get("windowing")
+    ]
+    windowed = set(pending)
+    while pending:
+        for downstream_id in G.successors(pending.pop()):
+            if downstream_id not in windowed:
+                windowed.add(downstream_id)
+                pending.append(downstream_id)
+    return windowed
+
+
+def _plain(value):
+    if hasattr(value, "_asdict"):
+        return {name: _plain(field) for name, field in value._asdict().items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def write_materialized(path):
+    """Build a PTransform that writes rows to Parquet shards, inferring column types from the values.
+
+    Beam's WriteToParquet needs a schema without logical types, which fields
+    computed by Python expressions (typed Any) do not have. This is used in
+    pipelines through PyTransform. A shard that cannot be written leaves a
+    failure marker instead of failing the run.
+
+    Args:
+        path (str): Path prefix of the shards.
+
+    Returns:
+        beam.PTransform: The writing transform.
+    """
+    # third party libraries
+    import apache_beam as beam
+
+    class WriteShards(beam.DoFn):
+        def start_bundle(self):
+            self.rows = []
+
+        def process(self, row):
+            self.rows.append(_plain(row))
+            if len(self.rows) >= SHARD_ROWS:
+                self.flush()
+
+        def finish_bundle(self):
+            self.flush()
+
+        def flush(self):
+            # third party libraries
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if not self.rows:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                pq.write_table(pa.Table.from_pylist(self.rows), f"{path}-{uuid.uuid4().hex}.parquet")
+            except Exception as e:
+                with open(os.path.join(os.path.dirname(path), FAILED_MARKER), "a") as f:
+                    f.write(f"{e}\n")
+            self.rows = []
+
+    return beam.ParDo(WriteShards())
+
+
+def _unify_shards(directory):
+    """Cast the shards of a result to one schema, e.g. when a column was all null in some shards.
+
+    Returns:
+        bool: Whether the result has shards with a common schema.
+    """
+    # third party libraries
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    shards = sorted(glob.glob(os.path.join(directory, OUTPUT_PREFIX + "*")))
+    if not shards or os.path.exists(os.path.join(directory, FAILED_MARKER)):
+        return False
+    schemas = [pq.read_schema(shard) for shard in shards]
+    if all(schema.equals(schemas[0]) for schema in schemas):
+        return True
+    try:
+        unified = pa.unify_schemas(schemas, promote_options="permissive")
+        for shard, schema in zip(shards, schemas):
+            if not schema.equals(unified):
+                pq.write_table(pq.read_table(shard).cast(unified), shard)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return False
+    return True
+
+
+def is_materialized(key, cache_dir=None):
+    return os.path.exists(os.path.join(cache_dir or MATERIALIZE_DIR, key, COMPLETE_MARKER))
+
+
+def plan_incremental_run(G, cache_dir=None):
+    """Rewrite a pipeline to read unchanged intermediate results and materialize the others.
+
+    Every node with a cached result becomes a ReadFromParquet of it, and what
+    is only upstream of cached nodes is pruned. Every other node that can be
+    materialized gets a sink writing Parquet shards to a staging directory,
+    which commit_materialized moves into the cache once the run succeeded.
+    Windowed or timestamped results are never materialized.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+        cache_dir (str): Materialization cache directory.
+
+    Returns:
+        dict: graph (the rewritten pipeline, empty if nothing needs to run),
+        reused and pending (node id to key of the results read and written)
+        and staging (the staging directory).
+    """
+    # third party libraries
+    import networkx as nx
+
+    cache_dir = cache_dir or MATERIALIZE_DIR
+    windowed = windowed_nodes(G)
+    keys = {
+        node_id: materialization_key(G, node_id)
+        for node_id, node_data in G.nodes(data=True)
+        if _materializable(node_data) and node_id not in windowed
+    }
+    reused = {node_id: key for node_id, key in keys.items() if key and is_materialized(key, cache_dir)}
+
+    rewritten = G.copy()
+    for node_id, key in reused.items():
+        rewritten.remove_edges_from(list(rewritten.in_edges(node_id)))
+        rewritten.nodes[node_id]["type"] = "ReadFromParquet"
+        rewritten.nodes[node_id]["config"] = {"path": os.path.join(cache_dir, key, OUTPUT_PREFIX + "*")}
+
+    # Only what still feeds an output that is not cached has to run
+    roots = [node_id for node_id in G.nodes if G.out_degree(node_id) == 0 and node_id not in reused]
+    needed = set(roots)
+    for node_id in roots:
+        needed |= nx.ancestors(rewritten, node_id)
+    rewritten = rewritten.subgraph(needed).copy()
+    reused = {node_id: key for node_id, key in reused.items() if node_id in needed}
+
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=cache_dir)
+    pending = {}
+    for node_id in sorted(needed):
+        key = keys.get(node_id)
+        if key and node_id not in reused:
+            sink_id = "%s__materialize" % node_id
+            rewritten.add_node(
+                sink_id,
+                type="PyTransform",
+                config={
+                    "constructor": "beamforge.utils.materialize.write_materialized",
+                    "kwargs": {"path": os.path.join(staging, key, OUTPUT_PREFIX)},
+                },
+            )
+            rewritten.add_edge(node_id, sink_id)
+            pending[node_id] = key
+
+    # Reading a result counts as a use for eviction
+    for key in reused.values():
+        os.utime(os.path.join(cache_dir, key, COMPLETE_MARKER))
+    return {"graph": rewritten, "reused": reused, "pending": pending, "staging": staging}
+
+
+def commit_materialized(plan, cache_dir=None, max_bytes=MATERIALIZE_CACHE_BYTES):
+    """Move the results a successful run wrote into the cache, then evict down to max_bytes.
+
+    Results that are empty or could not be written are not cached.
+
+    Returns:
+        list: Node ids whose results were cached.
+    """
+    cache_dir = cache_dir or MATERIALIZE_DIR
+    committed = []
+    for node_id, key in sorted(plan["pending"].items()):
+        staged = os.path.join(plan["staging"], key)
+        if not _unify_shards(staged):
+            continue
+        open(os.path.join(staged, COMPLETE_MARKER), "w").close()
+        try:
+            os.rename(staged, os.path.join(cache_dir, key))
+        except OSError:
+            # Another run already materialized the same result
+            pass
+        committed.append(node_id)
+    discard_materialized(plan)
+    evict_materialized(cache_dir, max_bytes)
+    return committed
+
+
+def discard_materialized(plan):
+    """Remove the staging directory of a run, e.g. after it failed."""
+    shutil.rmtree(plan["staging"], ignore_errors=True)
+
+
+def evict_materialized(cache_dir=None, max_bytes=MATERIALIZE_CACHE_BYTES):
+    """Remove the least recently used results until the cache fits in max_bytes.
+
+    Returns:
+        list: Keys of the removed results.
+    """
+    cache_dir = cache_dir or MATERIALIZE_DIR
+    entries = []
+    for key in os.listdir(cache_dir) if os.path.isdir(cache_dir) else []:
+        if key.startswith(".staging-"):
+            if time.time() - os.path.getmtime(os.path.join(cache_dir, key)) > STAGING_MAX_AGE:
+                shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+            continue
+        marker = os.path.join(cache_dir, key, COMPLETE_MARKER)
+        if not os.path.exists(marker):
+            continue
+        size = sum(os.path.getsize(path) for path in glob.glob(os.path.join(cache_dir, key, "*")))
+        entries.append((os.path.getmtime(marker), key, size))
+
+    total = sum(size for _, _, size in entries)
+    evicted = []
+    for _, key, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+        total -= size
+        evicted.append(key)
+    return evicted
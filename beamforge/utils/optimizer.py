@@ -0,0 +1,378 @@
+# standard libraries
+import ast
+import difflib
+import json
+
+from beamforge.utils.graph_utils import (
+    custom_yaml_dump,
+    elements_to_graph,
+    generate_yaml_content,
+    graph_to_elements,
+    pipeline_transforms,
+)
+
+# Transforms without side effects. A node is only ever removed as a dead branch
+# if it and everything downstream of it is one of these.
+PURE_TYPES = {
+    "Create",
+    "MapToFields",
+    "Filter",
+    "Sql",
+    "Explode",
+    "Flatten",
+    "Combine",
+    "GroupBy",
+    "Join",
+    "AssignTimestamps",
+    "WindowInto",
+    "Partition",
+}
+PURE_PREFIXES = ("ReadFrom",)
+
+# Expression languages whose predicates can be combined, and how
+FILTER_CONJUNCTIONS = {"python": "and", "sql": "AND", "javascript": "&&"}
+# Comparisons whose Python and SQL results agree when the field is null: == is False, != is True. Ordered
+# comparisons raise on None in Python but are NULL in SQL, so they are not translated.
+SQL_OPERATORS = {ast.Eq: "=", ast.NotEq: "<>"}
+
+MAX_OPTIMIZER_PASSES = 20
+
+
+def _is_pure(transform_type):
+    return transform_type in PURE_TYPES or transform_type.startswith(PURE_PREFIXES)
+
+
+def _keep_expression(config):
+    """Return the keep expression of a Filter, or None if it is a callable or missing."""
+    keep = config.get("keep")
+    if isinstance(keep, dict) and set(keep) == {"expression"}:
+        keep = keep["expression"]
+    return keep if isinstance(keep, str) else None
+
+
+def _predicate_names(expression):
+    """Return the field names a Python predicate reads, or None if it does not parse."""
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError:
+        return None
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+
+
+def _sql_literal(node):
+    if isinstance(node, ast.Constant) and not isinstance(node.value, bool):
+        if isinstance(node.value, str):
+            return "'%s'" % node.value.replace("'", "''")
+        if isinstance(node.value, (int, float)):
+            return repr(node.value)
+    return None
+
+
+def python_predicate_to_sql(expression):
+    """Translate a simple Python predicate into a SQL condition.
+
+    Only equality and inequality comparisons of a field with a literal,
+    combined with ``and``, ``or`` and ``not``, are translated. Each comparison
+    is true or false when the field is null, as in Python, rather than NULL.
+
+    Args:
+        expression (str): Python predicate, e.g. ``kind == 'a' and name != 'x'``.
+
+    Returns:
+        str: Equivalent SQL condition, or None if the predicate is not simple enough.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval").body
+    except SyntaxError:
+        return None
+
+    def translate(node):
+        if isinstance(node, ast.BoolOp):
+            parts = [translate(value) for value in node.values]
+            if None in parts:
+                return None
+            joiner = " AND " if isinstance(node.op, ast.And) else " OR "
+            return "(%s)" % joiner.join(parts)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = translate(node.operand)
+            return None if operand is None else f"(NOT {operand})"
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and type(node.ops[0]) in SQL_OPERATORS:
+            left, right = node.left, node.comparators[0]
+            if isinstance(right, ast.Name):
+                left, right = right, left
+            if isinstance(left, ast.Name) and _sql_literal(right) is not None:
+                operator = SQL_OPERATORS[type(node.ops[0])]
+                if operator == "=":
+                    return f"(`{left.id}` IS NOT NULL AND `{left.id}` = {_sql_literal(right)})"
+                return f"(`{left.id}` IS NULL OR `{left.id}` {operator} {_sql_literal(right)})"
+        return None
+
+    return translate(tree)
+
+
+def _only_consumer(G, producer, consumer):
+    return list(G.successors(producer)) == [consumer] and list(G.predecessors(consumer)) == [producer]
+
+
+def _contract(G, upstream, downstream, config):
+    """Fold upstream into downstream, which takes over its inputs and gets the merged config."""
+    for predecessor in list(G.predecessors(upstream)):
+        G.add_edge(predecessor, downstream)
+    G.remove_node(upstream)
+    G.nodes[downstream]["config"] = config
+
+
+def merge_filters(G):
+    """Merge a Filter into the Filter that consumes it, by combining their predicates."""
+    for upstream, downstream in list(G.edges()):
+        first, second = G.nodes[upstream], G.nodes[downstream]
+        if first.get("type") != "Filter" or second.get("type") != "Filter":
+            continue
+        if not _only_consumer(G, upstream, downstream):
+            continue
+        first_config, second_config = first.get("config") or {}, second.get("config") or {}
+        language = first_config.get("language")
+        if language != second_config.get("language") or language not in FILTER_CONJUNCTIONS:
+            continue
+        if set(first_config) - {"language", "keep"} or set(second_config) - {"language", "keep"}:
+            continue
+        first_keep, second_keep = _keep_expression(first_config), _keep_expression(second_config)
+        if first_keep is None or second_keep is None:
+            continue
+
+        rewritten = G.copy()
+        config = dict(second_config)
+        config["keep"] = f"({first_keep.strip()}) {FILTER_CONJUNCTIONS[language]} ({second_keep.strip()})"
+        _contract(rewritten, upstream, downstream, config)
+        yield f"Merge Filter '{upstream}' into Filter '{downstream}'", [upstream, downstream], rewritten
+
+
+def merge_projections(G):
+    """Merge a MapToFields into the MapToFields that consumes it, when the second one only selects or renames."""
+    for upstream, downstream in list(G.edges()):
+        first, second = G.nodes[upstream], G.nodes[downstream]
+        if first.get("type") != "MapToFields" or second.get("type") != "MapToFields":
+            continue
+        if not _only_consumer(G, upstream, downstream):
+            continue
+        first_config, second_config = first.get("config") or {}, second.get("config") or {}
+        if set(first_config) - {"language", "fields"} or set(second_config) - {"language", "fields"}:
+            continue
+        first_fields, second_fields = first_config.get("fields"), second_config.get("fields")
+        if not isinstance(first_fields, dict) or not isinstance(second_fields, dict):
+            continue
+        if first_config.get("language") != second_config.get("language"):
+            continue
+        if not all(isinstance(value, str) and value in first_fields for value in second_fields.values()):
+            continue
+
+        rewritten = G.copy()
+        config = dict(second_config)
+        config["fields"] = {name: first_fields[source] for name, source in second_fields.items()}
+        _contract(rewritten, upstream, downstream, config)
+        yield f"Merge MapToFields '{upstream}' into MapToFields '{downstream}'", [upstream, downstream], rewritten
+
+
+def filter_before_projection(G):
+    """Move a Python Filter ahead of the MapToFields it consumes when it only reads fields passed through unchanged.
+
+    Filtering first maps fewer elements, and puts the MapToFields next to any
+    MapToFields that follows the Filter, so that merge_projections applies.
+    """
+    for upstream, downstream in list(G.edges()):
+        projection, predicate = G.nodes[upstream], G.nodes[downstream]
+        if projection.get("type") != "MapToFields" or predicate.get("type") != "Filter":
+            continue
+        if not _only_consumer(G, upstream, downstream) or G.in_degree(upstream) == 0:
+            continue
+        projection_config, filter_config = projection.get("config") or {}, predicate.get("config") or {}
+        if set(projection_config) - {"language", "fields", "append"} or filter_config.get("language") != "python":
+            continue
+        fields = projection_config.get("fields")
+        keep = _keep_expression(filter_config)
+        names = _predicate_names(keep) if keep else None
+        if not isinstance(fields, dict) or not names:
+            continue
+        appended = projection_config.get("append") is True
+        if not all(fields.get(name) == name or (appended and name not in fields) for name in names):
+            continue
+
+        rewritten = G.copy()
+        for predecessor in list(rewritten.predecessors(upstream)):
+            rewritten.remove_edge(predecessor, upstream)
+            rewritten.add_edge(predecessor, downstream)
+        for successor in list(rewritten.successors(downstream)):
+            rewritten.remove_edge(downstream, successor)
+            rewritten.add_edge(upstream, successor)
+        rewritten.remove_edge(upstream, downstream)
+        rewritten.add_edge(downstream, upstream)
+        yield f"Filter '{downstream}' before MapToFields '{upstream}'", [upstream, downstream], rewritten
+
+
+def push_filter_into_sql(G):
+    """Fold a Filter into the Sql query it consumes, as a WHERE clause over the original query."""
+    for upstream, downstream in list(G.edges()):
+        query_node, predicate = G.nodes[upstream], G.nodes[downstream]
+        if query_node.get("type") != "Sql" or predicate.get("type") != "Filter":
+            continue
+        # The other consumers of the query still need the unfiltered rows
+        if not _only_consumer(G, upstream, downstream):
+            continue
+        sql_config, filter_config = query_node.get("config") or {}, predicate.get("config") or {}
+        query = sql_config.get("query")
+        keep = _keep_expression(filter_config)
+        if not isinstance(query, str) or keep is None or set(filter_config) - {"language", "keep"}:
+            continue
+        if filter_config.get("language") == "sql":
+            condition = keep.strip()
+        elif filter_config.get("language") == "python":
+            condition = python_predicate_to_sql(keep)
+        else:
+            condition = None
+        if not condition:
+            continue
+
+        rewritten = G.copy()
+        config = dict(sql_config)
+        config["query"] = f"SELECT * FROM ({query.strip().rstrip(';')}) AS filtered WHERE {condition}"
+        rewritten.nodes[upstream]["config"] = config
+        for successor in list(rewritten.successors(downstream)):
+            rewritten.add_edge(upstream, successor)
+        rewritten.remove_node(downstream)
+        yield f"Push Filter '{downstream}' into Sql '{upstream}'", [upstream, downstream], rewritten
+
+
+def remove_dead_branches(G):
+    """Remove transforms whose output never reaches a sink or another transform with side effects."""
+    live = set()
+    for node_id in reversed(list(_topological_order(G))):
+        if not _is_pure(G.nodes[node_id].get("type") or "Unknown") or any(
+            successor in live for successor in G.successors(node_id)
+        ):
+            live.add(node_id)
+    # Without any sink the pipeline is still being built, so nothing is dead yet
+    dead = [node_id for node_id in G.nodes if node_id not in live]
+    if not live or not dead:
+        return
+
+    rewritten = G.copy()
+    rewritten.remove_nodes_from(dead)
+    yield "Remove dead branch: %s" % ", ".join(dead), dead, rewritten
+
+
+def _topological_order(G):
+    # third party libraries
+    import networkx as nx
+
+    try:
+        return list(nx.topological_sort(G))
+    except nx.NetworkXUnfeasible:
+        # Cycles are reported elsewhere; treat every node in one as live
+        return list(G.nodes)
+
+
+REWRITE_RULES = [
+    merge_filters,
+    merge_projections,
+    filter_before_projection,
+    push_filter_into_sql,
+    remove_dead_branches,
+]
+
+
+def yaml_diff(before, after):
+    return "".join(
+        difflib.unified_diff(
+            before.splitlines(keepends=True), after.splitlines(keepends=True), "before.yaml", "after.yaml"
+        )
+    )
+
+
+def _pipeline_yaml(elements, dumped):
+    """Write the YAML of generate_yaml_content, dumping only the transforms not already in dumped."""
+    transforms = pipeline_transforms(elements)
+    if not transforms:
+        return generate_yaml_content(elements)
+    lines = ["pipeline:\n", "  transforms:\n"]
+    for transform in transforms:
+        key = json.dumps(transform, default=str)
+        if key not in dumped:
+            # Dumped at its place in the document, so that it is indented and wrapped the same way
+            dumped[key] = custom_yaml_dump({"pipeline": {"transforms": [transform]}}).split("\n", 2)[2]
+        lines.append(dumped[key])
+    return "".join(lines)
+
+
+def propose_rewrites(elements):
+    """Find the semantics-preserving rewrites that apply to a pipeline.
+
+    Every proposal is computed against the given elements, independently of
+    the others. Proposals do not hold the rewritten pipeline, which
+    apply_rewrite rebuilds from the rule and nodes.
+
+    Args:
+        elements (list): Cytoscape elements of the pipeline.
+
+    Returns:
+        list: Proposals, each a dict with the rule name, a description, the
+        nodes involved and a unified diff of the YAML, as generated by
+        generate_yaml_content, before and after the rewrite.
+    """
+    G = elements_to_graph(elements)
+    # A rewrite only changes a few transforms, so the others are dumped once for all proposals
+    dumped = {}
+    before = _pipeline_yaml(elements, dumped)
+    proposals = []
+    for rule in REWRITE_RULES:
+        for description, nodes, rewritten in rule(G):
+            after = _pipeline_yaml(graph_to_elements(rewritten), dumped)
+            proposals.append(
+                {"rule": rule.__name__, "description": description, "nodes": nodes, "diff": yaml_diff(before, after)}
+            )
+    return proposals
+
+
+def apply_rewrite(elements, rule_name, nodes):
+    """Apply one proposed rewrite to a pipeline.
+
+    Args:
+        elements (list): Cytoscape elements of the pipeline.
+        rule_name (str): rule of the proposal, see propose_rewrites.
+        nodes (list): nodes of the proposal.
+
+    Returns:
+        tuple: (rewritten elements, description), or None if the rewrite does
+        not apply to the pipeline anymore.
+    """
+    rule = next((rule for rule in REWRITE_RULES if rule.__name__ == rule_name), None)
+    if rule is None:
+        return None
+    for description, rewrite_nodes, rewritten in rule(elements_to_graph(elements)):
+        if list(rewrite_nodes) == list(nodes):
+            return graph_to_elements(rewritten), description
+    return None
+
+
+def optimize_pipeline(elements, max_passes=MAX_OPTIMIZER_PASSES):
+    """Apply rewrites until none applies anymore.
+
+    One rewrite often enables another, e.g. moving a Filter ahead of a
+    MapToFields lets that MapToFields merge with the one after the Filter.
+
+    Args:
+        elements (list): Cytoscape elements of the pipeline.
+        max_passes (int): Maximum number of rewrites to apply.
+
+    Returns:
+        tuple: (rewritten elements, descriptions of the applied rewrites).
+    """
+    applied = []
+    for _ in range(max_passes):
+        G = elements_to_graph(elements)
+        rewrite = next((rewrite for rule in REWRITE_RULES for rewrite in rule(G)), None)
+        if rewrite is None:
+            break
+        description, _, rewritten = rewrite
+        elements = graph_to_elements(rewritten)
+        applied.append(description)
+    return elements, applied
@@ -0,0 +1,163 @@
+# standard libraries
+import contextlib
+import csv
+import glob
+import json
+import mmap
+import os
+
+OUTPUT_PAGE_SIZE = 50
+# Outputs up to this size are counted exactly, larger ones are estimated from samples
+EXACT_COUNT_LIMIT = 8 * 1024 * 1024
+SAMPLE_COUNT = 16
+SAMPLE_SIZE = 64 * 1024
+
+# Local file sinks whose shards hold one record per line
+SINK_FORMATS = {"WriteToJson": "json", "WriteToCsv": "csv", "WriteToText": "text"}
+
+
+def find_sink_shards(path):
+    """Find the shard files a file sink wrote for its configured path.
+
+    Beam file sinks add a shard suffix to the path, e.g. ``big.csv-00000-of-00004``.
+
+    Args:
+        path (str): The path in the sink config.
+
+    Returns:
+        list: Paths of the non-empty shard files, in shard order.
+    """
+    if not path:
+        return []
+    shards = glob.glob(glob.escape(path)) + glob.glob(glob.escape(path) + "-*")
+    return sorted(shard for shard in set(shards) if os.path.isfile(shard) and os.path.getsize(shard) > 0)
+
+
+@contextlib.contextmanager
+def _mapped(shard):
+    with open(shard, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+def _line_end(mapped, start):
+    end = mapped.find(b"\n", start)
+    return len(mapped) if end == -1 else end
+
+
+def _decode_record(line, sink_format, header):
+    text = line.decode("utf-8", errors="replace").rstrip("\r")
+    if sink_format == "json":
+        return json.loads(text)
+    if sink_format == "csv":
+        return dict(zip(header, next(csv.reader([text]))))
+    return {"line": text}
+
+
+def _csv_header(mapped):
+    return next(csv.reader([mapped[: _line_end(mapped, 0)].decode("utf-8", errors="replace").rstrip("\r")]))
+
+
+def encode_cursor(shard_index, offset):
+    return f"{shard_index}:{offset}"
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return 0, None
+    shard_index, offset = cursor.split(":")
+    return int(shard_index), int(offset)
+
+
+def read_page(sink_type, shards, cursor=None, page_size=OUTPUT_PAGE_SIZE):
+    """Read one page of records from memory-mapped sink shards.
+
+    Only the bytes of the records on the page are read, wherever the page
+    starts in the output.
+
+    Args:
+        sink_type (str): Sink transform type, one of SINK_FORMATS.
+        shards (list): Shard files, as returned by find_sink_shards.
+        cursor (str): Position of the first record of the page, from a previous
+            page's next cursor. None starts at the first record.
+        page_size (int): Maximum number of records on the page.
+
+    Returns:
+        tuple: (records, next cursor, or None after the last record).
+    """
+    sink_format = SINK_FORMATS[sink_type]
+    shard_index, offset = decode_cursor(cursor)
+    records = []
+    while shard_index < len(shards):
+        with _mapped(shards[shard_index]) as mapped:
+            header = _csv_header(mapped) if sink_format == "csv" else None
+            if offset is None:
+                # CSV shards each start with their own header line
+                offset = _line_end(mapped, 0) + 1 if sink_format == "csv" else 0
+            while offset < len(mapped):
+                if len(records) >= page_size:
+                    return records, encode_cursor(shard_index, offset)
+                end = _line_end(mapped, offset)
+                line = mapped[offset:end]
+                offset = end + 1
+                if line.strip():
+                    records.append(_decode_record(line, sink_format, header))
+        shard_index, offset = shard_index + 1, None
+    return records, None
+
+
+def estimate_row_count(sink_type, shards):
+    """Count the records in sink shards, estimating from evenly spread samples for large outputs.
+
+    Args:
+        sink_type (str): Sink transform type, one of SINK_FORMATS.
+        shards (list): Shard files, as returned by find_sink_shards.
+
+    Returns:
+        dict: rows (the count or estimate), exact (whether it was counted),
+        bytes (total size of the shards) and shards (number of shards).
+    """
+    sizes = [os.path.getsize(shard) for shard in shards]
+    total_bytes = sum(sizes)
+    header_lines = len(shards) if SINK_FORMATS[sink_type] == "csv" else 0
+    result = {"bytes": total_bytes, "shards": len(shards)}
+
+    if total_bytes <= EXACT_COUNT_LIMIT:
+        lines = 0
+        for shard in shards:
+            with _mapped(shard) as mapped:
+                lines += mapped[:].count(b"\n") + (0 if mapped[-1:] == b"\n" else 1)
+        return dict(result, rows=lines - header_lines, exact=True)
+
+    # Sample windows at evenly spaced positions across all shards and count their line breaks
+    sampled_bytes = 0
+    sampled_lines = 0
+    step = total_bytes / SAMPLE_COUNT
+    shard_starts = [sum(sizes[:index]) for index in range(len(sizes))]
+    for sample in range(SAMPLE_COUNT):
+        position = int(sample * step)
+        shard_index = max(index for index, start in enumerate(shard_starts) if start <= position)
+        with _mapped(shards[shard_index]) as mapped:
+            start = position - shard_starts[shard_index]
+            window = mapped[start : start + SAMPLE_SIZE]
+        sampled_bytes += len(window)
+        sampled_lines += window.count(b"\n")
+    if not sampled_lines:
+        return dict(result, rows=len(shards), exact=False)
+    return dict(result, rows=max(round(total_bytes * sampled_lines / sampled_bytes) - header_lines, 0), exact=False)
+
+
+def local_sinks(G):
+    """Return the file sinks of a pipeline graph with a configured path.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+
+    Returns:
+        dict: Node id to (sink type, configured path).
+    """
+    sinks = {}
+    for node_id, node_data in G.nodes(data=True):
+        config = node_data.get("config") or {}
+        if node_data.get("type") in SINK_FORMATS and isinstance(config.get("path"), str):
+            sinks[node_id] = (node_data["type"], config["path"])
+    return sinks
@@ -0,0 +1,358 @@
+# standard libraries
+import copy
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# third party libraries
+import yaml
+
+from beamforge.utils.graph_utils import graph_to_elements
+
+# Top-level key listing the files a pipeline file pulls in, as paths or globs relative to that file
+INCLUDE_KEY = "include"
+FRAGMENT_CACHE_SIZE = 1024
+# Directory pipeline files are loaded from. Paths come from the browser, so loading is disabled unless it is set
+PIPELINE_FILES_ROOT = os.environ.get("BEAMFORGE_PIPELINE_FILES_ROOT")
+
+_fragment_cache = OrderedDict()
+_fragment_cache_lock = threading.Lock()
+
+
+def _cached_fragment(content_hash):
+    with _fragment_cache_lock:
+        if content_hash in _fragment_cache:
+            _fragment_cache.move_to_end(content_hash)
+            return copy.deepcopy(_fragment_cache[content_hash])
+    return None
+
+
+def _input_names(inputs):
+    if isinstance(inputs, dict):
+        return list(inputs.values())
+    if isinstance(inputs, str):
+        return [inputs]
+    return list(inputs or [])
+
+
+def parse_fragment(content, content_hash=None):
+    """Parse one file of a multi-file pipeline, leaving the inputs of its transforms unresolved.
+
+    A file is either a Beam YAML document with a pipeline section or a fragment
+    with transforms at the top level. Both may list other files under include.
+    Results are cached by content hash.
+
+    Args:
+        content (str): File content.
+        content_hash (str): sha256 of content, if already known.
+
+    Returns:
+        dict: transforms (each with name, type, config and the names of its
+        inputs), chain (whether the file declares a chain pipeline) and includes.
+
+    Raises:
+        ValueError: If the file has no transforms or includes, has providers, or
+            its transforms or includes are not lists of mappings and file paths.
+    """
+    content_hash = content_hash or hashlib.sha256(content.encode("utf-8")).hexdigest()
+    fragment = _cached_fragment(content_hash)
+    if fragment is not None:
+        return fragment
+
+    data = yaml.safe_load(content) or {}
+    if not isinstance(data, dict):
+        raise ValueError("Expected a mapping with a pipeline section or transforms")
+    pipeline = data.get("pipeline", data)
+    if not isinstance(pipeline, dict) or not any(key in data for key in ("pipeline", "transforms", INCLUDE_KEY)):
+        raise ValueError("No pipeline section, transforms or includes found in YAML")
+    # The editor's pipelines have no providers section, so they would be dropped from the generated YAML
+    if data.get("providers") or pipeline.get("providers"):
+        raise ValueError("Providers are not supported in pipeline files")
+
+    raw_transforms = pipeline.get("transforms") or []
+    if not isinstance(raw_transforms, list) or not all(isinstance(transform, dict) for transform in raw_transforms):
+        raise ValueError("transforms must be a list of mappings")
+    includes = data.get(INCLUDE_KEY) or []
+    includes = [includes] if isinstance(includes, str) else includes
+    if not isinstance(includes, list) or not all(isinstance(include, str) for include in includes):
+        raise ValueError(f"{INCLUDE_KEY} must be a file path or a list of file paths")
+
+    transforms = []
+    for transform in raw_transforms:
+        transform_type = transform.get("type", "Unknown")
+        transforms.append(
+            {
+                "name": transform.get("name", transform_type),
+                "type": transform_type,
+                "config": transform.get("config", {}),
+                "inputs": _input_names(transform.get("input")),
+                "has_input": "input" in transform,
+            }
+        )
+        if "windowing" in transform:
+            transforms[-1]["windowing"] = transform["windowing"]
+    fragment = {
+        "transforms": transforms,
+        "chain": pipeline.get("type") == "chain",
+        "typed": "type" in pipeline,
+        "includes": includes,
+    }
+
+    with _fragment_cache_lock:
+        _fragment_cache[content_hash] = copy.deepcopy(fragment)
+        while len(_fragment_cache) > FRAGMENT_CACHE_SIZE:
+            _fragment_cache.popitem(last=False)
+    return fragment
+
+
+def _read_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    return content, hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _confined_path(path, root_dir):
+    real_path = os.path.realpath(path)
+    if os.path.commonpath([root_dir, real_path]) != root_dir:
+        return None
+    return real_path
+
+
+def load_pipeline_files(root_path, known_files=None, root_dir=PIPELINE_FILES_ROOT):
+    """Load a root pipeline file and every file it includes, directly or through other includes.
+
+    Files whose modification time and size match known_files are not read
+    again, and only files whose content hash changed are parsed again. Every
+    file, after resolving symbolic links, must be inside root_dir.
+
+    Args:
+        root_path (str): Root pipeline file, relative to root_dir or absolute.
+        known_files (dict): files of a previous load of the same root.
+        root_dir (str): Directory the files are confined to.
+
+    Returns:
+        dict: root, files (path relative to the root's directory to its
+        mtime_ns, size and sha256, in load order), fragments (path to parsed
+        fragment), changed (files that are new or whose content changed) and
+        removed (files no longer included).
+
+    Raises:
+        OSError: If a file cannot be read.
+        ValueError: If a file is outside root_dir or is not a pipeline file,
+            with its path in the message but not its content.
+    """
+    if not root_dir:
+        raise ValueError("Loading pipeline files is disabled, set BEAMFORGE_PIPELINE_FILES_ROOT to enable it")
+    root_dir = os.path.realpath(root_dir)
+    root_file = _confined_path(os.path.join(root_dir, root_path), root_dir)
+    if root_file is None:
+        raise ValueError(f"{root_path} is outside the pipeline files root")
+
+    known_files = known_files or {}
+    base_dir = os.path.dirname(root_file)
+    files = {}
+    fragments = {}
+    changed = []
+    pending = [root_file]
+    while pending:
+        path = pending.pop(0)
+        relative_path = os.path.relpath(path, base_dir)
+        if relative_path in files:
+            continue
+
+        stat = os.stat(path)
+        known = known_files.get(relative_path)
+        fragment = None
+        if known and [known["mtime_ns"], known["size"]] == [stat.st_mtime_ns, stat.st_size]:
+            content_hash = known["sha256"]
+            fragment = _cached_fragment(content_hash)
+        if fragment is None:
+            try:
+                content, content_hash = _read_file(path)
+                fragment = parse_fragment(content, content_hash)
+            except UnicodeDecodeError as e:
+                raise ValueError(f"{relative_path}: not a UTF-8 text file") from e
+            except yaml.YAMLError as e:
+                # The parser's message quotes the file, which is only shown by position
+                mark = getattr(e, "problem_mark", None)
+                position = f" at line {mark.line + 1}, column {mark.column + 1}" if mark else ""
+                raise ValueError(f"{relative_path}: invalid YAML{position}") from e
+            except ValueError as e:
+                raise ValueError(f"{relative_path}: {e}") from e
+        if not known or known["sha256"] != content_hash:
+            changed.append(relative_path)
+
+        files[relative_path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": content_hash}
+        fragments[relative_path] = fragment
+        for include in fragment["includes"]:
+            pattern = os.path.join(os.path.dirname(path), include)
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(include) else [pattern]
+            for match in matches:
+                confined = _confined_path(match, root_dir)
+                if confined is None:
+                    raise ValueError(f"{relative_path}: include {include} is outside the pipeline files root")
+                pending.append(confined)
+
+    return {
+        "root": root_file,
+        "files": files,
+        "fragments": fragments,
+        "changed": changed,
+        "removed": [path for path in known_files if path not in files],
+    }
+
+
+def pipeline_files_graph(loaded):
+    """Build the graph of a multi-file pipeline, with the file of each transform as its file attribute.
+
+    Inputs are resolved across files by transform name. Files declaring a
+    chain pipeline chain their own transforms, and a pipeline in which no file
+    declares a type and no transform has an input is one chain, as in
+    parse_beam_yaml. Each transform also gets its origin, the file and its
+    name there, which identifies it across reloads even after a rename in the
+    editor.
+
+    Args:
+        loaded (dict): Result of load_pipeline_files.
+
+    Returns:
+        nx.DiGraph: Pipeline graph.
+    """
+    # third party libraries
+    import networkx as nx
+
+    G = nx.DiGraph()
+    entries = [
+        (path, transform) for path, fragment in loaded["fragments"].items() for transform in fragment["transforms"]
+    ]
+    implicit_chain = not any(fragment["typed"] for fragment in loaded["fragments"].values()) and not any(
+        transform["has_input"] for _, transform in entries
+    )
+
+    node_ids = {}
+    entry_ids = []
+    previous = {}
+    origins = set()
+    for index, (path, transform) in enumerate(entries):
+        node_id = transform["name"]
+        if node_id in G:
+            node_id = f"{node_id}_{index}"
+        node_ids.setdefault(transform["name"], node_id)
+        entry_ids.append(node_id)
+        origin = f"{path}#{transform['name']}"
+        while origin in origins:
+            origin += "#"
+        origins.add(origin)
+        G.add_node(node_id, type=transform["type"], config=transform["config"], file=path, origin=origin)
+        if "windowing" in transform:
+            G.nodes[node_id]["windowing"] = transform["windowing"]
+
+        chain_key = None if implicit_chain else path
+        if implicit_chain or loaded["fragments"][path]["chain"]:
+            if not transform["has_input"] and chain_key in previous:
+                G.add_edge(previous[chain_key], node_id)
+            previous[chain_key] = node_id
+
+    for node_id, (_, transform) in zip(entry_ids, entries):
+        for name in transform["inputs"]:
+            G.add_edge(node_ids.get(name, name), node_id)
+    return G
+
+
+def _node_key(node_id, node_data):
+    # Nodes loaded from files are tracked by their origin, which renames in the editor do not change
+    return node_data.get("origin") or node_id
+
+
+def _node_digest(node_data):
+    entry = [node_data.get("type", "Unknown"), node_data.get("config", {})]
+    if "windowing" in node_data:
+        entry.append(node_data["windowing"])
+    return hashlib.sha256(json.dumps(entry, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def pipeline_files_state(G):
+    """Summarize the graph of a load, so that the next reload can tell changes in the editor from changes in the files.
+
+    Args:
+        G (nx.DiGraph): Graph of the loaded pipeline, from pipeline_files_graph.
+
+    Returns:
+        dict: nodes (origin, or id for nodes no file defines, to a digest of
+        the node's type, config and windowing) and edges (pairs of those keys).
+    """
+    keys = {node_id: _node_key(node_id, node_data) for node_id, node_data in G.nodes(data=True)}
+    return {
+        "nodes": {keys[node_id]: _node_digest(node_data) for node_id, node_data in G.nodes(data=True)},
+        "edges": [[keys[source], keys[target]] for source, target in G.edges()],
+    }
+
+
+def merge_pipeline_files(elements, G, previous):
+    """Merge a reloaded multi-file pipeline into the current Cytoscape elements.
+
+    Edits made in the editor since the previous load are kept, node by node,
+    unless the files changed the same node. A node the files left unchanged
+    keeps its current name, type and config, or stays deleted. Nodes added in
+    the editor are kept, and so are edges added in the editor whose ends still
+    exist, while edges deleted in the editor stay deleted. Nodes and edges
+    that were added, changed or removed in the files are taken from the files.
+
+    Args:
+        elements (list): Current Cytoscape elements.
+        G (nx.DiGraph): Graph of the reloaded pipeline, from pipeline_files_graph.
+        previous (dict): pipeline_files_state of the graph of the previous load.
+
+    Returns:
+        list: Merged elements.
+    """
+    current_keys = {}
+    current_nodes = {}
+    for element in elements or []:
+        data = element["data"]
+        if "source" not in data:
+            current_keys[data["id"]] = _node_key(data["id"], data)
+            current_nodes[current_keys[data["id"]]] = element
+    current_edges = [
+        (current_keys[element["data"]["source"]], current_keys[element["data"]["target"]])
+        for element in elements or []
+        if "source" in element["data"]
+        and element["data"]["source"] in current_keys
+        and element["data"]["target"] in current_keys
+    ]
+
+    file_elements = {
+        element["data"]["id"]: element for element in graph_to_elements(G) if "source" not in element["data"]
+    }
+    merged = {}
+    for node_id, node_data in G.nodes(data=True):
+        key = _node_key(node_id, node_data)
+        unchanged_in_files = previous["nodes"].get(key) == _node_digest(node_data)
+        if key in current_nodes and (unchanged_in_files or "origin" not in node_data):
+            merged[key] = current_nodes[key]
+        elif key in current_nodes or not unchanged_in_files:
+            merged[key] = file_elements[node_id]
+        # Otherwise the node was deleted in the editor and the files did not change it
+    for key, element in current_nodes.items():
+        # Nodes added in the editor have no origin; nodes with one that the files no longer define are dropped
+        if key not in merged and "origin" not in element["data"]:
+            merged[key] = element
+
+    previous_edges = {tuple(edge) for edge in previous["edges"]}
+    kept_edges = set(current_edges)
+    file_edges = {
+        (_node_key(source, G.nodes[source]), _node_key(target, G.nodes[target])): None for source, target in G.edges()
+    }
+    # Edges of the files, unless deleted in the editor, then edges added in the editor
+    edges = [edge for edge in file_edges if edge not in previous_edges or edge in kept_edges]
+    edges += [edge for edge in dict.fromkeys(current_edges) if edge not in previous_edges and edge not in file_edges]
+
+    merged_edges = [
+        {"data": {"source": merged[source]["data"]["id"], "target": merged[target]["data"]["id"]}}
+        for source, target in edges
+        if source in merged and target in merged
+    ]
+    return list(merged.values()) + merged_edges
@@ -0,0 +1,330 @@
+# standard libraries
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from beamforge.utils.graph_utils import generate_yaml_content, graph_to_elements
+
+PREVIEW_ROW_LIMIT = 20
+PREVIEW_CACHE_SIZE = 32
+PREVIEW_RUNNERS = ["DirectRunner", "PrismRunner"]
+
+# Sources whose reads can be capped by sampling the head of their input files
+FILE_SOURCE_TYPES = {"ReadFromCsv", "ReadFromJson", "ReadFromText"}
+# Other sources cannot be capped, and may never finish, so nodes downstream of them are not previewed
+SOURCE_PREFIXES = ("ReadFrom",)
+# Transforms that write their input out and have no output to attach a sink to
+SINK_PREFIXES = ("WriteTo",)
+
+# Outputs of selection runs, one directory per run. The oldest are removed once there are more than
+# SELECTION_OUTPUT_RUNS of them or they are older than SELECTION_OUTPUT_MAX_AGE seconds.
+SELECTION_OUTPUT_DIR = os.environ.get(
+    "BEAMFORGE_SELECTION_OUTPUT_DIR", os.path.join(tempfile.gettempdir(), "beamforge-selections")
+)
+SELECTION_OUTPUT_RUNS = int(os.environ.get("BEAMFORGE_SELECTION_OUTPUT_RUNS", 20))
+SELECTION_OUTPUT_MAX_AGE = 24 * 3600
+
+_preview_cache = OrderedDict()
+_preview_cache_lock = threading.Lock()
+
+
+def upstream_subgraph(G, node_id):
+    """Return the subgraph made of a node and everything upstream of it.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph, as returned by parse_beam_yaml.
+        node_id (str): Node whose upstream closure is wanted.
+
+    Returns:
+        nx.DiGraph: Copy of the upstream subgraph, including node_id.
+    """
+    # third party libraries
+    import networkx as nx
+
+    return G.subgraph(nx.ancestors(G, node_id) | {node_id}).copy()
+
+
+def subgraph_hash(G):
+    """Hash the names, types, configs, windowing and wiring of a graph, independently of node order.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph or subgraph.
+
+    Returns:
+        str: Hex digest identifying the graph content.
+    """
+    digest = hashlib.sha256()
+    for node_id in sorted(G.nodes):
+        node_data = G.nodes[node_id]
+        entry = [node_id, node_data.get("type"), node_data.get("config", {}), sorted(G.predecessors(node_id))]
+        if "windowing" in node_data:
+            entry.append(node_data["windowing"])
+        digest.update(json.dumps(entry, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def upstream_hashes(G, order=None):
+    """Hash every node of a graph together with everything upstream of it, in one pass.
+
+    A node's hash covers its name, type, config, windowing and the hashes of
+    its inputs, so it changes exactly when the subgraph_hash of its upstream
+    subgraph does, without building a subgraph per node.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph, without cycles.
+        order (list): Node ids of G in topological order, if already known.
+
+    Returns:
+        dict: Node id to hex digest.
+    """
+    # third party libraries
+    import networkx as nx
+
+    hashes = {}
+    for node_id in order if order is not None else nx.topological_sort(G):
+        node_data = G.nodes[node_id]
+        entry = [node_id, node_data.get("type"), node_data.get("config", {})]
+        if "windowing" in node_data:
+            entry.append(node_data["windowing"])
+        entry.append(sorted(hashes[upstream_id] for upstream_id in G.predecessors(node_id)))
+        hashes[node_id] = hashlib.sha256(json.dumps(entry, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return hashes
+
+
+def local_input_files(config):
+    """Return [path, mtime_ns, size] of the local files a source config reads, or [] for remote paths."""
+    path = config.get("path")
+    if not isinstance(path, str) or "://" in path:
+        return []
+    files = []
+    for file_path in sorted(glob.glob(path)):
+        if os.path.isfile(file_path):
+            stat = os.stat(file_path)
+            files.append([file_path, stat.st_mtime_ns, stat.st_size])
+    return files
+
+
+def source_file_stamps(G):
+    """Return the local files read by the sources of a graph, to key results that depend on their content.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph or subgraph.
+
+    Returns:
+        list: [node id, local_input_files] of every source, sorted by node id.
+    """
+    return [
+        [node_id, local_input_files(node_data.get("config") or {})]
+        for node_id, node_data in sorted(G.nodes(data=True))
+        if node_data.get("type", "").startswith(SOURCE_PREFIXES)
+    ]
+
+
+def sample_file_source(transform_type, config, sample_dir, limit):
+    """Rewrite a file source config so it reads a capped sample of its input.
+
+    Only the first local file matching the configured path is sampled. Remote or
+    missing paths are left unchanged.
+
+    Args:
+        transform_type (str): Source transform type, one of FILE_SOURCE_TYPES.
+        config (dict): Source transform config.
+        sample_dir (str): Directory to write the sample file to.
+        limit (int): Maximum number of records to keep.
+
+    Returns:
+        dict: Config pointing at the sample file, or the original config.
+    """
+    matches = sorted(glob.glob(config.get("path", "")))
+    if not matches:
+        return config
+
+    # CSV files keep their header line on top of the sampled records
+    keep_lines = limit + 1 if transform_type == "ReadFromCsv" else limit
+    # Named after the full path, so that files with the same name in different directories get their own sample
+    path_hash = hashlib.sha256(os.path.abspath(matches[0]).encode("utf-8")).hexdigest()[:16]
+    sample_path = os.path.join(sample_dir, "sample-%s-%s" % (path_hash, os.path.basename(matches[0])))
+    with open(matches[0], "r", encoding="utf-8", errors="replace") as source, open(
+        sample_path, "w", encoding="utf-8"
+    ) as sample:
+        for line_number, line in enumerate(source):
+            if line_number >= keep_lines:
+                break
+            sample.write(line)
+
+    return dict(config, path=sample_path)
+
+
+def attach_json_sinks(G, sinks):
+    """Return a copy of the graph with a WriteToJson sink attached to the given nodes.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+        sinks (dict): Mapping of node id to the output path prefix of its sink.
+
+    Returns:
+        nx.DiGraph: Graph with one extra sink node per entry in sinks.
+    """
+    G = G.copy()
+    for node_id, path in sinks.items():
+        sink_id = "%s__sink" % node_id
+        G.add_node(sink_id, type="WriteToJson", config={"path": path})
+        G.add_edge(node_id, sink_id)
+    return G
+
+
+def selection_output_dir(base_dir=None, runs=SELECTION_OUTPUT_RUNS, max_age=SELECTION_OUTPUT_MAX_AGE):
+    """Create the output directory of a selection run, removing those of old runs.
+
+    Args:
+        base_dir (str): Directory of the selection outputs.
+        runs (int): Number of runs whose outputs are kept, this one included.
+        max_age (float): Seconds after which the output of a run is removed.
+
+    Returns:
+        str: The new output directory.
+    """
+    base_dir = base_dir or SELECTION_OUTPUT_DIR
+    os.makedirs(base_dir, exist_ok=True)
+    previous = sorted(
+        (os.path.getmtime(path), path) for path in glob.glob(os.path.join(base_dir, "run-*")) if os.path.isdir(path)
+    )
+    for index, (mtime, path) in enumerate(previous):
+        if index < len(previous) - (runs - 1) or time.time() - mtime > max_age:
+            shutil.rmtree(path, ignore_errors=True)
+    return tempfile.mkdtemp(prefix="run-", dir=base_dir)
+
+
+def selection_subgraph(G, node_ids, output_dir):
+    """Prune a graph to the selected nodes and their upstream, with a sink on every selected leaf.
+
+    A selected leaf is a selected node with no other selected node downstream
+    of it. Leaves that are sinks themselves are left as they are.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+        node_ids (list): Selected node ids.
+        output_dir (str): Directory the temporary sinks write to.
+
+    Returns:
+        tuple: (pruned graph with the sinks attached, mapping of leaf node id to its sink path prefix).
+    """
+    # third party libraries
+    import networkx as nx
+
+    selected = set(node_ids) & set(G.nodes)
+    keep = set(selected)
+    for node_id in selected:
+        keep |= nx.ancestors(G, node_id)
+    leaves = [
+        node_id
+        for node_id in sorted(selected)
+        if not nx.descendants(G, node_id) & selected and not G.nodes[node_id].get("type", "").startswith(SINK_PREFIXES)
+    ]
+    sinks = {node_id: os.path.join(output_dir, node_id) for node_id in leaves}
+    return attach_json_sinks(G.subgraph(keep), sinks), sinks
+
+
+def read_json_output(path_prefix, limit):
+    """Read up to limit records from the shards written by WriteToJson.
+
+    Args:
+        path_prefix (str): The path given to WriteToJson.
+        limit (int): Maximum number of records to read.
+
+    Returns:
+        list: Decoded records.
+    """
+    rows = []
+    for shard in sorted(glob.glob(path_prefix + "*")):
+        with open(shard, "r", encoding="utf-8") as f:
+            for line in f:
+                if len(rows) >= limit:
+                    return rows
+                if line.strip():
+                    rows.append(json.loads(line))
+    return rows
+
+
+def run_yaml_in_process(yaml_content, runner, pipeline_args=None):
+    """Run a Beam YAML pipeline inside the current process.
+
+    Args:
+        yaml_content (str): Beam YAML pipeline.
+        runner (str): A local runner, e.g. DirectRunner or PrismRunner.
+        pipeline_args (list): Extra pipeline options.
+
+    Returns:
+        The PipelineResult of the finished run.
+    """
+    # third party libraries
+    import apache_beam as beam
+    from apache_beam.options.pipeline_options import PipelineOptions
+    from apache_beam.yaml import yaml_transform
+
+    options = PipelineOptions(["--runner=%s" % runner] + list(pipeline_args or []))
+    pipeline = beam.Pipeline(options=options)
+    yaml_transform.expand_pipeline(pipeline, yaml_content)
+    result = pipeline.run()
+    result.wait_until_finish()
+    return result
+
+
+def preview_node_output(G, node_id, limit=PREVIEW_ROW_LIMIT, runner="DirectRunner"):
+    """Run the upstream subgraph of a node on sampled inputs and return its first output rows.
+
+    Results are cached by the hash of the upstream subgraph and the files its
+    sources read, so editing nodes downstream of node_id does not invalidate
+    the preview. Nodes downstream of sources that cannot be sampled, such as
+    Pub/Sub or BigQuery reads, are not previewed.
+
+    Args:
+        G (nx.DiGraph): Pipeline graph.
+        node_id (str): Node to preview.
+        limit (int): Maximum number of rows to read from each source and to return.
+        runner (str): Local runner used to execute the preview.
+
+    Returns:
+        list: Up to limit output records of node_id, as dicts.
+
+    Raises:
+        ValueError: If an upstream source cannot be sampled.
+    """
+    upstream = upstream_subgraph(G, node_id)
+    for upstream_id, node_data in upstream.nodes(data=True):
+        transform_type = node_data.get("type", "")
+        if transform_type.startswith(SOURCE_PREFIXES) and transform_type not in FILE_SOURCE_TYPES:
+            raise ValueError(
+                f"'{upstream_id}' ({transform_type}) cannot be sampled, previews only read capped samples of "
+                f"{', '.join(sorted(FILE_SOURCE_TYPES))} sources"
+            )
+
+    stamps = json.dumps(source_file_stamps(upstream), sort_keys=True)
+    cache_key = (subgraph_hash(upstream), stamps, node_id, limit, runner)
+    with _preview_cache_lock:
+        if cache_key in _preview_cache:
+            _preview_cache.move_to_end(cache_key)
+            return _preview_cache[cache_key]
+
+    with tempfile.TemporaryDirectory(prefix="beamforge-preview-") as tmp_dir:
+        for upstream_id, node_data in upstream.nodes(data=True):
+            if node_data.get("type") in FILE_SOURCE_TYPES:
+                node_data["config"] = sample_file_source(node_data["type"], node_data.get("config", {}), tmp_dir, limit)
+
+        output_prefix = os.path.join(tmp_dir, "preview")
+        preview_graph = attach_json_sinks(upstream, {node_id: output_prefix})
+        elements = graph_to_elements(preview_graph)
+        run_yaml_in_process(generate_yaml_content(elements), runner)
+        rows = read_json_output(output_prefix, limit)
+
+    with _preview_cache_lock:
+        _preview_cache[cache_key] = rows
+        while len(_preview_cache) > PREVIEW_CACHE_SIZE:
+            _preview_cache.popitem(last=False)
+    return rows
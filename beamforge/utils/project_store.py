@@ -0,0 +1,328 @@
+# standard libraries
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from beamforge.utils.graph_utils import graph_to_elements
+from beamforge.utils.yaml_parser import parse_beam_yaml
+
+STORE_DIR = os.environ.get("BEAMFORGE_STORE_DIR", os.path.join(os.path.expanduser("~"), ".beamforge"))
+STORE_FILE_NAME = "projects.db"
+UPLOAD_CACHE_BYTES = int(os.environ.get("BEAMFORGE_UPLOAD_CACHE_BYTES", 256 * 1024**2))
+
+# Blobs and graphs are keyed by the sha256 of the pipeline YAML, so identical
+# versions share storage and a version's parsed graph is found by its blob hash.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS graphs (
+    hash TEXT PRIMARY KEY REFERENCES blobs(hash),
+    elements TEXT NOT NULL,
+    layout TEXT
+);
+CREATE TABLE IF NOT EXISTS uploads (
+    hash TEXT PRIMARY KEY REFERENCES blobs(hash),
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pipelines (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    head_version INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    pipeline_id INTEGER NOT NULL REFERENCES pipelines(id),
+    version INTEGER NOT NULL,
+    blob_hash TEXT NOT NULL REFERENCES blobs(hash),
+    message TEXT,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (pipeline_id, version)
+);
+CREATE TABLE IF NOT EXISTS collab_ops (
+    session TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    client TEXT NOT NULL,
+    op TEXT NOT NULL,
+    PRIMARY KEY (session, seq)
+);
+"""
+
+_initialized_paths = set()
+_initialized_paths_lock = threading.Lock()
+
+
+def get_store_path():
+    return os.path.join(STORE_DIR, STORE_FILE_NAME)
+
+
+@contextlib.contextmanager
+def connect(path=None, immediate=False):
+    """Open a connection to the project store, creating it on first use.
+
+    Each call opens its own connection, so the store can be used from any
+    thread or worker process. The connection commits when the block exits
+    without an exception.
+
+    Args:
+        path (str): Store file, defaults to BEAMFORGE_STORE_DIR/projects.db.
+        immediate (bool): Take the write lock when the block starts, so that
+            reads inside it cannot be invalidated by another writer.
+
+    Yields:
+        sqlite3.Connection: Open connection.
+    """
+    path = path or get_store_path()
+    with _initialized_paths_lock:
+        if path not in _initialized_paths:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            conn = sqlite3.connect(path)
+            try:
+                # Readers do not block the writer and vice versa
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                conn.commit()
+            finally:
+                conn.close()
+            _initialized_paths.add(path)
+
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.execute("PRAGMA foreign_keys=ON")
+        if immediate:
+            conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def content_hash(yaml_content):
+    return hashlib.sha256(yaml_content.encode("utf-8")).hexdigest()
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+
+def _insert_graph(conn, blob_hash, yaml_content, elements, layout=None):
+    conn.execute("INSERT OR IGNORE INTO blobs (hash, content) VALUES (?, ?)", (blob_hash, yaml_content))
+    conn.execute(
+        "INSERT OR REPLACE INTO graphs (hash, elements, layout) VALUES (?, ?, ?)",
+        (blob_hash, json.dumps(elements), json.dumps(layout) if layout else None),
+    )
+
+
+def cache_graph(blob_hash, yaml_content, elements, layout=None, path=None):
+    """Store a pipeline YAML blob and its parsed graph under the content hash, outside any version history.
+
+    Args:
+        blob_hash (str): sha256 of yaml_content, see content_hash.
+        yaml_content (str): Beam YAML of the pipeline.
+        elements (list): Cytoscape elements of the pipeline graph.
+        layout (dict): Cytoscape layout to open the graph with.
+        path (str): Store file.
+    """
+    with connect(path) as conn:
+        _insert_graph(conn, blob_hash, yaml_content, elements, layout)
+
+
+def save_blob(blob_hash, content, path=None):
+    """Store content under its hash, without a parsed graph (e.g. a pipeline template)."""
+    with connect(path) as conn:
+        conn.execute("INSERT OR IGNORE INTO blobs (hash, content) VALUES (?, ?)", (blob_hash, content))
+
+
+def touch_upload(blob_hash, size, path=None):
+    """Record that an uploaded blob was used now, see evict_uploads."""
+    with connect(path) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO uploads (hash, size, last_used) VALUES (?, ?, ?)", (blob_hash, size, time.time())
+        )
+
+
+def evict_uploads(max_bytes=UPLOAD_CACHE_BYTES, keep=None, path=None):
+    """Remove the least recently used uploads until the uploads fit in max_bytes.
+
+    The blob and graph of an evicted upload are kept if a saved pipeline
+    version uses the same content.
+
+    Args:
+        max_bytes (int): Total uploaded size to keep.
+        keep (str): Hash of an upload that is never evicted, e.g. the one being stored.
+        path (str): Store file.
+
+    Returns:
+        list: Hashes of the removed uploads.
+    """
+    with connect(path, immediate=True) as conn:
+        rows = conn.execute("SELECT hash, size FROM uploads ORDER BY last_used").fetchall()
+        total = sum(size for _, size in rows)
+        evicted = []
+        for blob_hash, size in rows:
+            if total <= max_bytes:
+                break
+            if blob_hash == keep:
+                continue
+            conn.execute("DELETE FROM uploads WHERE hash = ?", (blob_hash,))
+            if conn.execute("SELECT 1 FROM versions WHERE blob_hash = ?", (blob_hash,)).fetchone() is None:
+                conn.execute("DELETE FROM graphs WHERE hash = ?", (blob_hash,))
+                conn.execute("DELETE FROM blobs WHERE hash = ?", (blob_hash,))
+            total -= size
+            evicted.append(blob_hash)
+    return evicted
+
+
+def load_blob(blob_hash, path=None):
+    """Return the content stored under a hash, or None."""
+    with connect(path) as conn:
+        row = conn.execute("SELECT content FROM blobs WHERE hash = ?", (blob_hash,)).fetchone()
+    return row[0] if row else None
+
+
+def has_graph(blob_hash, path=None):
+    with connect(path) as conn:
+        return conn.execute("SELECT 1 FROM graphs WHERE hash = ?", (blob_hash,)).fetchone() is not None
+
+
+def load_graph(blob_hash, path=None):
+    """Load a pipeline YAML blob and its cached graph by content hash.
+
+    Args:
+        blob_hash (str): sha256 of the pipeline YAML.
+        path (str): Store file.
+
+    Returns:
+        dict: hash, yaml, elements and layout of the pipeline, or None if the
+        hash is not in the graph cache.
+    """
+    with connect(path) as conn:
+        row = conn.execute(
+            "SELECT b.content, g.elements, g.layout FROM graphs g JOIN blobs b ON b.hash = g.hash WHERE g.hash = ?",
+            (blob_hash,),
+        ).fetchone()
+    if row is None:
+        return None
+    yaml_content, elements, layout = row
+    return {
+        "hash": blob_hash,
+        "yaml": yaml_content,
+        "elements": json.loads(elements),
+        "layout": json.loads(layout) if layout else None,
+    }
+
+
+def save_pipeline(name, yaml_content, elements=None, layout=None, message=None, path=None):
+    """Save a pipeline as a new version, unless it is unchanged from the head version.
+
+    Args:
+        name (str): Pipeline name.
+        yaml_content (str): Beam YAML of the pipeline.
+        elements (list): Cytoscape elements of the pipeline graph. Parsed from
+            yaml_content if not given.
+        layout (dict): Cytoscape layout to reopen the graph with.
+        message (str): Optional description of the version.
+        path (str): Store file.
+
+    Returns:
+        tuple: (version, created) where created is False if the head version
+        already had this content.
+    """
+    blob_hash = content_hash(yaml_content)
+    if elements is None:
+        elements = graph_to_elements(parse_beam_yaml(yaml_content))
+
+    with connect(path, immediate=True) as conn:
+        row = conn.execute(
+            "SELECT p.id, p.head_version, v.blob_hash FROM pipelines p "
+            "JOIN versions v ON v.pipeline_id = p.id AND v.version = p.head_version "
+            "WHERE p.name = ?",
+            (name,),
+        ).fetchone()
+        if row and row[2] == blob_hash:
+            return row[1], False
+
+        now = _now()
+        _insert_graph(conn, blob_hash, yaml_content, elements, layout)
+        if row:
+            pipeline_id, version = row[0], row[1] + 1
+            conn.execute(
+                "UPDATE pipelines SET head_version = ?, updated_at = ? WHERE id = ?", (version, now, pipeline_id)
+            )
+        else:
+            version = 1
+            pipeline_id = conn.execute(
+                "INSERT INTO pipelines (name, head_version, updated_at) VALUES (?, ?, ?)", (name, version, now)
+            ).lastrowid
+        conn.execute(
+            "INSERT INTO versions (pipeline_id, version, blob_hash, message, created_at) VALUES (?, ?, ?, ?, ?)",
+            (pipeline_id, version, blob_hash, message, now),
+        )
+    return version, True
+
+
+def load_pipeline(name, version=None, path=None):
+    """Load a saved pipeline version together with its cached graph and layout.
+
+    Args:
+        name (str): Pipeline name.
+        version (int): Version to load, defaults to the head version.
+        path (str): Store file.
+
+    Returns:
+        dict: version, hash, yaml, elements and layout of the pipeline, or None
+        if the pipeline or version does not exist.
+    """
+    with connect(path) as conn:
+        row = conn.execute(
+            "SELECT v.version, v.blob_hash, b.content, g.elements, g.layout FROM pipelines p "
+            "JOIN versions v ON v.pipeline_id = p.id AND v.version = COALESCE(?, p.head_version) "
+            "JOIN blobs b ON b.hash = v.blob_hash "
+            "LEFT JOIN graphs g ON g.hash = v.blob_hash "
+            "WHERE p.name = ?",
+            (version, name),
+        ).fetchone()
+        if row is None:
+            return None
+
+        version, blob_hash, yaml_content, elements, layout = row
+        if elements is None:
+            # Backfill a missing graph cache entry so the next load is a single read
+            elements = json.dumps(graph_to_elements(parse_beam_yaml(yaml_content)))
+            conn.execute("INSERT OR IGNORE INTO graphs (hash, elements) VALUES (?, ?)", (blob_hash, elements))
+
+    return {
+        "version": version,
+        "hash": blob_hash,
+        "yaml": yaml_content,
+        "elements": json.loads(elements),
+        "layout": json.loads(layout) if layout else None,
+    }
+
+
+def list_pipelines(path=None):
+    """Return the saved pipelines as dicts with name, head_version and updated_at, most recent first."""
+    with connect(path) as conn:
+        rows = conn.execute("SELECT name, head_version, updated_at FROM pipelines ORDER BY updated_at DESC, name")
+        return [{"name": name, "head_version": head, "updated_at": updated} for name, head, updated in rows]
+
+
+def list_versions(name, path=None):
+    """Return the versions of a pipeline as dicts with version, hash, message and created_at, newest first."""
+    with connect(path) as conn:
+        rows = conn.execute(
+            "SELECT v.version, v.blob_hash, v.message, v.created_at FROM versions v "
+            "JOIN pipelines p ON p.id = v.pipeline_id WHERE p.name = ? ORDER BY v.version DESC",
+            (name,),
+        )
+        return [
+            {"version": version, "hash": blob_hash, "message": message, "created_at": created}
+            for version, blob_hash, message, created in rows
+        ]
@@ -0,0 +1,94 @@
+# standard libraries
+import time
+
+
+def match_node_id(unique_name, node_ids):
+    """Find the pipeline node a Beam transform label belongs to.
+
+    Beam YAML labels each transform with its name, adding an ``@`` suffix when
+    the name is not unique, and nests the transforms it expands into under it.
+
+    Args:
+        unique_name (str): Full Beam transform label, e.g. ``Filter/Filter(fn)``.
+        node_ids (set): Ids of the pipeline nodes.
+
+    Returns:
+        str: The matching node id, or None.
+    """
+    top_level = unique_name.split("/", 1)[0]
+    if top_level in node_ids:
+        return top_level
+    if "@" in top_level and top_level.rsplit("@", 1)[0] in node_ids:
+        return top_level.rsplit("@", 1)[0]
+    return None
+
+
+def collect_step_metrics(yaml_content, node_ids, pipeline_args=None):
+    """Run a Beam YAML pipeline locally and collect per-node element counts and processing time.
+
+    The pipeline runs in-process on the portable FnApiRunner (the engine behind
+    the DirectRunner for batch pipelines), whose monitoring infos report the
+    element count of every PCollection and the execution time of every step.
+
+    Args:
+        yaml_content (str): Beam YAML pipeline.
+        node_ids (list): Ids of the pipeline nodes to report on.
+        pipeline_args (list): Extra pipeline options.
+
+    Returns:
+        tuple: (metrics, wall_seconds) where metrics maps each node id to a dict
+        with elements_in, elements_out and msecs.
+    """
+    # third party libraries
+    import apache_beam as beam
+    from apache_beam.metrics import monitoring_infos
+    from apache_beam.options.pipeline_options import PipelineOptions
+    from apache_beam.runners.portability.fn_api_runner import FnApiRunner
+    from apache_beam.transforms import environments
+    from apache_beam.yaml import yaml_transform
+
+    node_ids = set(node_ids)
+    options = PipelineOptions(list(pipeline_args or []))
+    pipeline = beam.Pipeline(options=options)
+    yaml_transform.expand_pipeline(pipeline, yaml_content)
+
+    # Build the proto ourselves so that PCollection ids in the metrics match it
+    pipeline_proto = pipeline.to_runner_api(default_environment=environments.EmbeddedPythonEnvironment.default())
+    start = time.time()
+    result = FnApiRunner().run_via_runner_api(pipeline_proto, options)
+    result.wait_until_finish()
+    wall_seconds = time.time() - start
+
+    # The outermost transform of each node carries the node's inputs and outputs
+    node_transforms = {}
+    for transform in pipeline_proto.components.transforms.values():
+        node_id = match_node_id(transform.unique_name, node_ids)
+        if node_id is not None and "/" not in transform.unique_name:
+            node_transforms[node_id] = transform
+
+    element_counts = {}
+    step_msecs = {}
+    for monitoring_info in result.monitoring_infos():
+        if monitoring_info.urn == monitoring_infos.ELEMENT_COUNT_URN:
+            pcollection = monitoring_info.labels.get(monitoring_infos.PCOLLECTION_LABEL)
+            element_counts[pcollection] = element_counts.get(pcollection, 0) + monitoring_infos.extract_counter_value(
+                monitoring_info
+            )
+        elif monitoring_info.urn == monitoring_infos.TOTAL_MSECS_URN:
+            node_id = match_node_id(monitoring_info.labels.get(monitoring_infos.PTRANSFORM_LABEL, ""), node_ids)
+            if node_id is not None:
+                step_msecs[node_id] = step_msecs.get(node_id, 0) + monitoring_infos.extract_counter_value(
+                    monitoring_info
+                )
+
+    metrics = {}
+    for node_id in sorted(node_ids):
+        transform = node_transforms.get(node_id)
+        metrics[node_id] = {
+            "elements_in": sum(element_counts.get(pcoll, 0) for pcoll in transform.inputs.values()) if transform else 0,
+            "elements_out": (
+                sum(element_counts.get(pcoll, 0) for pcoll in transform.outputs.values()) if transform else 0
+            ),
+            "msecs": step_msecs.get(node_id, 0),
+        }
+    return metrics, wall_seconds
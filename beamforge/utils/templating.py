@@ -0,0 +1,95 @@
+# standard libraries
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+# third party libraries
+import yaml
+
+from beamforge.utils.graph_utils import graph_to_elements
+from beamforge.utils.project_store import load_blob
+from beamforge.utils.yaml_parser import parse_beam_yaml, render_jinja_template
+
+TEMPLATE_CACHE_SIZE = 64
+
+_template_cache = OrderedDict()
+_template_cache_lock = threading.Lock()
+
+
+def parse_jinja_variables(text):
+    """Parse the variables of a pipeline template, given as a JSON or YAML mapping.
+
+    Args:
+        text (str): Variables as typed in the UI. Empty means no variables.
+
+    Returns:
+        dict: Template variables.
+
+    Raises:
+        ValueError: If the text is not a mapping.
+        yaml.YAMLError: If the text is not valid YAML.
+    """
+    variables = yaml.safe_load(text or "") or {}
+    if not isinstance(variables, dict):
+        raise ValueError("Jinja variables should be a mapping of names to values")
+    return variables
+
+
+def variables_hash(variables):
+    return hashlib.sha256(json.dumps(variables, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def render_template_graph(template, variables, template_hash=None):
+    """Render a pipeline template with a variable set and parse the result.
+
+    Results are cached per (template hash, variables hash), so switching back
+    to a variable set that was already rendered does not render or parse again.
+
+    Args:
+        template (str): Pipeline template.
+        variables (dict): Template variables.
+        template_hash (str): sha256 of the template, if already known.
+
+    Returns:
+        dict: yaml (the rendered pipeline) and elements (its Cytoscape elements).
+
+    Raises:
+        jinja2.TemplateError: If rendering fails, e.g. on an undefined variable.
+    """
+    template_hash = template_hash or hashlib.sha256(template.encode("utf-8")).hexdigest()
+    cache_key = (template_hash, variables_hash(variables))
+    with _template_cache_lock:
+        if cache_key in _template_cache:
+            _template_cache.move_to_end(cache_key)
+            return copy.deepcopy(_template_cache[cache_key])
+
+    rendered = render_jinja_template(template, variables)
+    result = {"yaml": rendered, "elements": graph_to_elements(parse_beam_yaml(rendered))}
+
+    with _template_cache_lock:
+        _template_cache[cache_key] = result
+        while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+    return copy.deepcopy(result)
+
+
+def render_stored_template(template_hash, variables_text, path=None):
+    """Render a pipeline template from the project store with variables typed in the UI.
+
+    Args:
+        template_hash (str): Content hash the template was stored under.
+        variables_text (str): Template variables as a JSON or YAML mapping.
+        path (str): Project store file.
+
+    Returns:
+        dict: yaml and elements of the rendered pipeline, see render_template_graph.
+
+    Raises:
+        ValueError: If the template is not in the store or the variables are not a mapping.
+    """
+    template = load_blob(template_hash, path)
+    if template is None:
+        raise ValueError("Uploaded template is no longer available, please upload it again")
+    return render_template_graph(template, parse_jinja_variables(variables_text), template_hash)
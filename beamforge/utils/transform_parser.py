@@ -1,8 +1,31 @@
+# standard libraries
+import functools
+import importlib.metadata
+
 # third party libraries
-import apache_beam as beam
-import requests
 import yaml
-from bs4 import BeautifulSoup
+
+# Read from the package metadata, so that apache_beam is not imported at startup
+BEAM_VERSION = importlib.metadata.version("apache-beam")
+
+
+@functools.lru_cache(maxsize=None)
+def fetch_beam_yamldoc(beam_version=BEAM_VERSION):
+    """Fetch and parse the Beam YAML documentation page for a Beam version.
+
+    Args:
+        beam_version (str): Beam version whose documentation to fetch
+
+    Returns:
+        BeautifulSoup: Parsed documentation page
+    """
+    # third party libraries
+    import requests
+    from bs4 import BeautifulSoup
+
+    url = f"https://beam.apache.org/releases/yamldoc/{beam_version}/"
+    response = requests.get(url)
+    return BeautifulSoup(response.content, "html.parser")
 
 
 def parse_beam_transforms():
@@ -11,9 +34,7 @@ def parse_beam_transforms():
     Returns:
         dict: Dictionary where keys are transform names and values are usage strings
     """
-    url = f"https://beam.apache.org/releases/yamldoc/{beam.__version__}/"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, "html.parser")
+    soup = fetch_beam_yamldoc()
 
     transforms = {}
     transforms["UNKNOWN"] = "Usage not found."
@@ -36,6 +57,54 @@ def parse_beam_transforms():
     return transforms
 
 
+def _parse_parameter_list(ul):
+    """Parse a "Configuration" bullet list of the documentation page into parameter dicts."""
+    parameters = []
+    for li in ul.find_all("li", recursive=False):
+        # Loose markdown lists wrap each item in a paragraph
+        head = li.find("p", recursive=False) or li
+        name = head.find("strong")
+        type_ = head.find("code")
+        if name is None:
+            continue
+        nested = li.find("ul")
+        head_text = "".join(child.text for child in head.children if child.name != "ul")
+        parameters.append(
+            {
+                "name": name.text.strip(),
+                "type": type_.text.strip() if type_ is not None else "?",
+                "required": "(Optional)" not in head_text,
+                "description": " ".join(head_text.split(":", 1)[1].split()) if ":" in head_text else "",
+                "fields": _parse_parameter_list(nested) if nested is not None else [],
+            }
+        )
+    return parameters
+
+
+def parse_beam_transform_parameters():
+    """Parse the "Configuration" section of each transform in the Beam YAML documentation page.
+
+    Returns:
+        dict: Dictionary where keys are transform names and values are lists of parameter dicts with
+            name, type, required, description and (for Row parameters) nested fields
+    """
+    soup = fetch_beam_yamldoc()
+
+    parameters = {}
+    for h2 in soup.find_all("h2", id=True):
+        next_sibling = h2.find_next_sibling()
+        in_configuration = False
+        while next_sibling and next_sibling.name != "h2":
+            if next_sibling.name == "h3":
+                in_configuration = next_sibling.text.strip() == "Configuration"
+            elif in_configuration and next_sibling.name == "ul":
+                parameters[h2.text.strip()] = _parse_parameter_list(next_sibling)
+                break
+            next_sibling = next_sibling.find_next_sibling()
+
+    return parameters
+
+
 def extract_config_from_yaml(yaml_str):
     """Extract only the configuration part from a YAML string.
 
@@ -54,10 +123,32 @@ def extract_config_from_yaml(yaml_str):
         return ""
 
 
-BEAM_YAML_TRANSFORMS = parse_beam_transforms()
+# The catalog is built from the documentation page on first use rather than at import, so that
+# starting the app does not wait for the network; wsgi.py loads it before forking the workers.
+
+
+@functools.lru_cache(maxsize=None)
+def beam_yaml_transforms():
+    """Usage example of each transform in the catalog, keyed by transform name."""
+    return parse_beam_transforms()
+
+
+@functools.lru_cache(maxsize=None)
+def beam_yaml_transforms_config():
+    """Configuration part of the usage example of each transform, keyed by transform name."""
+    return {
+        name: extract_config_from_yaml(transform) if name != "UNKNOWN" else "Usage not found."
+        for name, transform in beam_yaml_transforms().items()
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def beam_yaml_transforms_params():
+    """Parameter metadata of each transform, used to validate configs, keyed by transform name."""
+    return parse_beam_transform_parameters()
+
 
-# Create a dictionary of transform configurations
-BEAM_YAML_TRANSFORMS_CONFIG = {
-    name: extract_config_from_yaml(transform) if name != "UNKNOWN" else "Usage not found."
-    for name, transform in BEAM_YAML_TRANSFORMS.items()
-}
+def load_catalog():
+    """Build the whole transform catalog now instead of on first use."""
+    beam_yaml_transforms_config()
+    beam_yaml_transforms_params()
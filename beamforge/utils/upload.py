@@ -0,0 +1,93 @@
+# standard libraries
+import hashlib
+import io
+import re
+import tempfile
+
+from beamforge.utils.graph_utils import graph_to_elements
+from beamforge.utils.project_store import cache_graph, evict_uploads, has_graph, save_blob, touch_upload
+from beamforge.utils.yaml_parser import parse_beam_yaml
+
+UPLOAD_CHUNK_SIZE = 1 << 16
+# Uploads larger than this are spooled to disk instead of memory
+UPLOAD_SPOOL_SIZE = 1 << 20
+MAX_UPLOAD_SIZE = 64 << 20
+JINJA_BYTES_PATTERN = re.compile(rb"\{\{|\{%|\{#")
+
+
+def spool_upload(stream, chunk_size=UPLOAD_CHUNK_SIZE, max_size=MAX_UPLOAD_SIZE):
+    """Copy an upload stream into a spool file, hashing it on the way.
+
+    Args:
+        stream: Binary file-like object to read from.
+        chunk_size (int): Read size.
+        max_size (int): Maximum accepted size in bytes.
+
+    Returns:
+        tuple: (spool, sha256 hex digest, size in bytes), with spool rewound to the start.
+
+    Raises:
+        ValueError: If the stream is longer than max_size.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE)
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        size += len(chunk)
+        if size > max_size:
+            spool.close()
+            raise ValueError(f"Upload exceeds {max_size} bytes")
+        digest.update(chunk)
+        spool.write(chunk)
+    spool.seek(0)
+    return spool, digest.hexdigest(), size
+
+
+def _contains_jinja(spool, chunk_size=UPLOAD_CHUNK_SIZE):
+    """Scan a spool file for Jinja markers, keeping one byte of overlap between chunks."""
+    previous = b""
+    for chunk in iter(lambda: spool.read(chunk_size), b""):
+        if JINJA_BYTES_PATTERN.search(previous[-1:] + chunk):
+            spool.seek(0)
+            return True
+        previous = chunk
+    spool.seek(0)
+    return False
+
+
+def store_upload(stream, path=None):
+    """Parse an uploaded Beam YAML file into the project store's graph cache.
+
+    The YAML loader reads the spool file incrementally, and files already in
+    the cache are not parsed again. Jinja templates are only stored, since they
+    can only be parsed once rendered with a variable set. The least recently
+    uploaded files are evicted once the uploads outgrow their budget.
+
+    Args:
+        stream: Binary file-like object with the uploaded file.
+        path (str): Project store file.
+
+    Returns:
+        dict: handle (the content hash to load the graph or template with),
+        size, and template, which is True for Jinja templates.
+    """
+    spool, blob_hash, size = spool_upload(stream)
+    with spool:
+        if has_graph(blob_hash, path):
+            template = False
+        else:
+            template = _contains_jinja(spool)
+            text = io.TextIOWrapper(spool, encoding="utf-8")
+            try:
+                if template:
+                    save_blob(blob_hash, text.read(), path=path)
+                else:
+                    G = parse_beam_yaml(text)
+                    text.seek(0)
+                    cache_graph(blob_hash, text.read(), graph_to_elements(G), path=path)
+            finally:
+                text.detach()
+
+    touch_upload(blob_hash, size, path)
+    evict_uploads(keep=blob_hash, path=path)
+    return {"handle": blob_hash, "size": size, "template": template}
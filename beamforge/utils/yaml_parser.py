@@ -1,11 +1,37 @@
 # third party libraries
-import networkx as nx
 import yaml
 
 
-def parse_beam_yaml(yaml_content):
-    """Parse Beam YAML and create a NetworkX graph."""
+def render_jinja_template(template, jinja_variables):
+    """Render a Jinja-templated Beam YAML pipeline the way ``--jinja_variables`` does.
+
+    Args:
+        template (str): Pipeline template.
+        jinja_variables (dict): Template variables.
+
+    Returns:
+        str: Rendered Beam YAML.
+    """
+    # third party libraries
+    from apache_beam.yaml.yaml_transform import expand_jinja
+
+    return expand_jinja(template, jinja_variables)
+
+
+def parse_beam_yaml(yaml_content, jinja_variables=None):
+    """Parse Beam YAML and create a NetworkX graph.
+
+    If jinja_variables is given, yaml_content is a Jinja template that is
+    rendered with them first.
+    """
+    # third party libraries
+    import networkx as nx
+
     G = nx.DiGraph()
+    if jinja_variables is not None:
+        if not isinstance(yaml_content, str):
+            yaml_content = yaml_content.read()
+        yaml_content = render_jinja_template(yaml_content, jinja_variables)
     data = yaml.safe_load(yaml_content)
 
     if "pipeline" not in data:
@@ -29,6 +55,8 @@ def parse_beam_yaml(yaml_content):
             if node_id in G:
                 node_id = f"{node_id}_{idx}"
             G.add_node(node_id, type=transform_type, config=transform.get("config", {}))
+            if "windowing" in transform:
+                G.nodes[node_id]["windowing"] = transform["windowing"]
             if prev_node is not None:
                 G.add_edge(prev_node, node_id)
             prev_node = node_id
@@ -40,6 +68,8 @@ def parse_beam_yaml(yaml_content):
             if node_id in G:
                 node_id = f"{node_id}_{idx}"
             G.add_node(node_id, type=transform_type, config=transform.get("config", {}))
+            if "windowing" in transform:
+                G.nodes[node_id]["windowing"] = transform["windowing"]
 
             # Handle input connections for non-linear pipelines
             inputs = transform.get("input", None)
@@ -0,0 +1,62 @@
+# standard libraries
+import gc
+import multiprocessing
+import os
+
+from beamforge.app import app
+from beamforge.utils.transform_parser import load_catalog
+
+# The app loads the transform catalog on first use. Load it here instead so that, with a
+# preloading server, it is fetched once in the master and shared copy-on-write by the workers.
+load_catalog()
+
+server = app.server
+
+
+def get_server_options():
+    """Build the production server options from the environment.
+
+    Environment variables:
+        BEAMFORGE_BIND: Address to bind to (default ``0.0.0.0:8050``).
+        BEAMFORGE_WORKERS: Number of worker processes (default ``2 * CPUs + 1``).
+        BEAMFORGE_THREADS: Number of threads per worker (default ``1``).
+        BEAMFORGE_TIMEOUT: Worker timeout in seconds (default ``300``, pipeline runs can be slow).
+
+    Returns:
+        dict: Gunicorn settings.
+    """
+    return {
+        "bind": os.environ.get("BEAMFORGE_BIND", "0.0.0.0:8050"),
+        "workers": int(os.environ.get("BEAMFORGE_WORKERS", multiprocessing.cpu_count() * 2 + 1)),
+        "threads": int(os.environ.get("BEAMFORGE_THREADS", 1)),
+        "timeout": int(os.environ.get("BEAMFORGE_TIMEOUT", 300)),
+        "preload_app": True,
+    }
+
+
+def main():
+    """Run BeamForge under gunicorn with the app preloaded in the master process."""
+    # third party libraries
+    from gunicorn.app.base import BaseApplication
+
+    class BeamForgeApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    # Move everything loaded so far (including the catalog) out of the collector's
+    # generations so that forked workers do not dirty the shared pages.
+    gc.freeze()
+    BeamForgeApplication(server, get_server_options()).run()
+
+
+if __name__ == "__main__":
+    main()
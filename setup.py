@@ -27,5 +27,12 @@ setuptools.setup(
     name="beamforge",
     version="0.0.1",
     install_requires=required,
-    packages=["beamforge"],
+    packages=setuptools.find_packages(include=["beamforge", "beamforge.*"]),
+    package_data={"beamforge": ["assets/*"]},
+    entry_points={
+        "console_scripts": [
+            "beamforge=beamforge.cli:main",
+            "beamforge-server=beamforge.wsgi:main",
+        ],
+    },
 )
@@ -0,0 +1,177 @@
+# standard libraries
+import json
+import os
+import shutil
+import subprocess
+
+# third party libraries
+import pytest
+
+from beamforge.callbacks.bulk_edit_callbacks import bulk_edit_targets
+
+CLIENTSIDE_JS = os.path.join(os.path.dirname(__file__), os.pardir, "beamforge", "assets", "clientside.js")
+NO_UPDATE = "__no_update__"
+
+# Loads clientside.js with just enough of a browser around it, then calls the functions of
+# the beamforge namespace with the cases read from stdin, each with its callback context
+NODE_DRIVER_TEMPLATE = """
+const fs = require("fs");
+global.window = { dash_clientside: { no_update: %s } };
+global.document = { addEventListener: function () {} };
+eval(fs.readFileSync(process.argv[1], "utf8"));
+const cases = JSON.parse(fs.readFileSync(0, "utf8"));
+const results = cases.map(function (testCase) {
+    window.dash_clientside.callback_context = { triggered: testCase.triggered };
+    const result = window.dash_clientside.beamforge[testCase.function].apply(null, testCase.args);
+    return result === undefined ? null : result;
+});
+process.stdout.write(JSON.stringify(results));
+"""
+NODE_DRIVER = NODE_DRIVER_TEMPLATE % json.dumps(NO_UPDATE)
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+
+def run_clientside(cases):
+    """Run cases, each a dict of function, args and triggered prop ids, through clientside.js in node."""
+    payload = [
+        {"function": case["function"], "args": case["args"], "triggered": case.get("triggered", [])} for case in cases
+    ]
+    result = subprocess.run(
+        ["node", "-e", NODE_DRIVER, os.path.abspath(CLIENTSIDE_JS)],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+# The server callbacks the clientside functions replaced, as they were before the port
+
+
+def zoom_graph(triggered, zoom_in_clicks, zoom_out_clicks, reset_view_clicks, current_zoom):
+    if not triggered:
+        return [NO_UPDATE, NO_UPDATE]
+
+    triggered_id = triggered[0]["prop_id"].split(".")[0]
+
+    zoom_level = current_zoom if current_zoom is not None else 1.0
+    layout = None
+
+    if triggered_id == "zoom-in":
+        zoom_level += 0.1
+    elif triggered_id == "zoom-out":
+        zoom_level -= 0.1
+        zoom_level = max(0.1, zoom_level)
+    elif triggered_id == "reset-view":
+        zoom_level = 1.0
+        layout = {
+            "name": "dagre",
+            "rankDir": "TB",
+            "rankSep": 30,
+            "nodeSep": 50,
+            "padding": 10,
+            "animate": True,
+            "fit": True,
+            "spacingFactor": 1.5,
+        }
+
+    return [zoom_level, layout]
+
+
+def enable_delete_button(selected_nodes, selected_edges):
+    return not (selected_nodes or selected_edges)
+
+
+def enable_add_edge_button(selected_nodes):
+    return not selected_nodes or len(selected_nodes) != 2
+
+
+def disable_run_pipeline_button(n_clicks):
+    return n_clicks is not None
+
+
+def show_bulk_edit_targets(selected_nodes, type_pattern, elements):
+    try:
+        targets = bulk_edit_targets(elements, selected_nodes, type_pattern)
+    except Exception:
+        return "Invalid type pattern"
+    scope = "selected nodes" if selected_nodes else "nodes"
+    return f"{len(targets)} {scope} match"
+
+
+NODE = {"id": "Read", "type": "ReadFromCsv"}
+ELEMENTS = [
+    {"data": {"id": "Read", "type": "ReadFromCsv"}},
+    {"data": {"id": "Filter", "type": "Filter"}},
+    {"data": {"id": "Map", "type": "MapToFields"}},
+    {"data": {"id": "Write", "type": "WriteToJson"}},
+    {"data": {"id": "Unknown"}},
+    {"data": {"source": "Read", "target": "Filter"}},
+    {"data": {"source": "Filter", "target": "Map"}},
+    {"data": {"source": "Map", "target": "Write"}},
+]
+
+
+def triggered(prop_id):
+    return [{"prop_id": prop_id, "value": 1}]
+
+
+ZOOM_CASES = [
+    ([], [None, None, None, 1.0]),
+    (triggered("zoom-in.n_clicks"), [1, None, None, 1.0]),
+    (triggered("zoom-in.n_clicks"), [3, None, None, None]),
+    (triggered("zoom-in.n_clicks"), [1, None, None, 2.5]),
+    (triggered("zoom-out.n_clicks"), [None, 1, None, 1.0]),
+    (triggered("zoom-out.n_clicks"), [None, 1, None, 0.15]),
+    (triggered("zoom-out.n_clicks"), [None, 1, None, None]),
+    (triggered("reset-view.n_clicks"), [None, None, 1, 3.7]),
+    (triggered("other.n_clicks"), [None, None, None, 1.2]),
+]
+SELECTIONS = [None, [], [NODE], [NODE, {"id": "Filter"}], [NODE, {"id": "Filter"}, {"id": "Map"}]]
+EDGE_SELECTIONS = [None, [], [{"source": "Read", "target": "Filter"}]]
+TYPE_PATTERNS = [None, "", "ReadFrom.*", "Filter|Map.*", "Filter", "Read", ".*To.*", "Unknown"]
+
+
+@pytest.mark.parametrize("context,args", ZOOM_CASES)
+def test_zoom_graph(context, args):
+    [result] = run_clientside([{"function": "zoomGraph", "args": args, "triggered": context}])
+    expected = zoom_graph(context, *args)
+    assert result == expected
+
+
+def test_selection_buttons():
+    cases = []
+    expected = []
+    for nodes in SELECTIONS:
+        for edges in EDGE_SELECTIONS:
+            cases.append({"function": "enableDeleteButton", "args": [nodes, edges]})
+            expected.append(enable_delete_button(nodes, edges))
+        cases.append({"function": "enableAddEdgeButton", "args": [nodes]})
+        expected.append(enable_add_edge_button(nodes))
+    assert run_clientside(cases) == expected
+
+
+@pytest.mark.parametrize("n_clicks", [None, 0, 1, 5])
+def test_disable_run_pipeline_button(n_clicks):
+    assert run_clientside([{"function": "disableRunPipelineButton", "args": [n_clicks]}]) == [
+        disable_run_pipeline_button(n_clicks)
+    ]
+
+
+def test_count_bulk_edit_targets():
+    cases = []
+    expected = []
+    for nodes in SELECTIONS:
+        for type_pattern in TYPE_PATTERNS:
+            for elements in [None, [], ELEMENTS]:
+                cases.append({"function": "countBulkEditTargets", "args": [nodes, type_pattern, elements]})
+                expected.append(show_bulk_edit_targets(nodes, type_pattern, elements))
+    assert run_clientside(cases) == expected
+
+
+def test_count_bulk_edit_targets_invalid_pattern():
+    [result] = run_clientside([{"function": "countBulkEditTargets", "args": [None, "Read(", ELEMENTS]}])
+    assert show_bulk_edit_targets(None, "Read(", ELEMENTS) == "Invalid type pattern"
+    assert result.startswith("Invalid type pattern: ")
@@ -0,0 +1,50 @@
+# standard libraries
+import copy
+
+# third party libraries
+import dash
+
+from beamforge.callbacks.collab_callbacks import dispatch_operation
+from beamforge.utils.collab import append_operation, apply_operation, read_operations, replay_session
+
+ELEMENTS = [
+    {"data": {"id": "Read", "type": "ReadFromCsv", "config": {}}},
+    {"data": {"id": "Write", "type": "WriteToJson", "config": {}}},
+    {"data": {"source": "Read", "target": "Write"}},
+]
+
+
+def test_refused_edit_is_reported():
+    elements = copy.deepcopy(ELEMENTS)
+    patched_elements, yaml_content, applied = dispatch_operation(
+        {"op": "rename", "id": "Read", "new_id": "Write"}, elements, None
+    )
+    assert not applied
+    assert patched_elements is dash.no_update and yaml_content is dash.no_update
+    assert elements == ELEMENTS
+
+
+def test_compaction_keeps_replay(tmp_path):
+    path = str(tmp_path / "projects.db")
+    ops = [{"op": "reset", "elements": ELEMENTS}]
+    ops += [{"op": "add_node", "id": f"node-{index}", "type": "Filter", "config": {}} for index in range(6)]
+    ops += [{"op": "rename", "id": "node-0", "new_id": "Filter"}, {"op": "delete", "nodes": ["node-1"]}]
+    expected = []
+    for op in ops:
+        apply_operation(expected, op)
+
+    # An editor that applied the first two operations before the log was compacted
+    behind = []
+    for op in ops[:2]:
+        apply_operation(behind, op)
+    for op in ops:
+        append_operation("session", "client", op, path=path, compact_every=4)
+
+    entries = read_operations("session", path=path)
+    assert [entry["seq"] for entry in entries] == [8, 9]
+    assert entries[0]["op"]["op"] == "reset"
+    assert replay_session("session", path=path) == (expected, 9)
+
+    for entry in read_operations("session", 2, path=path):
+        apply_operation(behind, entry["op"])
+    assert behind == expected
@@ -0,0 +1,39 @@
+# standard libraries
+import os
+
+from beamforge.import_budget import check_import_budget
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Loaded by the measured interpreter at startup. Importing beamforge.app must not go to the network,
+# so every connection is refused and recorded, in case the import swallows the error.
+NO_NETWORK_SITECUSTOMIZE = """
+import os
+import socket
+
+
+def _refuse(*args, **kwargs):
+    with open(os.environ["BEAMFORGE_NETWORK_LOG"], "a") as f:
+        f.write("%r\\n" % (args,))
+    raise OSError("No network access while measuring the import time")
+
+
+socket.socket.connect = _refuse
+socket.socket.connect_ex = _refuse
+socket.getaddrinfo = _refuse
+"""
+
+
+def test_import_budget(tmp_path):
+    (tmp_path / "sitecustomize.py").write_text(NO_NETWORK_SITECUSTOMIZE)
+    network_log = tmp_path / "network.log"
+    network_log.touch()
+    env = dict(os.environ)
+    env["BEAMFORGE_NETWORK_LOG"] = str(network_log)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(tmp_path), REPO_ROOT, env.get("PYTHONPATH")]))
+
+    summary = check_import_budget(env=env)
+
+    assert network_log.read_text() == ""
+    assert summary["eagerly_imported"] == []
+    assert summary["ok"], summary
@@ -0,0 +1,82 @@
+# standard libraries
+import os
+
+from beamforge.utils.materialize import COMPLETE_MARKER, plan_incremental_run
+from beamforge.utils.yaml_parser import parse_beam_yaml
+
+WINDOWED_PIPELINE = """
+pipeline:
+  transforms:
+    - type: ReadFromCsv
+      name: Read
+      config:
+        path: {path}
+    - type: MapToFields
+      name: Clean
+      input: Read
+      config:
+        language: python
+        fields:
+          word: word
+    - type: AssignTimestamps
+      name: Stamp
+      input: Clean
+      config:
+        timestamp: ts
+    - type: WindowInto
+      name: Window
+      input: Stamp
+      config:
+        windowing:
+          type: fixed
+          size: 60s
+    - type: Combine
+      name: Count
+      input: Window
+      config:
+        group_by: word
+        combine:
+          n:
+            value: word
+            fn: count
+    - type: MapToFields
+      name: Sessions
+      input: Clean
+      windowing:
+        type: sessions
+        gap: 60s
+      config:
+        language: python
+        fields:
+          word: word
+    - type: WriteToJson
+      name: WriteCounts
+      input: Count
+      config:
+        path: /tmp/counts
+    - type: WriteToJson
+      name: WriteSessions
+      input: Sessions
+      config:
+        path: /tmp/sessions
+"""
+
+
+def test_windowed_results_are_not_materialized(tmp_path):
+    input_path = tmp_path / "words.csv"
+    input_path.write_text("word,ts\nbeam,1\n")
+    G = parse_beam_yaml(WINDOWED_PIPELINE.format(path=input_path))
+    cache_dir = str(tmp_path / "cache")
+
+    plan = plan_incremental_run(G, cache_dir)
+    assert sorted(plan["pending"]) == ["Clean", "Read"]
+
+    # Cached results of the unwindowed nodes are read back, the windowed ones run again
+    for key in plan["pending"].values():
+        os.makedirs(os.path.join(cache_dir, key))
+        open(os.path.join(cache_dir, key, COMPLETE_MARKER), "w").close()
+    plan = plan_incremental_run(G, cache_dir)
+    assert sorted(plan["reused"]) == ["Clean"]
+    assert plan["pending"] == {}
+    assert {"Stamp", "Window", "Count", "Sessions"} <= set(plan["graph"].nodes)
+    assert plan["graph"].nodes["Clean"]["type"] == "ReadFromParquet"
@@ -0,0 +1,76 @@
+# standard libraries
+import sqlite3
+
+# third party libraries
+import pytest
+
+from beamforge.utils.optimizer import push_filter_into_sql, python_predicate_to_sql
+from beamforge.utils.yaml_parser import parse_beam_yaml
+
+ROWS = [
+    {"kind": "a", "name": "x", "amount": 5},
+    {"kind": "b", "name": "y", "amount": 500},
+    {"kind": None, "name": None, "amount": None},
+]
+
+TRANSLATED = [
+    "kind == 'a'",
+    "kind != 'a'",
+    "'a' != kind",
+    "not kind == 'a'",
+    "kind == 'a' or name != 'y'",
+    "not (kind != 'b' and name == 'x')",
+]
+DECLINED = ["amount > 100", "kind == 'a' and amount <= 10", "kind == None", "kind in ('a', 'b')"]
+
+
+def sql_filter(condition):
+    """Run a WHERE condition over ROWS in SQLite, which has the same NULL semantics as Beam SQL."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE input (kind TEXT, name TEXT, amount INTEGER)")
+    conn.executemany("INSERT INTO input VALUES (:kind, :name, :amount)", ROWS)
+    rows = conn.execute(f"SELECT kind, name, amount FROM input WHERE {condition}").fetchall()
+    return [dict(zip(("kind", "name", "amount"), row)) for row in rows]
+
+
+@pytest.mark.parametrize("expression", TRANSLATED)
+def test_sql_keeps_the_rows_python_keeps(expression):
+    condition = python_predicate_to_sql(expression)
+    assert condition is not None
+    assert sql_filter(condition) == [row for row in ROWS if eval(expression, {}, row)]
+
+
+@pytest.mark.parametrize("expression", DECLINED)
+def test_null_unsafe_predicates_are_not_translated(expression):
+    assert python_predicate_to_sql(expression) is None
+
+
+def test_push_filter_into_sql():
+    G = parse_beam_yaml(
+        """
+pipeline:
+  transforms:
+    - type: Sql
+      name: Query
+      config:
+        query: SELECT * FROM PCOLLECTION
+    - type: Filter
+      name: NotA
+      input: Query
+      config:
+        language: python
+        keep: kind != 'a'
+    - type: Filter
+      name: Large
+      input: NotA
+      config:
+        language: python
+        keep: amount > 100
+"""
+    )
+    [(description, nodes, rewritten)] = push_filter_into_sql(G)
+    assert nodes == ["Query", "NotA"]
+    assert rewritten.nodes["Query"]["config"]["query"] == (
+        "SELECT * FROM (SELECT * FROM PCOLLECTION) AS filtered WHERE (`kind` IS NULL OR `kind` <> 'a')"
+    )
+    assert list(rewritten.successors("Query")) == ["Large"]